@@ -0,0 +1,3 @@
+"""
+Suite de benchmarks del gateway (ver bench/run.py).
+"""
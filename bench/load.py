@@ -0,0 +1,196 @@
+"""
+Generador de carga y estadísticas para los benchmarks del gateway.
+"""
+import random
+import threading
+import time
+from collections import defaultdict
+
+import jwt
+import requests
+
+
+def percentile(sorted_values, p):
+    """
+    Percentil `p` (0-100) con interpolación lineal sobre una lista ya ordenada.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * p / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+class Recorder:
+    """
+    Latencias y errores por ruta. Cada hilo de carga acumula en su propia lista y se juntan al final.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def merge(self, samples, errors):
+        with self._lock:
+            for route, values in samples.items():
+                self.samples[route].extend(values)
+            for route, count in errors.items():
+                self.errors[route] += count
+
+    def summary(self, elapsed):
+        routes = {}
+        for route in sorted(set(self.samples) | set(self.errors)):
+            values = sorted(self.samples.get(route, []))
+            count = len(values) + self.errors.get(route, 0)
+            routes[route] = {
+                "requests": count,
+                "errors": self.errors.get(route, 0),
+                "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+                "mean_ms": round(sum(values) / len(values) * 1000, 2) if values else 0.0,
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+            }
+        return routes
+
+
+class Scenario:
+    """
+    Una operación de un usuario virtual contra el gateway.
+    """
+
+    def __init__(self, name, method, path, json_body=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.json_body = json_body
+
+    def build(self, user_id, rng):
+        path = self.path(user_id, rng) if callable(self.path) else self.path
+        body = self.json_body(user_id, rng) if callable(self.json_body) else self.json_body
+        return path, body
+
+
+def default_scenarios(competitions=5, questions=20):
+    """
+    Operaciones realistas de una competencia en curso.
+    """
+    return {
+        'start_quiz': Scenario(
+            'start_quiz', 'POST', lambda user, rng: f"/quiz-participation/{rng.randint(1, competitions)}/participant/{user}/start"),
+        'ranking': Scenario(
+            'ranking', 'GET', lambda user, rng: f"/competitions/{rng.randint(1, competitions)}/ranking"),
+        'competition_detail': Scenario(
+            'competition_detail', 'GET', lambda user, rng: f"/competitions/{rng.randint(1, competitions)}"),
+        'finish': Scenario(
+            'finish', 'POST', lambda user, rng: f"/quiz-participation/{rng.randint(1, competitions)}/participant/{user}/finish",
+            lambda user, rng: {"answers": [{"question_id": q, "answer_id": rng.randint(0, 3)} for q in range(questions)]}),
+    }
+
+
+def make_token(user_id, secret, role="user"):
+    return jwt.encode({"user_id": user_id, "role": role, "exp": int(time.time()) + 3600}, secret, algorithm="HS256")
+
+
+def _send(session, base_url, scenario, user_id, token, rng, samples, errors):
+    path, body = scenario.build(user_id, rng)
+    start = time.perf_counter()
+    try:
+        response = session.request(scenario.method, base_url + path, json=body,
+                                   headers={"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip"}, timeout=30)
+        response.content
+        ok = response.status_code < 400
+    except requests.RequestException:
+        ok = False
+    elapsed = time.perf_counter() - start
+    if ok:
+        samples[scenario.name].append(elapsed)
+    else:
+        errors[scenario.name] += 1
+
+
+def run_burst(base_url, scenario, users, secret, first_user=1):
+    """
+    Ráfaga: `users` usuarios ejecutan la misma operación a la vez (p. ej. el inicio de un quiz).
+    """
+    recorder = Recorder()
+    barrier = threading.Barrier(users)
+
+    def user(user_id):
+        samples, errors = defaultdict(list), defaultdict(int)
+        session = requests.Session()
+        token = make_token(user_id, secret)
+        barrier.wait()
+        _send(session, base_url, scenario, user_id, token, random.Random(user_id), samples, errors)
+        recorder.merge(samples, errors)
+        session.close()
+
+    threads = [threading.Thread(target=user, args=(first_user + i,)) for i in range(users)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder.summary(time.perf_counter() - started)
+
+
+def run_mixed(base_url, scenarios, weights, concurrency, duration, secret, warmup=0.0, first_user=1):
+    """
+    Carga sostenida: `concurrency` usuarios en lazo cerrado eligen operaciones según `weights`
+    durante `duration` segundos. Las peticiones del calentamiento (`warmup`) no se cuentan.
+    """
+    recorder = Recorder()
+    names = list(weights)
+    cumulative = [weights[name] for name in names]
+    start_measuring = time.perf_counter() + warmup
+    deadline = start_measuring + duration
+
+    def user(user_id):
+        rng = random.Random(user_id)
+        samples, errors = defaultdict(list), defaultdict(int)
+        warm_samples, warm_errors = defaultdict(list), defaultdict(int)
+        session = requests.Session()
+        token = make_token(user_id, secret)
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            scenario = scenarios[rng.choices(names, weights=cumulative)[0]]
+            if now < start_measuring:
+                _send(session, base_url, scenario, user_id, token, rng, warm_samples, warm_errors)
+            else:
+                _send(session, base_url, scenario, user_id, token, rng, samples, errors)
+        recorder.merge(samples, errors)
+        session.close()
+
+    threads = [threading.Thread(target=user, args=(first_user + i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder.summary(duration)
+
+
+def compare(results, baseline, threshold):
+    """
+    Compara dos resultados por fase y ruta.
+
+    Una ruta empeora si su p95 sube o su throughput baja más que `threshold` (proporción, p. ej. 0.1).
+
+    Returns:
+        list: Filas (fase, ruta, p95_base, p95_actual, rps_base, rps_actual, empeoró).
+    """
+    rows = []
+    for phase, routes in results["phases"].items():
+        for route, current in routes.items():
+            base = baseline.get("phases", {}).get(phase, {}).get(route)
+            if base is None:
+                continue
+            slower = base["p95_ms"] and current["p95_ms"] > base["p95_ms"] * (1 + threshold)
+            fewer = base["throughput_rps"] and current["throughput_rps"] < base["throughput_rps"] * (1 - threshold)
+            rows.append((phase, route, base["p95_ms"], current["p95_ms"],
+                         base["throughput_rps"], current["throughput_rps"], bool(slower or fewer)))
+    return rows
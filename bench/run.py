@@ -0,0 +1,231 @@
+"""
+Benchmark de punta a punta del gateway contra microservicios simulados.
+
+Uso (desde la raíz del repositorio):
+    python -m bench.run --duration 30 --concurrency 50 --output bench/results/actual.json
+    python -m bench.run --baseline bench/results/base.json --fail-on-regression
+
+Arranca los stubs de auth, QA y competencias, levanta el gateway apuntando a ellos
+(o usa uno ya en marcha con --gateway-url), ejecuta las fases de carga e informa
+throughput y p50/p95/p99 por ruta.
+"""
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import requests
+
+from bench.load import compare, default_scenarios, run_burst, run_mixed
+from bench.stubs import SERVICES, StubConfig, start_stubs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, 'src')
+
+# Servidores del gateway (--server). Por defecto se mide el de producción: gunicorn con gunicorn.conf.py
+SERVER_CMDS = {
+    'gunicorn': f"{sys.executable} -m gunicorn -c ../gunicorn.conf.py --bind 127.0.0.1:{{port}}",
+    # Servidor de desarrollo de Werkzeug con un hilo por petición
+    'dev': (
+        f"{sys.executable} -c \"import os; from main import create_app; "
+        "create_app('production').run(host='127.0.0.1', port=int(os.environ['PORT']), threaded=True)\""
+    ),
+}
+DEFAULT_SERVER = 'gunicorn'
+
+
+def _per_service(value, cast=float):
+    """
+    Acepta un valor para todos los servicios ("20") o por servicio ("auth=5,qa=20,competition=10").
+    """
+    if '=' not in value:
+        return {name: cast(value) for name in SERVICES}
+    parsed = {}
+    for item in value.split(','):
+        name, _, number = item.partition('=')
+        if name.strip() not in SERVICES:
+            raise argparse.ArgumentTypeError(f"Servicio desconocido: {name}")
+        parsed[name.strip()] = cast(number)
+    return parsed
+
+
+def _weights(value):
+    weights = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del gateway con microservicios simulados.")
+    parser.add_argument('--gateway-url', help="Gateway ya en marcha; si se indica, no se arranca uno propio "
+                                              "(configúralo con los puertos de --stub-ports).")
+    parser.add_argument('--stub-ports', default='0',
+                        help="Puertos de los stubs: 'auth=5011,qa=5012,competition=5013' (0 = puerto libre).")
+    parser.add_argument('--server', choices=sorted(SERVER_CMDS), default=DEFAULT_SERVER,
+                        help="Servidor del gateway: gunicorn (producción) o dev (servidor de desarrollo de Werkzeug).")
+    parser.add_argument('--server-cmd',
+                        help="Comando propio para arrancar el gateway, en lugar de --server "
+                             "(se ejecuta en src/ con PORT en el entorno; {port} se reemplaza por el puerto).")
+    parser.add_argument('--latency-ms', default='10', help="Latencia de los stubs: '10' o 'auth=5,qa=20,competition=10'.")
+    parser.add_argument('--jitter-ms', default='2', help="Jitter de los stubs, mismo formato que --latency-ms.")
+    parser.add_argument('--error-rate', default='0', help="Proporción de respuestas 503 de los stubs (0-1).")
+    parser.add_argument('--participants', type=int, default=100, help="Participantes por competencia.")
+    parser.add_argument('--quizzes', type=int, default=5, help="Quizzes por competencia.")
+    parser.add_argument('--questions', type=int, default=20, help="Preguntas por quiz.")
+    parser.add_argument('--phases', default='burst,mixed', help="Fases a ejecutar: burst, mixed.")
+    parser.add_argument('--burst-users', type=int, default=100, help="Usuarios que inician el quiz a la vez.")
+    parser.add_argument('--concurrency', type=int, default=20, help="Usuarios concurrentes en la fase mixta.")
+    parser.add_argument('--duration', type=float, default=15, help="Segundos medidos de la fase mixta.")
+    parser.add_argument('--warmup', type=float, default=2, help="Segundos de calentamiento no medidos.")
+    parser.add_argument('--mix', type=_weights, default='ranking=5,competition_detail=3,finish=2',
+                        help="Pesos de la fase mixta por operación.")
+    parser.add_argument('--output', help="Archivo JSON donde guardar los resultados.")
+    parser.add_argument('--baseline', help="Resultados JSON previos contra los que comparar.")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Empeoramiento tolerado de p95 y throughput respecto de la base (0.10 = 10%%).")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Sale con código 1 si alguna ruta empeora.")
+    return parser.parse_args(argv)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(url, process, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"El gateway terminó al arrancar (código {process.returncode})")
+        try:
+            if requests.get(url + '/api', timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"El gateway no respondió en {url} tras {timeout} segundos")
+
+
+def start_gateway(server_cmd, stubs, secret):
+    """
+    Arranca el gateway en un proceso aparte apuntando a los stubs.
+    Sin rate limiting efectivo ni trazas: se mide el camino de las peticiones, no los límites.
+    """
+    port = _free_port()
+    env = dict(os.environ)
+    env.update({
+        'PORT': str(port),
+        'JWT_SECRET_KEY': secret,
+        'LIMITER_DEFAULT_LIMIT': '1000000 per minute',
+        'LIMITER_STORAGE_URL': 'memory://',
+        'AUTH_HOST': '127.0.0.1', 'AUTH_PORT': str(stubs['auth'].port),
+        'QA_HOST': '127.0.0.1', 'QA_PORT': str(stubs['qa'].port),
+        'COMPETITION_HOST': '127.0.0.1', 'COMPETITION_PORT': str(stubs['competition'].port),
+    })
+    process = subprocess.Popen(server_cmd.format(port=port), shell=True, cwd=SRC, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_ready(url, process)
+    except Exception:
+        process.terminate()
+        raise
+    return url, process
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+
+def print_summary(results):
+    header = f"{'fase':<7} {'ruta':<20} {'peticiones':>10} {'errores':>8} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    print(header)
+    print('-' * len(header))
+    for phase, routes in results["phases"].items():
+        for route, stats in routes.items():
+            print(f"{phase:<7} {route:<20} {stats['requests']:>10} {stats['errors']:>8} {stats['throughput_rps']:>9} "
+                  f"{stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9}")
+
+
+def print_comparison(rows, threshold):
+    print(f"\nComparación con la base (tolerancia {threshold:.0%}):")
+    for phase, route, base_p95, p95, base_rps, rps, regressed in rows:
+        flag = 'EMPEORA' if regressed else 'ok'
+        print(f"  {phase:<7} {route:<20} p95 {base_p95} -> {p95} ms   rps {base_rps} -> {rps}   {flag}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    latency, jitter = _per_service(args.latency_ms), _per_service(args.jitter_ms)
+    error_rate = _per_service(args.error_rate)
+    configs = {
+        name: StubConfig(latency_ms=latency.get(name, 10.0), jitter_ms=jitter.get(name, 2.0),
+                         error_rate=error_rate.get(name, 0.0), participants=args.participants,
+                         quizzes=args.quizzes, questions=args.questions)
+        for name in SERVICES
+    }
+    secret = os.getenv('JWT_SECRET_KEY', 'bench-secret')
+
+    stubs = start_stubs(configs, _per_service(args.stub_ports, int))
+    process = None
+    try:
+        if args.gateway_url:
+            base_url = args.gateway_url.rstrip('/')
+            _wait_ready(base_url, None)
+        else:
+            base_url, process = start_gateway(args.server_cmd or SERVER_CMDS[args.server], stubs, secret)
+
+        scenarios = default_scenarios(questions=args.questions)
+        phases = {}
+        if 'burst' in args.phases:
+            phases['burst'] = run_burst(base_url, scenarios['start_quiz'], args.burst_users, secret)
+        if 'mixed' in args.phases:
+            phases['mixed'] = run_mixed(base_url, scenarios, args.mix, args.concurrency, args.duration, secret,
+                                        warmup=args.warmup, first_user=args.burst_users + 1)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+        for stub in stubs.values():
+            stub.stop()
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {key: value for key, value in vars(args).items() if key not in ('output', 'baseline')},
+        },
+        "phases": phases,
+    }
+    print_summary(results)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\nResultados guardados en {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            rows = compare(results, json.load(f), args.threshold)
+        print_comparison(rows, args.threshold)
+        if args.fail_on_regression and any(row[-1] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
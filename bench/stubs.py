@@ -0,0 +1,208 @@
+"""
+Microservicios simulados (auth, QA y competencias) para los benchmarks del gateway.
+
+Cada stub responde las rutas que usa el gateway con payloads de tamaño configurable,
+agregando latencia, jitter y una tasa de errores 503.
+"""
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+
+@dataclass
+class StubConfig:
+    latency_ms: float = 10.0
+    jitter_ms: float = 2.0
+    error_rate: float = 0.0
+    participants: int = 100        # Participantes por competencia (detalle y ranking)
+    quizzes: int = 5               # Quizzes por competencia
+    questions: int = 20            # Preguntas por quiz
+    answers: int = 4               # Respuestas por pregunta
+
+
+def _user(user_id):
+    return {"id": user_id, "username": f"usuario{user_id}", "email": f"usuario{user_id}@example.com", "role": "user"}
+
+
+def _quiz(quiz_id, config, with_answers=True):
+    questions = []
+    for q in range(config.questions):
+        question = {"id": quiz_id * 1000 + q, "text": f"Pregunta {q} del quiz {quiz_id}", "category_id": 1}
+        if with_answers:
+            question["answers"] = [
+                {"id": a, "text": f"Respuesta {a}", "is_correct": a == 0} for a in range(config.answers)
+            ]
+        questions.append(question)
+    return {"id": quiz_id, "title": f"Quiz {quiz_id}", "category_id": quiz_id % 3 + 1, "state": "published",
+            "time_limit": 600, "questions": questions}
+
+
+def auth_routes(config):
+    def users_bulk(match, query, body):
+        return 200, {"users": [_user(user_id) for user_id in body.get("ids", [])]}
+
+    def me(match, query, body):
+        return 200, _user(1)
+
+    def users_list(match, query, body):
+        return 200, [_user(user_id) for user_id in range(1, config.participants + 1)]
+
+    return [
+        ('POST', r'/users/bulk', users_bulk),
+        ('GET', r'/auth/me', me),
+        ('GET', r'/users/list', users_list),
+    ]
+
+
+def qa_routes(config):
+    def list_quizzes(match, query, body):
+        ids = [int(i) for i in query.get("quiz_ids", [""])[0].split(",") if i] or range(1, config.quizzes + 1)
+        return 200, [_quiz(quiz_id, config, with_answers=False) for quiz_id in ids]
+
+    def get_quiz(match, query, body):
+        return 200, _quiz(int(match.group(1)), config)
+
+    def categories(match, query, body):
+        return 200, [{"id": i, "name": f"Categoría {i}"} for i in range(1, 4)]
+
+    return [
+        ('GET', r'/quizzes', list_quizzes),
+        ('GET', r'/quizzes/(\d+)', get_quiz),
+        ('GET', r'/categories', categories),
+    ]
+
+
+def competition_routes(config):
+    def competition(competition_id):
+        return {
+            "id": competition_id, "title": f"Competencia {competition_id}", "state": "active",
+            "created_by": 1, "modified_by": 2, "created_at": "2025-01-01", "updated_at": "2025-01-02",
+            "participants": [{"participant_id": p, "competition_id": competition_id, "score": 0}
+                             for p in range(1, config.participants + 1)],
+            "quizzes": [{"quiz_id": q, "competition_id": competition_id, "time_limit": 600}
+                        for q in range(1, config.quizzes + 1)],
+        }
+
+    def list_competitions(match, query, body):
+        return 200, [{"id": c, "title": f"Competencia {c}", "state": "active"} for c in range(1, 21)]
+
+    def get_competition(match, query, body):
+        return 200, competition(int(match.group(1)))
+
+    def ranking(match, query, body):
+        return 200, {"competition_id": int(match.group(1)), "ranking": [
+            {"participant_id": p, "username": f"usuario{p}", "score": config.participants - p, "position": p}
+            for p in range(1, config.participants + 1)
+        ]}
+
+    def start(match, query, body):
+        return 200, {"competition_quiz_id": int(match.group(1)), "participant_id": int(match.group(2)),
+                     "quiz_id": int(match.group(1)) % config.quizzes + 1, "started_at": "2025-01-01T10:00:00"}
+
+    def finish(match, query, body):
+        answers = body.get("answers", [])
+        return 200, {"competition_quiz_id": int(match.group(1)), "participant_id": int(match.group(2)),
+                     "score": sum(1 for a in answers if a.get("answer_id") == 0), "answered": len(answers)}
+
+    return [
+        ('GET', r'/competitions', list_competitions),
+        ('GET', r'/competitions/(\d+)', get_competition),
+        ('GET', r'/competitions/(\d+)/ranking', ranking),
+        ('POST', r'/quiz-participation/(\d+)/participant/(\d+)/start', start),
+        ('POST', r'/quiz-participation/(\d+)/participant/(\d+)/finish', finish),
+    ]
+
+
+SERVICES = {
+    'auth': auth_routes,
+    'qa': qa_routes,
+    'competition': competition_routes,
+}
+
+
+def _handler_class(routes, config):
+    compiled = [(method, re.compile(pattern + '$'), handler) for method, pattern, handler in routes]
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _respond(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _dispatch(self, method):
+            length = int(self.headers.get('Content-Length') or 0)
+            raw = self.rfile.read(length) if length else b''
+            url = urlsplit(self.path)
+
+            delay = config.latency_ms + random.uniform(-config.jitter_ms, config.jitter_ms)
+            time.sleep(max(0.0, delay) / 1000)
+            if random.random() < config.error_rate:
+                return self._respond(503, {"message": "Error simulado"})
+
+            for route_method, pattern, handler in compiled:
+                match = pattern.match(url.path)
+                if route_method == method and match:
+                    body = json.loads(raw) if raw else {}
+                    return self._respond(*handler(match, parse_qs(url.query), body))
+            self._respond(404, {"message": "No encontrado"})
+
+        def do_GET(self):
+            self._dispatch('GET')
+
+        def do_POST(self):
+            self._dispatch('POST')
+
+        def do_PUT(self):
+            self._dispatch('PUT')
+
+    return StubHandler
+
+
+class StubServer:
+    """
+    Un microservicio simulado escuchando en un puerto local libre, en un hilo propio.
+    """
+
+    def __init__(self, name, config, port=0):
+        self.name = name
+        self.config = config
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), _handler_class(SERVICES[name](config), config))
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, name=f"stub-{name}", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def start_stubs(configs, ports=None):
+    """
+    Arranca los tres microservicios simulados.
+
+    Args:
+        configs (dict): Nombre del servicio -> StubConfig.
+        ports (dict, optional): Nombre del servicio -> puerto (0 o ausente = puerto libre).
+
+    Returns:
+        dict: Nombre del servicio -> StubServer en marcha.
+    """
+    ports = ports or {}
+    return {name: StubServer(name, configs[name], ports.get(name, 0)).start() for name in SERVICES}
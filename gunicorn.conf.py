@@ -0,0 +1,83 @@
+"""
+Configuración de gunicorn para producción:
+
+    gunicorn -c gunicorn.conf.py
+
+Todos los valores se pueden ajustar con variables de entorno (GUNICORN_*).
+
+- Workers gthread: varios procesos (el JSON y el JWT usan CPU y el GIL) con varios hilos cada uno
+  (la mayor parte del tiempo se espera a los microservicios).
+- preload_app: la app se importa una vez en el master y los workers la heredan con fork; los pools de
+  conexiones, hilos, cachés, métricas y el spool se reinician en cada worker (os.register_at_fork).
+- Métricas: cada worker guarda las suyas en METRICS_MULTIPROC_DIR y /metrics suma las de todos, así
+  Prometheus ve los mismos contadores sea cual sea el worker que atiende el scrape.
+- SIGTERM: los workers dejan de aceptar conexiones y terminan las peticiones en curso
+  (hasta GUNICORN_GRACEFUL_TIMEOUT segundos).
+- SIGHUP: recarga la configuración y reemplaza los workers de forma gradual. Con preload_app el
+  código nuevo se carga con SIGUSR2 (nuevo master) seguido de SIGWINCH y SIGQUIT al master anterior.
+"""
+import glob
+import multiprocessing
+import os
+import tempfile
+
+
+def _cpu_count():
+    # Respeta los CPUs asignados al proceso (contenedores, taskset) cuando el sistema lo permite
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return multiprocessing.cpu_count()
+
+
+def _env_bool(name, default):
+    return os.getenv(name, default).lower() == 'true'
+
+
+wsgi_app = 'wsgi:app'
+chdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '5000')}")
+# Un proceso por CPU: pocos workers con muchos hilos aprovechan mejor las cachés, los pools
+# y la agrupación de GETs, que son por proceso
+workers = int(os.getenv('GUNICORN_WORKERS', 0)) or max(2, _cpu_count())
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+preload_app = _env_bool('GUNICORN_PRELOAD', 'true')
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+backlog = int(os.getenv('GUNICORN_BACKLOG', 2048))
+# Reciclado opcional de workers (0 = nunca); el jitter evita que se reinicien todos a la vez
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 0))
+
+accesslog = os.getenv('GUNICORN_ACCESSLOG') or None  # '-' para escribirlo en stdout
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOGLEVEL', 'info')
+
+
+# Directorio compartido de métricas de los workers: se fija antes de cargar la app (la lee Config)
+metrics_dir = os.environ.setdefault('METRICS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'gateway-metrics'))
+
+
+def on_starting(server):
+    # Un master nuevo empieza los contadores desde cero (Prometheus lo ve como un reinicio)
+    os.makedirs(metrics_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(metrics_dir, 'metrics-*.json*')):
+        os.remove(path)
+
+
+def when_ready(server):
+    # Con preload_app la app se creó en el master: el drenador del spool corre solo en los workers
+    if preload_app:
+        from wsgi import app
+        spool = app.extensions.get('finish_spool')
+        if spool is not None:
+            spool.stop()
+
+
+def worker_exit(server, worker):
+    from wsgi import shutdown
+    shutdown()
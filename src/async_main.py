@@ -0,0 +1,91 @@
+import os
+
+from aiohttp import web
+
+from routes.async_routes import (
+    auth_routes, qa_routes, quiz_routes, competition_routes, quiz_participation_routes
+)
+from config.config import Config, config_dict
+from routes.metrics_routes import metrics_gauges
+from services import async_upstream
+from utils import metrics
+from utils.async_http import (
+    json_response, cors_middleware, metrics_middleware, rate_limit_middleware, compression_middleware, error_middleware
+)
+from utils.rate_limit import RateLimiter, rate_limit_exempt
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Modo asyncio del gateway: mismas rutas que la app Flask (main.py), servidas con aiohttp.
+# Un solo proceso puede mantener miles de llamadas a los microservicios en curso.
+
+
+def _register(app, routes, prefix, blueprint):
+    """
+    Registra una tabla de rutas bajo un prefijo, como los blueprints con url_prefix.
+    Cada ruta se nombra `<blueprint>.<handler>` como los endpoints de Flask (p. ej. para RATE_LIMITS).
+    """
+    for route in routes:
+        app.router.add_route(route.method, prefix + route.path, route.handler,
+                             name=f"{blueprint}.{route.handler.__name__}")
+
+
+async def _close_upstream_sessions(app):
+    await async_upstream.close_sessions()
+
+
+def create_async_app(config_name=None):
+    """
+    Args:
+        config_name (str, optional): Configuración de `config_dict` ('testing', ...); por defecto `Config`.
+    """
+    config = config_dict[config_name] if config_name else Config
+    settings = {name: getattr(config, name) for name in dir(config) if name.isupper()}
+
+    middlewares = [metrics_middleware, cors_middleware]
+    if settings['RATE_LIMIT_ENABLED']:
+        middlewares.append(rate_limit_middleware(RateLimiter(settings)))
+    app = web.Application(middlewares=middlewares + [compression_middleware, error_middleware])
+
+    async def root_redirect(request):
+        raise web.HTTPFound('/api')
+
+    async def index(request):
+        return json_response({
+            'message': 'Bienvenido al Api de Cuestionarios',
+            'status': 'success',
+            'documentation': '/docs',
+            'auth': '/auth/register',
+            'login': '/auth/login',
+            'quizzes': '/quizzes',
+            'questions': '/questions',
+            'answers': '/answers',
+        }, 200)
+
+    @rate_limit_exempt
+    async def get_metrics(request):
+        return web.Response(text=metrics.render(metrics_gauges()), headers={'Content-Type': metrics.CONTENT_TYPE})
+
+    app.router.add_get('/', root_redirect, name='root_redirect')
+    app.router.add_get('/api', index, name='index')
+    app.router.add_get('/metrics', get_metrics, name='metrics.get_metrics')
+
+    _register(app, auth_routes, '/auth', 'auth')
+    _register(app, qa_routes, '/questions', 'questions')
+    _register(app, quiz_routes, '/quizzes', 'quizzes')
+    _register(app, competition_routes, '/competitions', 'competitions')
+    _register(app, quiz_participation_routes, '/quiz-participation', 'quiz-participation')
+
+    if settings['FINISH_SPOOL_ENABLED']:
+        logger.warning("FINISH_SPOOL_ENABLED se ignora en modo asyncio: 'finalizar quiz' se reenvía "
+                       "directamente al microservicio de competencias")
+
+    app.on_cleanup.append(_close_upstream_sessions)
+    return app
+
+
+if __name__ == '__main__':
+    port = int(os.getenv('PORT', 5000))
+    logger.info(f"Gateway en modo asyncio escuchando en el puerto {port}")
+    web.run_app(create_async_app(), host='0.0.0.0', port=port)
@@ -6,12 +6,111 @@ load_dotenv()
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
+    # Caché de tokens ya verificados (segundos como máximo, nunca más allá de su `exp`)
+    TOKEN_CACHE_TTL = int(os.getenv('TOKEN_CACHE_TTL', 300))
+    TOKEN_CACHE_MAXSIZE = int(os.getenv('TOKEN_CACHE_MAXSIZE', 10000))
     SERVICE_TIMEOUT = int(os.getenv('SERVICE_TIMEOUT', 5))
     RETRY_ATTEMPTS = int(os.getenv('RETRY_ATTEMPTS', 3))
+    # Backoff exponencial con jitter entre reintentos (segundos)
+    RETRY_BACKOFF_BASE = float(os.getenv('RETRY_BACKOFF_BASE', 0.1))
+    RETRY_BACKOFF_MAX = float(os.getenv('RETRY_BACKOFF_MAX', 2.0))
+    # Circuit breaker por upstream: fallos seguidos para abrirlo y segundos hasta probar de nuevo
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', 30))
+
+    # Pools de conexiones hacia los microservicios (se pueden ajustar por upstream, p. ej. QA_POOL_MAXSIZE)
+    UPSTREAM_POOL_CONNECTIONS = int(os.getenv('UPSTREAM_POOL_CONNECTIONS', 10))
+    UPSTREAM_POOL_MAXSIZE = int(os.getenv('UPSTREAM_POOL_MAXSIZE', 50))
+    UPSTREAM_POOL_BLOCK = os.getenv('UPSTREAM_POOL_BLOCK', 'false').lower() == 'true'
+    # Agrupar GETs idénticos concurrentes en una sola llamada al microservicio
+    UPSTREAM_COALESCE_GETS = os.getenv('UPSTREAM_COALESCE_GETS', 'true').lower() == 'true'
+
+    # Hilos para las llamadas en paralelo a los microservicios (enriquecimiento de respuestas)
+    FANOUT_MAX_WORKERS = int(os.getenv('FANOUT_MAX_WORKERS', 32))
+
+    # Tamaño de bloque (bytes) en las rutas de paso directo en streaming
+    PROXY_STREAM_CHUNK_SIZE = int(os.getenv('PROXY_STREAM_CHUNK_SIZE', 64 * 1024))
+
+    # Caché del catálogo de categorías (segundos; 0 la desactiva)
+    CATEGORIES_CACHE_TTL = int(os.getenv('CATEGORIES_CACHE_TTL', 300))
+    # Caché de usuarios por ID para el enriquecimiento (segundos y número máximo de entradas)
+    USERS_CACHE_TTL = int(os.getenv('USERS_CACHE_TTL', 600))
+    USERS_CACHE_MAXSIZE = int(os.getenv('USERS_CACHE_MAXSIZE', 50000))
+
+    # Micro-caché de GETs de solo lectura muy consultados (segundos; 0 la desactiva)
+    MICROCACHE_COMPETITIONS_TTL = int(os.getenv('MICROCACHE_COMPETITIONS_TTL', 2))
+    MICROCACHE_RANKING_TTL = int(os.getenv('MICROCACHE_RANKING_TTL', 2))
+    MICROCACHE_QUIZZES_TTL = int(os.getenv('MICROCACHE_QUIZZES_TTL', 5))
+    # Ventanas para servir la respuesta anterior mientras se actualiza / si el microservicio falla
+    MICROCACHE_STALE_TTL = int(os.getenv('MICROCACHE_STALE_TTL', 10))
+    MICROCACHE_STALE_IF_ERROR_TTL = int(os.getenv('MICROCACHE_STALE_IF_ERROR_TTL', 300))
+    MICROCACHE_MAXSIZE = int(os.getenv('MICROCACHE_MAXSIZE', 1000))
+
+    # ETag y GET condicional (304) en las respuestas del gateway
+    ETAG_ENABLED = os.getenv('ETAG_ENABLED', 'true').lower() == 'true'
+
+    # Compresión de respuestas (gzip; zstd si está instalado el paquete zstandard)
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_LEVEL = int(os.getenv('COMPRESSION_LEVEL', 6))
+    COMPRESSION_ZSTD_LEVEL = int(os.getenv('COMPRESSION_ZSTD_LEVEL', 3))
+
+    # Server-Timing: header de depuración (solo admins) y fracción de peticiones medidas para el log
+    SERVER_TIMING_DEBUG_HEADER = os.getenv('SERVER_TIMING_DEBUG_HEADER', 'X-Debug-Timing')
+    SERVER_TIMING_SAMPLE_RATE = float(os.getenv('SERVER_TIMING_SAMPLE_RATE', 0.0))
+
+    # Trazas distribuidas (W3C traceparent): exportador 'none', 'file' (JSON OTLP por línea) u 'otlp' (colector HTTP)
+    TRACE_EXPORTER = os.getenv('TRACE_EXPORTER', 'none')
+    TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', 0.1))  # Muestreo de trazas nuevas (head-based)
+    TRACE_EXPORT_PATH = os.getenv('TRACE_EXPORT_PATH', 'traces.jsonl')
+    TRACE_OTLP_ENDPOINT = os.getenv('TRACE_OTLP_ENDPOINT', 'http://localhost:4318')
+    TRACE_SERVICE_NAME = os.getenv('TRACE_SERVICE_NAME', 'gateway-api')
+
+    # Códec JSON de las respuestas y de los cuerpos de los microservicios: 'auto' usa orjson si está
+    # instalado (misma salida que jsonify), 'stdlib' fuerza el módulo json
+    JSON_CODEC = os.getenv('JSON_CODEC', 'auto')
+
+    # Paginación por cursor de GET /quizzes y GET /questions (?limit=&cursor=): tamaño por defecto y máximo
+    CATALOG_PAGE_SIZE = int(os.getenv('CATALOG_PAGE_SIZE', 50))
+    CATALOG_MAX_PAGE_SIZE = int(os.getenv('CATALOG_MAX_PAGE_SIZE', 500))
+
+    # POST /batch: sub-peticiones por batch y cuántas se ejecutan a la vez en todo el proceso
+    BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', 20))
+    BATCH_MAX_CONCURRENCY = int(os.getenv('BATCH_MAX_CONCURRENCY', 8))
+
+    # Envíos de "finalizar quiz" con escritura diferida: se guardan en SQLite, se responde 202 con un recibo
+    # y un hilo los reenvía al microservicio con concurrencia acotada y reintentos
+    FINISH_SPOOL_ENABLED = os.getenv('FINISH_SPOOL_ENABLED', 'false').lower() == 'true'
+    FINISH_SPOOL_PATH = os.getenv('FINISH_SPOOL_PATH', 'finish_spool.db')
+    FINISH_SPOOL_CONCURRENCY = int(os.getenv('FINISH_SPOOL_CONCURRENCY', 4))
+    FINISH_SPOOL_MAX_ATTEMPTS = int(os.getenv('FINISH_SPOOL_MAX_ATTEMPTS', 8))
+    FINISH_SPOOL_RETRY_BASE = float(os.getenv('FINISH_SPOOL_RETRY_BASE', 1.0))  # Segundos antes del 1.er reintento
+    FINISH_SPOOL_RETRY_MAX = float(os.getenv('FINISH_SPOOL_RETRY_MAX', 60))
+    FINISH_SPOOL_RETENTION = int(os.getenv('FINISH_SPOOL_RETENTION', 86400))  # Segundos que se conservan los recibos
+    FINISH_SPOOL_TOKEN_TTL = int(os.getenv('FINISH_SPOOL_TOKEN_TTL', 60))  # Vida del token que firma el drenador
+
+    # Con varios workers (gunicorn) cada proceso guarda sus métricas en este directorio cada
+    # METRICS_FLUSH_INTERVAL segundos y /metrics suma las de todos; vacío = solo las del proceso
+    METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR', '')
+    METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 1.0))
+
+    # Duración máxima del perfilador de muestreo de /admin/debug/profile (segundos)
+    PROFILER_MAX_SECONDS = float(os.getenv('PROFILER_MAX_SECONDS', 30))
+
+    # /auth/me respondido por el gateway con los claims del JWT y una caché de perfiles por usuario
+    AUTH_ME_LOCAL = os.getenv('AUTH_ME_LOCAL', 'false').lower() == 'true'
+    PROFILE_CACHE_TTL = int(os.getenv('PROFILE_CACHE_TTL', 300))
+    PROFILE_CACHE_MAXSIZE = int(os.getenv('PROFILE_CACHE_MAXSIZE', 50000))
 
     # Configuración para Rate Limiting
     LIMTER_DEFAULT_LIMIT = os.getenv('LIMITER_DEFAULT_LIMIT', '5 per minute')  # 5 peticiones por minuto
     LIMTER_STORAGE_URL = os.getenv('LIMITER_STORAGE_URL', 'redis://localhost:6379')  # Redis como almacenamiento
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    # Límites por ruta (endpoint) y rol en JSON, p. ej. {"competitions.get_all_competitions": {"student": "30 per minute"}}
+    RATE_LIMITS = os.getenv('RATE_LIMITS', '{}')
+    RATE_LIMIT_SYNC_BATCH = int(os.getenv('RATE_LIMIT_SYNC_BATCH', 10))  # Peticiones por lote enviado a Redis
+    RATE_LIMIT_SYNC_INTERVAL = float(os.getenv('RATE_LIMIT_SYNC_INTERVAL', 1.0))  # Segundos máximos entre lotes
+    RATE_LIMIT_MAX_BUCKETS = int(os.getenv('RATE_LIMIT_MAX_BUCKETS', 100000))
 
 
 class DevelopmentConfig(Config):
@@ -1,9 +1,13 @@
 from flask import Flask, jsonify, redirect  
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
 from config.config import config_dict
 from routes.register_routes import register_routes
 from utils.error_handlers import register_error_handlers
+from utils.conditional import register_conditional_responses
+from utils.compression import register_compression
+from utils.rate_limit import register_rate_limiting
+from utils.metrics import register_request_metrics
+from utils.server_timing import register_server_timing
+from utils.tracing import register_tracing
 from utils.logger import get_logger
 import os
 from flask_cors import CORS
@@ -17,13 +21,17 @@ def create_app(config_name='development'):
     
     # Habilita CORS para todos los orígenes y rutas
 
-    # Inicializamos el limiter
-    limiter = Limiter(
-        key_func=get_remote_address,  # Usa key_func en vez de pasar la función directo
-        default_limits=[app.config['LIMTER_DEFAULT_LIMIT']],
-        storage_uri=app.config['LIMTER_STORAGE_URL']
-    )
-    limiter.init_app(app)
+    # Métricas por petición; primero, para medir también el resto de hooks
+    register_request_metrics(app)
+
+    # Server-Timing y log de tiempos por petición (admins con header de depuración o muestreo)
+    register_server_timing(app)
+
+    # Trazas distribuidas: un span por petición y uno por llamada a cada microservicio
+    register_tracing(app)
+
+    # Inicializamos el rate limiting por usuario, ruta y rol
+    register_rate_limiting(app)
     
     @app.route('/')
     def root_redirect():
@@ -46,9 +54,16 @@ def create_app(config_name='development'):
 
    # Registramos manejadores de errores
     register_error_handlers(app)
+
+    # Compresión negociada; va antes del GET condicional para ejecutarse después de él
+    register_compression(app)
+
+    # ETag y respuestas 304 para GETs condicionales
+    register_conditional_responses(app)
     
     return app
 
+# Servidor de desarrollo de Werkzeug; en producción se usa gunicorn (gunicorn.conf.py y src/wsgi.py)
 if __name__ == '__main__':
     env = os.getenv('FLASK_ENV', 'development')
     app = create_app(env)
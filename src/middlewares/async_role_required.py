@@ -0,0 +1,36 @@
+from functools import wraps
+import inspect
+import jwt
+from utils.async_http import json_response
+from utils.tokens import verify_bearer
+
+
+def async_role_required(required_roles):
+    """
+    Equivalente de `role_required` para los handlers del modo asyncio (aiohttp).
+    """
+    def decorator(f):
+        # Se comprueba una sola vez, al decorar, si el handler acepta `token_data`
+        accepts_token_data = "token_data" in inspect.signature(f).parameters
+
+        @wraps(f)
+        async def wrapper(request):
+            token = request.headers.get('Authorization')
+            if not token:
+                return json_response({"message": "Token is missing!"}, 401)
+
+            try:
+                token_data = verify_bearer(token)
+                request['token_claims'] = token_data
+                if token_data.get("role") not in required_roles:
+                    return json_response({"message": "No tienes permisos para este recurso."}, 403)
+            except jwt.ExpiredSignatureError:
+                return json_response({"message": "El token ha expirado."}, 401)
+            except jwt.InvalidTokenError:
+                return json_response({"message": "Token inválido."}, 401)
+
+            if accepts_token_data:
+                return await f(request, token_data=token_data)
+            return await f(request)
+        return wrapper
+    return decorator
@@ -0,0 +1,35 @@
+from flask import g, request
+from utils.server_timing import timed
+from utils.tokens import verify_bearer
+
+
+class TokenMissingError(Exception):
+    """
+    La petición no incluye el header Authorization.
+    """
+
+
+def get_token_claims():
+    """
+    Devuelve los claims del JWT de la petición actual.
+    El token se verifica una sola vez por petición; el resultado (o el error) queda en `g`
+    para los decoradores y handlers que lo necesiten después.
+
+    Raises:
+        TokenMissingError: Si no se envió el header Authorization.
+        jwt.ExpiredSignatureError: Si el token expiró.
+        jwt.InvalidTokenError: Si el token no es válido.
+    """
+    if 'token_claims' not in g:
+        authorization = request.headers.get('Authorization')
+        try:
+            if not authorization:
+                raise TokenMissingError()
+            with timed('jwt'):
+                g.token_claims, g.token_error = verify_bearer(authorization), None
+        except Exception as e:
+            g.token_claims, g.token_error = None, e
+
+    if g.token_error is not None:
+        raise g.token_error
+    return g.token_claims
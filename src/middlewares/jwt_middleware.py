@@ -1,17 +1,15 @@
 from functools import wraps
-from flask import request, jsonify, current_app
+from flask import jsonify
 import jwt
+from middlewares.auth_context import get_token_claims, TokenMissingError
 
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = request.headers.get('Authorization')
-        if not token:
-            return jsonify({"message": "Token is missing!"}), 401
-
         try:
-            token = token.split("Bearer ")[1]
-            data = jwt.decode(token, current_app.config['JWT_SECRET_KEY'], algorithms=["HS256"])
+            get_token_claims()
+        except TokenMissingError:
+            return jsonify({"message": "Token is missing!"}), 401
         except (jwt.ExpiredSignatureError, jwt.InvalidTokenError):
             return jsonify({"message": "Token is invalid or expired!"}), 401
 
@@ -0,0 +1,120 @@
+from flask import Blueprint, Response, current_app, jsonify, request
+from middlewares.role_required import role_required
+from services.resilience import breaker_stats
+from utils import profiling
+from utils.cache import cache_stats
+
+admin_bp = Blueprint('admin', __name__)
+
+
+@admin_bp.route('/caches', methods=['GET'])
+@role_required(["admin"])
+def get_cache_stats():
+    """
+    Muestra el estado de las cachés del gateway (tamaño, TTL, aciertos y fallos).
+
+    Returns:
+        Response: Estadísticas por caché en formato JSON.
+    """
+    return jsonify(cache_stats()), 200
+
+
+@admin_bp.route('/upstreams', methods=['GET'])
+@role_required(["admin"])
+def get_upstream_stats():
+    """
+    Muestra el estado del circuit breaker de cada microservicio.
+
+    Returns:
+        Response: Estado, fallos consecutivos, llamadas rechazadas y transiciones por upstream.
+    """
+    return jsonify(breaker_stats()), 200
+
+
+# -----------------------
+# DEPURACIÓN EN PRODUCCIÓN
+# -----------------------
+
+@admin_bp.route('/debug/profile', methods=['GET'])
+@role_required(["admin"])
+def profile_threads():
+    """
+    Perfila todos los hilos del proceso durante unos segundos mediante muestreo de pilas.
+
+    Query params:
+        seconds (float): Duración del muestreo (máximo PROFILER_MAX_SECONDS). Por defecto 5.
+        interval (float): Segundos entre muestras. Por defecto 0.01.
+
+    Returns:
+        Response: Pilas colapsadas en texto plano ("pila cantidad" por línea), para flamegraph.pl o speedscope.
+    """
+    try:
+        seconds = float(request.args.get("seconds", 5))
+        interval = float(request.args.get("interval", 0.01))
+    except ValueError:
+        return jsonify({"message": "Los parámetros 'seconds' e 'interval' deben ser numéricos."}), 400
+    if seconds <= 0 or interval <= 0:
+        return jsonify({"message": "Los parámetros 'seconds' e 'interval' deben ser positivos."}), 400
+
+    seconds = min(seconds, current_app.config['PROFILER_MAX_SECONDS'])
+    try:
+        stacks = profiling.sample_stacks(seconds, max(interval, 0.001))
+    except profiling.ProfilerBusyError:
+        return jsonify({"message": "Ya hay un perfilado en curso."}), 409
+    return Response(stacks, mimetype='text/plain'), 200
+
+
+@admin_bp.route('/debug/tracemalloc/start', methods=['POST'])
+@role_required(["admin"])
+def start_tracemalloc():
+    """
+    Inicia el registro de asignaciones de memoria y toma el snapshot de referencia para los diffs.
+
+    Query params:
+        frames (int): Profundidad de las pilas registradas. Por defecto 1.
+    """
+    frames = request.args.get("frames", 1, type=int)
+    return jsonify(profiling.start_tracemalloc(max(1, frames))), 200
+
+
+@admin_bp.route('/debug/tracemalloc/snapshot', methods=['GET'])
+@role_required(["admin"])
+def tracemalloc_snapshot():
+    """
+    Muestra las líneas de código con más memoria asignada.
+
+    Query params:
+        limit (int): Cantidad de líneas. Por defecto 20.
+    """
+    try:
+        return jsonify(profiling.top_allocations(request.args.get("limit", 20, type=int))), 200
+    except profiling.TracingNotStartedError:
+        return jsonify({"message": "tracemalloc no está activo. Inícialo con POST /admin/debug/tracemalloc/start."}), 409
+
+
+@admin_bp.route('/debug/tracemalloc/diff', methods=['GET'])
+@role_required(["admin"])
+def tracemalloc_diff():
+    """
+    Muestra el crecimiento de memoria por línea respecto del snapshot de referencia.
+
+    Query params:
+        limit (int): Cantidad de líneas. Por defecto 20.
+        reset (bool): Si es 'true', el snapshot actual pasa a ser la nueva referencia.
+    """
+    try:
+        return jsonify(profiling.diff_allocations(
+            request.args.get("limit", 20, type=int),
+            reset_baseline=request.args.get("reset", "").lower() == "true",
+        )), 200
+    except profiling.TracingNotStartedError:
+        return jsonify({"message": "tracemalloc no está activo. Inícialo con POST /admin/debug/tracemalloc/start."}), 409
+
+
+@admin_bp.route('/debug/tracemalloc/stop', methods=['POST'])
+@role_required(["admin"])
+def stop_tracemalloc():
+    """
+    Detiene el registro de asignaciones y libera la memoria que usa.
+    """
+    return jsonify(profiling.stop_tracemalloc()), 200
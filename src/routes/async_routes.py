@@ -0,0 +1,389 @@
+import asyncio
+import itertools
+
+import jwt
+from aiohttp import web
+
+from config.config import Config
+from middlewares.async_role_required import async_role_required
+from routes.competition_routes import (
+    COMPETITION_SERVICE_URL, EXPANSIONS, enrichment_ids, merge_enrichment, plan_enrichment
+)
+from routes.questions_routes import PAGINATION_PARAMS
+from services.async_proxy import async_proxy_service_request
+from services.async_services import AsyncAuthService, AsyncQuestionService, AsyncQuizService
+from services.auth_service import AuthService
+from utils.async_http import json_response
+from utils import json_codec
+from utils.field_selection import parse_list, select_fields
+from utils.json_stream import NDJSON_MIMETYPE
+from utils.pagination import InvalidCursorError, catalog_variant, take_page
+from utils.tokens import verify_bearer
+
+# Rutas del modo asyncio. Replican el comportamiento de los blueprints síncronos
+# (auth, questions, quizzes, competitions y quiz-participation) sobre aiohttp.
+
+auth_routes = web.RouteTableDef()
+qa_routes = web.RouteTableDef()
+quiz_routes = web.RouteTableDef()
+competition_routes = web.RouteTableDef()
+quiz_participation_routes = web.RouteTableDef()
+
+
+async def _json_body(request, silent=False):
+    try:
+        return await request.json()
+    except ValueError:
+        if silent:
+            return None
+        raise
+
+
+def _catalog_variant(request):
+    """
+    Paginación por cursor / NDJSON pedida para un catálogo (ver utils.pagination.catalog_variant).
+    """
+    return catalog_variant(request.query, request.headers.get('Accept'),
+                           Config.CATALOG_PAGE_SIZE, Config.CATALOG_MAX_PAGE_SIZE)
+
+
+async def _catalog_response(request, items, ndjson, paging):
+    """
+    Misma respuesta que utils.pagination.catalog_response. El cliente asíncrono lee el cuerpo completo
+    del microservicio, así que aquí se pagina (o se emite en NDJSON) la lista ya decodificada.
+    """
+    if ndjson:
+        response = web.StreamResponse(headers={'Content-Type': NDJSON_MIMETYPE})
+        await response.prepare(request)
+        for item in items:
+            await response.write((json_codec.dumps(item) + "\n").encode('utf-8'))
+        await response.write_eof()
+        return response
+
+    offset, limit = paging
+    page, next_cursor = take_page(itertools.islice(items, offset, None), offset, limit)
+    return json_response({"items": page, "next_cursor": next_cursor})
+
+
+# -----------------------
+# AUTENTICACIÓN
+# -----------------------
+
+@auth_routes.post('/login')
+async def auth_login(request):
+    data, status = await AsyncAuthService.login(await _json_body(request))
+    return json_response(data, status)
+
+
+@auth_routes.post('/register')
+async def auth_register(request):
+    data, status = await AsyncAuthService.register(await _json_body(request))
+    return json_response(data, status)
+
+
+@auth_routes.get('/me')
+async def auth_me(request):
+    token = request.headers.get('Authorization')
+    if not token:
+        return json_response({"message": "Token is missing!"}, 401)
+
+    if not Config.AUTH_ME_LOCAL:
+        data, status = await AsyncAuthService.me(token)
+        return json_response(data, status)
+
+    try:
+        claims = verify_bearer(token)
+    except jwt.ExpiredSignatureError:
+        return json_response({"message": "El token ha expirado."}, 401)
+    except jwt.InvalidTokenError:
+        return json_response({"message": "Token inválido."}, 401)
+
+    refresh = request.query.get('refresh', '').lower() in ('1', 'true') or \
+        'no-cache' in request.headers.get('Cache-Control', '')
+    data, status = await AsyncAuthService.me_cached(token, claims, refresh=refresh)
+    return json_response(data, status)
+
+
+@auth_routes.get('/list')
+@async_role_required(["admin", "moderator"])
+async def auth_list_users(request):
+    data, status = await AsyncAuthService.list_users(request.headers.get('Authorization'))
+    return json_response(data, status)
+
+
+@auth_routes.get('/protected')
+async def auth_protected(request):
+    token = request.headers.get('Authorization')
+    if not token:
+        return json_response({"message": "Token is missing!"}, 401)
+
+    data, status = AuthService.protected_route(token)
+    return json_response(data, status)
+
+
+# -----------------------
+# PREGUNTAS Y CATEGORÍAS
+# -----------------------
+
+@qa_routes.get('/categories')
+async def get_all_categories(request):
+    data, status = await AsyncQuestionService.list_categories()
+    return json_response(data, status)
+
+
+@qa_routes.post('/categories')
+@async_role_required(["admin", "moderator"])
+async def create_category(request):
+    data, status = await AsyncQuestionService.create_category(await _json_body(request))
+    return json_response(data, status)
+
+
+@qa_routes.get('')
+async def get_all_questions(request):
+    try:
+        ndjson, paging = _catalog_variant(request)
+    except InvalidCursorError as e:
+        return json_response({"message": str(e)}, 400)
+
+    params = {name: value for name, value in request.query.items() if name not in PAGINATION_PARAMS}
+    data, status = await AsyncQuestionService.list_questions(params)
+    if status != 200 or (paging is None and not ndjson):
+        return json_response(data, status)
+    return await _catalog_response(request, data, ndjson, paging)
+
+
+@qa_routes.get(r'/category/{category_id:\d+}')
+@async_role_required(["admin", "moderator"])
+async def questions_list_by_category(request):
+    data, status = await AsyncQuestionService.list_questions_by_category(int(request.match_info['category_id']))
+    return json_response(data, status)
+
+
+@qa_routes.post('')
+@async_role_required(["admin", "moderator"])
+async def create_question(request, token_data):
+    data = await _json_body(request)
+    data["question"]["created_by"] = token_data.get("user_id")
+    response_data, status = await AsyncQuestionService.create_question_with_answers(data)
+    return json_response(response_data, status)
+
+
+@qa_routes.get(r'/{question_id:\d+}')
+@async_role_required(["admin", "moderator"])
+async def get_question_by_id(request):
+    data, status = await AsyncQuestionService.get_question_by_id(int(request.match_info['question_id']))
+    return json_response(data, status)
+
+
+@qa_routes.put(r'/{question_id:\d+}')
+@async_role_required(["admin", "moderator"])
+async def update_question(request, token_data):
+    data = await _json_body(request)
+    data["question"]["modified_by"] = token_data.get("user_id")
+    response_data, status = await AsyncQuestionService.update_question_with_answers(
+        int(request.match_info['question_id']), data)
+    return json_response(response_data, status)
+
+
+# -----------------------
+# CUESTIONARIOS
+# -----------------------
+
+@quiz_routes.get('')
+async def get_all_quizzes(request):
+    quiz_ids_param = request.query.get("quiz_ids")
+    if quiz_ids_param:
+        try:
+            quiz_ids = list(map(int, quiz_ids_param.split(",")))
+        except ValueError:
+            return json_response({"message": "Formato inválido en 'quiz_ids'"}, 400)
+    else:
+        quiz_ids = None
+
+    try:
+        ndjson, paging = _catalog_variant(request)
+    except InvalidCursorError as e:
+        return json_response({"message": str(e)}, 400)
+
+    data, status = await AsyncQuizService.list_quizzes(quiz_ids)
+    if status != 200 or (paging is None and not ndjson):
+        return json_response(data, status)
+    return await _catalog_response(request, data, ndjson, paging)
+
+
+@quiz_routes.post('')
+@async_role_required(["admin", "moderator"])
+async def create_quiz(request, token_data):
+    data = await _json_body(request)
+    data["quiz"]["created_by"] = token_data.get("user_id")
+    response_data, status = await AsyncQuizService.create_quiz(data)
+    return json_response(response_data, status)
+
+
+@quiz_routes.get(r'/{quiz_id:\d+}')
+@async_role_required(["admin", "moderator"])
+async def get_quiz_by_id(request):
+    data, status = await AsyncQuizService.get_quiz_by_id(int(request.match_info['quiz_id']))
+    return json_response(data, status)
+
+
+@quiz_routes.put(r'/{quiz_id:\d+}')
+@async_role_required(["admin", "moderator"])
+async def update_quiz(request, token_data):
+    data = await _json_body(request)
+    data["quiz"]["modified_by"] = token_data.get("user_id")
+    response_data, status = await AsyncQuizService.update_quiz(int(request.match_info['quiz_id']), data)
+    return json_response(response_data, status)
+
+
+# -----------------------
+# COMPETENCIAS
+# -----------------------
+
+async def _proxy(request, method, path, **kwargs):
+    data, status = await async_proxy_service_request(request, method, path, service_url=COMPETITION_SERVICE_URL,
+                                                     **kwargs)
+    return json_response(data, status)
+
+
+@competition_routes.get('')
+async def get_all_competitions(request):
+    fields = parse_list(request.query.get('fields'))
+    data, status = await async_proxy_service_request(request, "GET", "/competitions",
+                                                     service_url=COMPETITION_SERVICE_URL)
+    if status == 200:
+        data = select_fields(data, fields)
+    return json_response(data, status)
+
+
+@competition_routes.get(r'/{competition_id:\d+}')
+async def get_competition_by_id(request):
+    """
+    Obtiene una competencia y la enriquece con usuarios, quizzes y categorías consultados en paralelo.
+    Admite ?fields= y ?expand= como la ruta síncrona.
+    """
+    fields = parse_list(request.query.get('fields'))
+    plan = plan_enrichment(fields, parse_list(request.query.get('expand')))
+    if plan is None:
+        return json_response({"message": f"Valores de expand no válidos. Opciones: {', '.join(EXPANSIONS)}"}, 400)
+
+    competition_id = int(request.match_info['competition_id'])
+    competition, status = await async_proxy_service_request(
+        request, "GET", f"/competitions/{competition_id}", service_url=COMPETITION_SERVICE_URL)
+    if status != 200:
+        return json_response(competition, status)
+
+    user_ids, quiz_ids = enrichment_ids(competition, plan)
+    calls = {}
+    if user_ids:
+        calls["users"] = AsyncAuthService.get_users_by_ids(user_ids)
+    if quiz_ids:
+        calls["quizzes"] = AsyncQuizService.list_quizzes(quiz_ids)
+    if plan["categories"] and competition.get("quizzes"):
+        calls["categories"] = AsyncQuestionService.list_categories()
+    results = dict(zip(calls.keys(), await asyncio.gather(*calls.values())))
+
+    merge_enrichment(competition, plan, results)
+    return json_response(select_fields(competition, fields), 200)
+
+
+@competition_routes.post('')
+@async_role_required(["admin", "moderator"])
+async def create_competition(request, token_data):
+    data = await _json_body(request)
+    data["created_by"] = token_data.get("user_id")
+
+    quiz_ids = [quiz["quiz_id"] for quiz in data.get("quizzes", [])]
+    quizzes_exist, error_message = await AsyncQuizService.validate_quizzes_exist(quiz_ids)
+    if not quizzes_exist:
+        return json_response({"message": "Algunos quizzes no existen", "error": error_message}, 400)
+
+    return await _proxy(request, "POST", "/competitions", json=data)
+
+
+@competition_routes.put(r'/{competition_id:\d+}')
+@async_role_required(["admin", "moderator"])
+async def update_competition(request, token_data):
+    data = await _json_body(request)
+    data["modified_by"] = token_data.get("user_id")
+
+    if "quizzes" in data:
+        quiz_ids = [quiz.get("quiz_id") for quiz in data["quizzes"] if "quiz_id" in quiz]
+        if quiz_ids:
+            quizzes_exist, error_message = await AsyncQuizService.validate_quizzes_exist(quiz_ids)
+            if not quizzes_exist:
+                return json_response({"message": "Algunos quizzes no existen", "error": error_message}, 400)
+
+    return await _proxy(request, "PUT", f"/competitions/{request.match_info['competition_id']}", json=data)
+
+
+@competition_routes.post(r'/{competition_id:\d+}/participants/{participant_id:\d+}')
+@async_role_required(["admin", "moderator"])
+async def proxy_add_participant_as_admin(request):
+    return await _proxy(
+        request, "POST",
+        f"/competitions/{request.match_info['competition_id']}/participants/{request.match_info['participant_id']}")
+
+
+@competition_routes.post(r'/{competition_id:\d+}/participants')
+@async_role_required(['usuario', "user", "admin", "moderator"])
+async def proxy_self_register_to_competition(request, token_data):
+    user_id = token_data.get("user_id")
+    return await _proxy(request, "POST", f"/competitions/{request.match_info['competition_id']}/participants/{user_id}")
+
+
+@competition_routes.get(r'/{competition_id:\d+}/ranking')
+async def proxy_get_competition_ranking(request):
+    return await _proxy(request, "GET", f"/competitions/{request.match_info['competition_id']}/ranking")
+
+
+@competition_routes.get('/users')
+@async_role_required(['usuario', 'user', 'admin', 'moderator'])
+async def get_user_competitions(request, token_data):
+    return await _proxy(request, "GET", f"/competitions/users/{token_data['user_id']}", params=request.query)
+
+
+# -----------------------
+# PARTICIPACIÓN EN CUESTIONARIOS
+# -----------------------
+
+def _participation_path(request, suffix=''):
+    return (f"/quiz-participation/{request.match_info['competition_quiz_id']}"
+            f"/participant/{request.match_info['participant_id']}{suffix}")
+
+
+@quiz_participation_routes.post(r'/{competition_quiz_id:\d+}/participant/{participant_id:\d+}/start')
+async def proxy_start_quiz(request):
+    data, status = await async_proxy_service_request(
+        request, "POST", _participation_path(request, '/start'), service_url=COMPETITION_SERVICE_URL)
+    if status != 200:
+        return json_response(data, status)
+
+    quiz_id = data.get("quiz_id")
+    quiz_data, quiz_status = await AsyncQuizService.get_quiz_by_id(quiz_id) if quiz_id else (None, None)
+    data["quiz"] = quiz_data if quiz_status == 200 and quiz_data else None
+    return json_response(data, 200)
+
+
+@quiz_participation_routes.post(r'/{competition_quiz_id:\d+}/participant/{participant_id:\d+}/finish')
+async def proxy_finish_quiz(request):
+    # El spool de envíos diferidos (FINISH_SPOOL_ENABLED) solo existe en el modo síncrono:
+    # aquí el envío siempre se reenvía en línea
+    return await _proxy(request, "POST", _participation_path(request, '/finish'),
+                        json=await _json_body(request, silent=True))
+
+
+@quiz_participation_routes.get(r'/{competition_quiz_id:\d+}/participant/{participant_id:\d+}/answers')
+async def proxy_get_user_answers(request):
+    return await _proxy(request, "GET", _participation_path(request, '/answers'))
+
+
+@quiz_participation_routes.get(r'/{competition_quiz_id:\d+}/answers')
+async def proxy_get_all_quiz_answers(request):
+    return await _proxy(request, "GET", f"/quiz-participation/{request.match_info['competition_quiz_id']}/answers",
+                        params=request.query)
+
+
+@quiz_participation_routes.get(r'/{competition_quiz_id:\d+}/participant/{participant_id:\d+}')
+async def proxy_get_complete_quiz_by_user(request):
+    return await _proxy(request, "GET", _participation_path(request))
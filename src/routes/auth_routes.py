@@ -1,5 +1,7 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
+import jwt
 from services import AuthService
+from middlewares.auth_context import get_token_claims
 from middlewares.role_required import role_required
 
 auth_bp = Blueprint('auth', __name__)
@@ -23,7 +25,22 @@ def auth_me():
     if not token:
         return jsonify({"message": "Token is missing!"}), 401
 
-    data, status = AuthService.me(token)
+    if not current_app.config.get('AUTH_ME_LOCAL'):
+        data, status = AuthService.me(token)
+        return jsonify(data), status
+
+    # Modo local: token verificado por el gateway + caché de perfiles.
+    # ?refresh=true o "Cache-Control: no-cache" fuerzan la consulta al servicio de autenticación.
+    try:
+        claims = get_token_claims()
+    except jwt.ExpiredSignatureError:
+        return jsonify({"message": "El token ha expirado."}), 401
+    except jwt.InvalidTokenError:
+        return jsonify({"message": "Token inválido."}), 401
+
+    refresh = request.args.get('refresh', '').lower() in ('1', 'true') or \
+        'no-cache' in request.headers.get('Cache-Control', '')
+    data, status = AuthService.me_cached(token, claims, refresh=refresh)
     return jsonify(data), status
 
 
@@ -0,0 +1,105 @@
+from flask import Blueprint, current_app, jsonify, request
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+from utils import json_codec, tracing
+from utils.concurrency import get_executor, submit
+
+batch_bp = Blueprint('batch', __name__)
+
+ALLOWED_METHODS = {'GET', 'POST', 'PUT', 'PATCH', 'DELETE'}
+
+# Headers de la petición batch que se comparten con cada sub-petición
+SHARED_HEADERS = ('Authorization', 'Accept-Language')
+
+# Headers de cada sub-respuesta que se devuelven al cliente
+RETURNED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Retry-After', 'X-Cache')
+
+
+def _validate(items, max_items):
+    """
+    Devuelve un mensaje de error si la lista de sub-peticiones no es válida, o None.
+    """
+    if not isinstance(items, list) or not items:
+        return "El campo 'requests' debe ser una lista no vacía."
+    if len(items) > max_items:
+        return f"Se admiten como máximo {max_items} sub-peticiones por batch."
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            return f"La sub-petición {index} debe ser un objeto."
+        if str(item.get("method", "GET")).upper() not in ALLOWED_METHODS:
+            return f"Método no permitido en la sub-petición {index}."
+        path = item.get("path")
+        if not isinstance(path, str) or not path.startswith('/'):
+            return f"La sub-petición {index} debe tener un 'path' que empiece con '/'."
+        if path.split('?', 1)[0].rstrip('/') == request.path.rstrip('/'):
+            return "No se permiten batches anidados."
+    return None
+
+
+def _dispatch(app, item, shared_headers, remote_addr):
+    """
+    Ejecuta una sub-petición por el camino normal del gateway (rutas, auth, rate limiting, cachés).
+    """
+    headers = dict(shared_headers)
+    span = tracing.current_span()
+    if span is not None:
+        # Las sub-peticiones quedan en la misma traza que el batch
+        headers['traceparent'] = span.traceparent
+
+    builder = EnvironBuilder(
+        path=item["path"],
+        method=str(item.get("method", "GET")).upper(),
+        headers=headers,
+        json=item.get("body"),
+        environ_base={'REMOTE_ADDR': remote_addr},
+    )
+    try:
+        app_iter, status, response_headers = run_wsgi_app(app.wsgi_app, builder.get_environ(), buffered=True)
+        body = b''.join(app_iter)
+    finally:
+        builder.close()
+
+    result = {"status": int(status.split(' ', 1)[0])}
+    if item.get("id") is not None:
+        result["id"] = item["id"]
+    result["headers"] = {name: response_headers[name] for name in RETURNED_HEADERS if name in response_headers}
+    result["body"] = body.decode('utf-8', errors='replace')
+    if response_headers.get('Content-Type', '').startswith('application/json') and body:
+        try:
+            result["body"] = json_codec.loads(body)
+        except ValueError:
+            # Un microservicio puede declarar JSON y enviar otra cosa (p. ej. una página HTML de error):
+            # esa sub-respuesta se devuelve como texto sin hacer fallar el batch completo
+            pass
+    return result
+
+
+@batch_bp.route('', methods=['POST'])
+def run_batch():
+    """
+    Ejecuta varias llamadas al gateway en un solo viaje de ida y vuelta.
+
+    Cuerpo:
+        {"requests": [{"id": "me", "method": "GET", "path": "/auth/me"},
+                      {"method": "POST", "path": "/competitions", "body": {...}}]}
+
+    Cada sub-petición pasa por el enrutado, la autenticación y el rate limiting normales, con el
+    header Authorization del batch. Se ejecutan en paralelo con concurrencia acotada (BATCH_MAX_CONCURRENCY).
+
+    Returns:
+        Response: {"responses": [{"id", "status", "headers", "body"}, ...]} en el mismo orden que la petición.
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get("requests")
+    error = _validate(items, current_app.config['BATCH_MAX_ITEMS'])
+    if error:
+        return jsonify({"message": error}), 400
+
+    app = current_app._get_current_object()
+    shared_headers = {name: request.headers[name] for name in SHARED_HEADERS if name in request.headers}
+    remote_addr = request.remote_addr or '127.0.0.1'
+
+    # Pool propio: las sub-peticiones usan a su vez el pool 'default' para el fan-out
+    get_executor('batch', current_app.config['BATCH_MAX_CONCURRENCY'])
+    futures = [submit(_dispatch, app, item, shared_headers, remote_addr, executor='batch') for item in items]
+    return jsonify({"responses": [future.result() for future in futures]}), 200
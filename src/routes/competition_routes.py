@@ -1,8 +1,15 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify, url_for
+import jwt
 from services import  QuizService, AuthService, QuestionService
+from middlewares.auth_context import get_token_claims, TokenMissingError
 from middlewares.role_required import role_required
 from services.proxy import proxy_service_request
+from utils.concurrency import run_parallel
+from utils.field_selection import parse_list_param, select_fields
+from utils.microcache import micro_cached
+from utils.server_timing import timed, record
 import os
+import time
 
 # Creación del blueprint para rutas relacionadas a competencias
 competition_bp = Blueprint('competitions', __name__)
@@ -17,71 +24,113 @@ COMPETITION_SERVICE_URL = 'http://' + os.getenv('COMPETITION_HOST', 'localhost')
 # -----------------------
 
 @competition_bp.route('', methods=['GET'])
+@micro_cached('MICROCACHE_COMPETITIONS_TTL', vary='role')
 def get_all_competitions():
     """
     Lista todas las competencias disponibles.
 
+    Query params:
+        fields (str, optional): Campos de cada competencia a devolver, separados por comas (?fields=id,title).
+
     Returns:
         Response: Lista de competencias en formato JSON.
     """
-    return proxy_service_request("GET", "/competitions", service_url=COMPETITION_SERVICE_URL)
+    fields = parse_list_param('fields')
+    resp, status = proxy_service_request("GET", "/competitions", service_url=COMPETITION_SERVICE_URL)
+    if fields is None or status != 200:
+        return resp, status
 
+    competitions = resp.get_json() if hasattr(resp, 'get_json') else resp
+    return jsonify(select_fields(competitions, fields)), 200
 
-@competition_bp.route('/<int:competition_id>', methods=['GET'])
-def get_competition_by_id(competition_id):
-    """
-    Obtiene una competencia específica por su ID y enriquece los participantes con datos de usuario.
 
-    Args:
-        competition_id (int): Identificador de la competencia.
+# Enriquecimientos de la competencia que se pueden pedir con ?expand=
+EXPANSIONS = ('participants', 'users', 'quizzes', 'categories')
+
+
+def plan_enrichment(fields, expand):
+    """
+    Decide qué enriquecimientos del detalle de competencia hacen falta según ?fields= y ?expand=.
+    Compartido por las rutas síncronas y las del modo asyncio.
 
     Returns:
-        Response: Datos de la competencia si existe.
+        dict | None: Enriquecimiento -> bool, o None si expand trae valores desconocidos.
     """
-    # 1. Obtener detalle de la competencia
-    resp, status = proxy_service_request("GET", f"/competitions/{competition_id}", service_url=COMPETITION_SERVICE_URL)
-    if status != 200:
-        return resp, status
+    if expand is not None and not expand <= set(EXPANSIONS):
+        return None
 
-    competition = resp.get_json() if hasattr(resp, 'get_json') else resp
+    def wanted(field):
+        return fields is None or field in fields
 
-    # 2. Enriquecer participantes usando bulk
-    participants = competition.get("participants", [])
-    print("Participants:", participants)
-    participant_ids = [p.get("participant_id") for p in participants if p.get("participant_id") is not None]
-    users_data, users_status = AuthService.get_users_by_ids(participant_ids)
-    users_dict = {u["id"]: u for u in users_data.get("users", [])} if users_status == 200 else {}
+    def expanded(name):
+        return expand is None or name in expand
+
+    quizzes = wanted("quizzes") and expanded("quizzes")
+    return {
+        "participants": wanted("participants") and expanded("participants"),
+        "created_by": wanted("created_by") and expanded("users"),
+        "modified_by": wanted("modified_by") and expanded("users"),
+        "quizzes": quizzes,
+        "categories": quizzes and expanded("categories"),
+    }
 
-    enriched_participants = []
-    for p in participants:
-        user_id = p.get("participant_id")
-        user = users_dict.get(user_id, {})
-        enriched = dict(p)  # Copia todos los datos originales
-        enriched["username"] = user.get("username", "Desconocido")
-        if "competition_id" in enriched:
-            del enriched["competition_id"]
-        enriched_participants.append(enriched)
-    competition["participants"] = enriched_participants
-
-    # 3. Enriquecer created_by y modified_by
+
+
+def enrichment_ids(competition, plan):
+    """
+    IDs a consultar para enriquecer una competencia según el plan de `plan_enrichment`.
+    Participantes, created_by y modified_by se resuelven en una sola llamada bulk.
+
+    Returns:
+        tuple: (IDs de usuario sin duplicados, IDs de quiz).
+    """
     user_ids = []
-    if competition.get("created_by"):
+    if plan["participants"]:
+        user_ids.extend(p.get("participant_id") for p in competition.get("participants", [])
+                        if p.get("participant_id") is not None)
+    if plan["created_by"] and competition.get("created_by"):
         user_ids.append(competition["created_by"])
-    if competition.get("modified_by"):
+    if plan["modified_by"] and competition.get("modified_by"):
         user_ids.append(competition["modified_by"])
-    user_ids = list(set(user_ids))  # Evita duplicados
-    users_data, users_status = AuthService.get_users_by_ids(user_ids)
+    user_ids = list(dict.fromkeys(user_ids))  # Evita duplicados conservando el orden
+    quiz_ids = [q.get("quiz_id") for q in competition.get("quizzes", [])
+                if q.get("quiz_id") is not None] if plan["quizzes"] else []
+    return user_ids, quiz_ids
+
+
+def merge_enrichment(competition, plan, results):
+    """
+    Combina la competencia con los resultados de las consultas de enriquecimiento.
+    Compartido por las rutas síncronas y las del modo asyncio, que solo difieren en cómo consultan.
+
+    Args:
+        competition (dict): Detalle de la competencia (se modifica).
+        plan (dict): Enriquecimientos a aplicar (ver `plan_enrichment`).
+        results (dict): (datos, estatus) por consulta: 'users', 'quizzes' y 'categories'.
+    """
+    users_data, users_status = results.get("users", ({}, None))
     users_dict = {u["id"]: u for u in users_data.get("users", [])} if users_status == 200 else {}
 
+    # Enriquecer participantes
+    if plan["participants"]:
+        enriched_participants = []
+        for p in competition.get("participants", []):
+            user = users_dict.get(p.get("participant_id"), {})
+            enriched = dict(p)  # Copia todos los datos originales
+            enriched["username"] = user.get("username", "Desconocido")
+            enriched.pop("competition_id", None)
+            enriched_participants.append(enriched)
+        competition["participants"] = enriched_participants
+
     # Agrupar datos de created_by y modified_by en objetos
-    if competition.get("created_by"):
+    if plan["created_by"] and competition.get("created_by"):
         user = users_dict.get(competition["created_by"], {})
         competition["created_by"] = {
             "id": competition["created_by"],
             "username": user.get("username", "Desconocido"),
             "date": competition.get("created_at")
         }
-    if competition.get("modified_by"):
+    if plan["modified_by"] and competition.get("modified_by"):
         user = users_dict.get(competition["modified_by"], {})
         competition["modified_by"] = {
             "id": competition["modified_by"],
@@ -89,35 +138,82 @@ def get_competition_by_id(competition_id):
             "date": competition.get("updated_at")
         }
 
-    # 4. Enriquecer quizzes
-    quizzes = competition.get("quizzes", [])
-    quiz_ids = [q.get("quiz_id") for q in quizzes if q.get("quiz_id") is not None]
-    quizzes_data, quizzes_status = QuizService.list_quizzes(quiz_ids)
-    quizzes_dict = {q["id"]: q for q in quizzes_data} if quizzes_status == 200 else {}
-
-    # Obtener categorías para mapear id -> nombre
-    categories_data, categories_status = QuestionService.list_categories()
-    categories_dict = {c["id"]: c["name"] for c in categories_data} if categories_status == 200 else {}
-
-    enriched_quizzes = []
-    for q in quizzes:
-        quiz_id = q.get("quiz_id")
-        quiz_info = quizzes_dict.get(quiz_id, {})
-        enriched = dict(q)
-        if "competition_id" in enriched:
-            del enriched["competition_id"]
-        # Agregar/enriquecer campos desde el microservicio de quizzes
-        enriched["category_id"] = quiz_info.get("category_id")
-        enriched["category_name"] = categories_dict.get(quiz_info.get("category_id"), "Desconocida")
-        enriched["title"] = quiz_info.get("title")
-        enriched["state"] = quiz_info.get("state")
-        # Prioriza el time_limit original de la competencia
-        enriched["time_limit"] = enriched.get("time_limit", quiz_info.get("time_limit"))
-        enriched["questions_count"] = len(quiz_info.get("questions", [])) if quiz_info.get("questions") else 0
-        enriched_quizzes.append(enriched)
-    competition["quizzes"] = enriched_quizzes
-
-    return jsonify(competition), 200
+    # Enriquecer quizzes
+    if plan["quizzes"]:
+        quizzes_data, quizzes_status = results.get("quizzes", ([], None))
+        quizzes_dict = {q["id"]: q for q in quizzes_data} if quizzes_status == 200 else {}
+
+        # Categorías para mapear id -> nombre
+        categories_data, categories_status = results.get("categories", ([], None))
+        categories_dict = {c["id"]: c["name"] for c in categories_data} if categories_status == 200 else {}
+
+        enriched_quizzes = []
+        for q in competition.get("quizzes", []):
+            quiz_info = quizzes_dict.get(q.get("quiz_id"), {})
+            enriched = dict(q)
+            enriched.pop("competition_id", None)
+            # Agregar/enriquecer campos desde el microservicio de quizzes
+            enriched["category_id"] = quiz_info.get("category_id")
+            if plan["categories"]:
+                enriched["category_name"] = categories_dict.get(quiz_info.get("category_id"), "Desconocida")
+            enriched["title"] = quiz_info.get("title")
+            enriched["state"] = quiz_info.get("state")
+            # Prioriza el time_limit original de la competencia
+            enriched["time_limit"] = enriched.get("time_limit", quiz_info.get("time_limit"))
+            enriched["questions_count"] = len(quiz_info.get("questions", [])) if quiz_info.get("questions") else 0
+            enriched_quizzes.append(enriched)
+        competition["quizzes"] = enriched_quizzes
+    return competition
+
+@competition_bp.route('/<int:competition_id>', methods=['GET'])
+def get_competition_by_id(competition_id):
+    """
+    Obtiene una competencia específica por su ID y enriquece los participantes con datos de usuario.
+
+    Query params:
+        fields (str, optional): Campos de primer nivel a devolver (?fields=title,quizzes). Por defecto, todos.
+        expand (str, optional): Enriquecimientos a aplicar, entre 'participants' (nombres de usuario),
+            'users' (created_by / modified_by), 'quizzes' (datos del quiz) y 'categories' (nombre de la
+            categoría de cada quiz). Por defecto, todos los que afecten a los campos pedidos.
+            Los campos sin expandir se devuelven tal como los entrega el microservicio.
+
+    Args:
+        competition_id (int): Identificador de la competencia.
+
+    Returns:
+        Response: Datos de la competencia si existe.
+    """
+    # Solo se hacen las llamadas y los recorridos de los campos pedidos
+    fields = parse_list_param('fields')
+    plan = plan_enrichment(fields, parse_list_param('expand'))
+    if plan is None:
+        return jsonify({"message": f"Valores de expand no válidos. Opciones: {', '.join(EXPANSIONS)}"}), 400
+
+    # 1. Obtener detalle de la competencia
+    resp, status = proxy_service_request("GET", f"/competitions/{competition_id}", service_url=COMPETITION_SERVICE_URL)
+    if status != 200:
+        return resp, status
+
+    competition = resp.get_json() if hasattr(resp, 'get_json') else resp
+
+    # 2. Consultas de enriquecimiento en paralelo: son independientes entre sí
+    user_ids, quiz_ids = enrichment_ids(competition, plan)
+    calls = {}
+    if user_ids:
+        calls["users"] = (AuthService.get_users_by_ids, user_ids)
+    if quiz_ids:
+        calls["quizzes"] = (QuizService.list_quizzes, quiz_ids)
+    if plan["categories"] and competition.get("quizzes"):
+        calls["categories"] = (QuestionService.list_categories,)
+    with timed('enrichment', 'fetch'):
+        results = run_parallel(calls)
+    merge_started_at = time.perf_counter()
+
+    # 3. Enriquecer participantes, created_by / modified_by y quizzes
+    merge_enrichment(competition, plan, results)
+    record('enrichment', merge_started_at, 'merge')
+
+    return jsonify(select_fields(competition, fields)), 200
 
 
 @competition_bp.route('', methods=['POST'])
@@ -222,12 +318,16 @@ def proxy_self_register_to_competition(competition_id, token_data):
 
 
 @competition_bp.route('/<int:competition_id>/ranking', methods=['GET'])
+@micro_cached('MICROCACHE_RANKING_TTL', vary='role')
 def proxy_get_competition_ranking(competition_id):
     """
     Proxy: Obtiene el ranking de una competencia.
 
     Método: GET
     Endpoint: /competitions/<competition_id>/ranking
+
+    Es la ruta más consultada durante una competencia: se sirve desde la micro-caché, así que usa el
+    proxy JSON (el gateway comprime la respuesta guardada) y no el paso directo en streaming.
     """
     return proxy_service_request(
         "GET",
@@ -269,12 +369,84 @@ def proxy_start_quiz(competition_quiz_id, participant_id):
 # -----------------------------------------------
 @quiz_participation_bp.route('/<int:competition_quiz_id>/participant/<int:participant_id>/finish', methods=['POST'])
 def proxy_finish_quiz(competition_quiz_id, participant_id):
-    return proxy_service_request(
-        method="POST",
-        path=f"/quiz-participation/{competition_quiz_id}/participant/{participant_id}/finish",
-        service_url=COMPETITION_SERVICE_URL,
-        json=request.get_json(silent=True)
-    )
+    path = f"/quiz-participation/{competition_quiz_id}/participant/{participant_id}/finish"
+    spool = current_app.extensions.get('finish_spool')
+    if spool is None:
+        return proxy_service_request(
+            method="POST",
+            path=path,
+            service_url=COMPETITION_SERVICE_URL,
+            stream=True
+        )
+
+    # Con FINISH_SPOOL_ENABLED el envío se valida, se guarda y se reenvía en segundo plano:
+    # como el microservicio no lo verá hasta más tarde, el token (firma y `exp`) se comprueba aquí
+    claims, error = _spool_token_claims()
+    if error is not None:
+        return error
+
+    # Solo el propio participante (o un admin) puede finalizar en su nombre
+    user_id = claims.get("user_id")
+    if user_id != participant_id and claims.get("role") != "admin":
+        return jsonify({"message": "No tienes permisos para este recurso."}), 403
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get("answers", []), list):
+        return jsonify({"message": "El envío debe ser un objeto JSON con una lista 'answers'."}), 400
+
+    # Un participante finaliza cada quiz una sola vez: los reintentos del cliente reciben el mismo recibo.
+    # La clave incluye el quiz, el participante y el usuario del token, así el Idempotency-Key de un
+    # cliente nunca coincide con el envío de otro usuario
+    idempotency_key = f"finish:{competition_quiz_id}:{participant_id}:{user_id}"
+    client_key = request.headers.get('Idempotency-Key')
+    if client_key:
+        idempotency_key += f":{client_key}"
+    receipt, _ = spool.enqueue(path, request.get_data(), request.headers, idempotency_key, claims)
+    status_url = url_for('quiz-participation.get_finish_receipt', receipt_id=receipt['receipt_id'])
+    response = jsonify({**receipt, "message": "Envío recibido; se procesará en breve.", "status_url": status_url})
+    response.headers['Location'] = status_url
+    return response, 202
+
+
+# -----------------------------------------------
+# 🧾 Estado de un envío diferido de "finalizar quiz"
+# GET /quiz-participation/receipts/<receipt_id>
+# -----------------------------------------------
+@quiz_participation_bp.route('/receipts/<receipt_id>', methods=['GET'])
+def get_finish_receipt(receipt_id):
+    """
+    Devuelve el estado de un envío guardado en el spool: pending, delivered, rejected o failed.
+    Una vez terminado incluye la respuesta del microservicio de competencias.
+    Solo lo consulta el usuario que hizo el envío o un admin.
+    """
+    claims, error = _spool_token_claims()
+    if error is not None:
+        return error
+
+    spool = current_app.extensions.get('finish_spool')
+    receipt = spool.get(receipt_id) if spool is not None else None
+    if receipt is None:
+        return jsonify({"message": "Recibo no encontrado."}), 404
+    if receipt["user_id"] != str(claims.get("user_id")) and claims.get("role") != "admin":
+        return jsonify({"message": "No tienes permisos para este recurso."}), 403
+    return jsonify(receipt), 200
+
+
+def _spool_token_claims():
+    """
+    Claims del token de la petición para las rutas del spool.
+
+    Returns:
+        tuple: (claims, None) o (None, respuesta de error 401).
+    """
+    try:
+        return get_token_claims(), None
+    except TokenMissingError:
+        return None, (jsonify({"message": "Token is missing!"}), 401)
+    except jwt.ExpiredSignatureError:
+        return None, (jsonify({"message": "El token ha expirado."}), 401)
+    except jwt.InvalidTokenError:
+        return None, (jsonify({"message": "Token inválido."}), 401)
 
 # -----------------------------------------------
 # 🔍 Proxy: Obtener respuestas de un participante
@@ -285,7 +457,8 @@ def proxy_get_user_answers(competition_quiz_id, participant_id):
     return proxy_service_request(
         method="GET",
         path=f"/quiz-participation/{competition_quiz_id}/participant/{participant_id}/answers",
-        service_url=COMPETITION_SERVICE_URL
+        service_url=COMPETITION_SERVICE_URL,
+        stream=True
     )
 
 # -----------------------------------------------
@@ -298,7 +471,8 @@ def proxy_get_all_quiz_answers(competition_quiz_id):
         method="GET",
         path=f"/quiz-participation/{competition_quiz_id}/answers",
         service_url=COMPETITION_SERVICE_URL,
-        params=request.args
+        params=request.args,
+        stream=True
     )
 
 # -----------------------------------------------
@@ -0,0 +1,47 @@
+from flask import Blueprint, Response, current_app
+from services import upstream
+from services.resilience import breaker_stats, CLOSED, OPEN, HALF_OPEN
+from utils import metrics
+from utils.cache import cache_stats
+from utils.rate_limit import rate_limit_exempt
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+def metrics_gauges(spool=None):
+    """
+    Métricas calculadas en el momento de la consulta: cachés, circuit breakers, pools de conexiones
+    y spool de envíos (si se pasa; el modo asyncio no lo tiene).
+    """
+    for name, stats in cache_stats().items():
+        labels = (('cache', name),)
+        yield 'gateway_cache_hit_ratio', 'Proporción de aciertos de cada caché.', labels, stats['hit_ratio']
+        yield 'gateway_cache_entries', 'Entradas guardadas en cada caché.', labels, stats['size']
+
+    for name, stats in breaker_stats().items():
+        for state in (CLOSED, OPEN, HALF_OPEN):
+            yield ('gateway_circuit_breaker_state', 'Estado actual del circuit breaker de cada upstream (1 = activo).',
+                   (('upstream', name), ('state', state)), int(stats['state'] == state))
+
+    for stats in upstream.pool_stats():
+        labels = (('upstream', stats['upstream']), ('host', stats['host']))
+        yield 'gateway_upstream_pool_in_use', 'Conexiones del pool prestadas a una llamada.', labels, stats['in_use']
+        yield 'gateway_upstream_pool_maxsize', 'Tamaño máximo del pool de conexiones.', labels, stats['maxsize']
+
+    if spool is not None:
+        for status, count in spool.counts().items():
+            yield ('gateway_finish_spool_items', 'Envíos de "finalizar quiz" en el spool por estado.',
+                   (('status', status),), count)
+
+
+@metrics_bp.route('', methods=['GET'])
+@rate_limit_exempt
+def get_metrics():
+    """
+    Métricas del gateway en formato de texto de Prometheus.
+
+    Returns:
+        Response: Contadores, histogramas de latencia y gauges por ruta, upstream, caché y pool.
+    """
+    gauges = metrics_gauges(current_app.extensions.get('finish_spool'))
+    return Response(metrics.render(gauges), content_type=metrics.CONTENT_TYPE)
@@ -1,9 +1,13 @@
 from flask import Blueprint, request, jsonify
 from services import QuestionService
 from middlewares.role_required import role_required
+from utils.pagination import catalog_response
 
 qa_bp = Blueprint('questions', __name__)
 
+# Parámetros que resuelve el gateway y no se reenvían al microservicio
+PAGINATION_PARAMS = ('limit', 'cursor', 'format')
+
 
 # rutas para categorias
 @qa_bp.route('/categories', methods=['GET'])
@@ -20,8 +24,16 @@ def create_category():
 
 @qa_bp.route('', methods=['GET'])
 def get_all_questions():
-    # Obtén los parámetros de la query string
+    # Obtén los parámetros de la query string (los de paginación y formato son del gateway)
     params = request.args.to_dict()
+    for name in PAGINATION_PARAMS:
+        params.pop(name, None)
+
+    # ?limit= / ?cursor= devuelven una página; Accept: application/x-ndjson, una pregunta por línea
+    paged = catalog_response(lambda skip: QuestionService.iter_questions(params, skip))
+    if paged is not None:
+        return paged
+
     data, status = QuestionService.list_questions(params)
     return jsonify(data), status
 
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from services import QuizService
 from middlewares.role_required import role_required
+from utils.microcache import micro_cached
+from utils.pagination import catalog_response
 
 quiz_bp = Blueprint('quizzes', __name__)
 
@@ -26,9 +28,13 @@ def get_all_quizzesOLD():
     return jsonify(data), status
 
 @quiz_bp.route('', methods=['GET'])
+@micro_cached('MICROCACHE_QUIZZES_TTL')
 def get_all_quizzes():
     """
     Lista todos los cuestionarios o filtra por IDs si se proporciona el parámetro 'quiz_ids'.
+
+    Con ?limit= / ?cursor= responde una página ({"items", "next_cursor"}) y con
+    Accept: application/x-ndjson (o ?format=ndjson) envía un cuestionario por línea.
     """
     quiz_ids_param = request.args.get("quiz_ids")
 
@@ -40,6 +46,10 @@ def get_all_quizzes():
     else:
         quiz_ids = None
 
+    paged = catalog_response(lambda skip: QuizService.iter_quizzes(quiz_ids, skip))
+    if paged is not None:
+        return paged
+
     data, status = QuizService.list_quizzes(quiz_ids)
     return jsonify(data), status
 
@@ -2,7 +2,11 @@ from flask import Flask
 from routes.auth_routes import auth_bp
 from routes.questions_routes import qa_bp
 from routes.quizzes_routes import quiz_bp
-from routes.competition_routes import competition_bp, quiz_participation_bp
+from routes.competition_routes import competition_bp, quiz_participation_bp, COMPETITION_SERVICE_URL
+from routes.admin_routes import admin_bp
+from routes.metrics_routes import metrics_bp
+from routes.batch_routes import batch_bp
+from services.finish_spool import register_finish_spool
 
 def register_routes(app: Flask):
     """
@@ -16,4 +20,9 @@ def register_routes(app: Flask):
     app.register_blueprint(quiz_bp, url_prefix='/quizzes')
     app.register_blueprint(competition_bp, url_prefix='/competitions')
     app.register_blueprint(quiz_participation_bp, url_prefix='/quiz-participation')
+    app.register_blueprint(admin_bp, url_prefix='/admin')
+    app.register_blueprint(metrics_bp, url_prefix='/metrics')
+    app.register_blueprint(batch_bp, url_prefix='/batch')
 
+    # Envíos de "finalizar quiz" con escritura diferida (FINISH_SPOOL_ENABLED)
+    register_finish_spool(app, COMPETITION_SERVICE_URL)
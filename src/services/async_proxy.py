@@ -0,0 +1,41 @@
+import asyncio
+
+import aiohttp
+
+from services import async_upstream
+
+
+async def async_proxy_service_request(request, method, path, json=None, params=None, service_url=None, headers=None,
+                                      upstream=async_upstream.COMPETITION):
+    """
+    Versión asíncrona de proxy_service_request para el modo asyncio del gateway.
+
+    Args:
+        request (aiohttp.web.Request): Petición entrante (se reenvía su header Authorization).
+        method (str): Método HTTP (GET, POST, PUT, DELETE, etc.).
+        path (str): Ruta del microservicio, por ejemplo "/competitions".
+        json (dict, optional): Cuerpo de la solicitud, si aplica.
+        params (dict, optional): Parámetros de consulta (query params).
+        service_url (str): URL base del microservicio.
+        headers (dict, optional): Headers adicionales a enviar (opcional).
+        upstream (str, optional): Upstream cuyo pool de conexiones se utiliza.
+
+    Returns:
+        tuple: (datos, status) de la respuesta del microservicio.
+    """
+    url = f"{service_url}{path}"
+
+    forwarded_headers = headers.copy() if headers else {}
+    auth_header = request.headers.get('Authorization')
+    if auth_header:
+        forwarded_headers['Authorization'] = auth_header
+
+    try:
+        resp = await async_upstream.request(upstream, method, url, json=json, params=params, headers=forwarded_headers)
+        return resp.json(), resp.status_code
+    except aiohttp.ClientConnectionError:
+        return {"message": "Error al conectar con el microservicio"}, 503
+    except asyncio.TimeoutError:
+        return {"message": "El microservicio no respondió a tiempo"}, 504
+    except ValueError:
+        return {"message": "Respuesta no válida del microservicio"}, 502
@@ -0,0 +1,205 @@
+import asyncio
+import copy
+import aiohttp
+
+from services import async_upstream
+from services.auth_service import AuthService
+from services.question_service import QuestionService
+from services.quiz_service import QuizService
+from utils.logger import get_logger
+logger = get_logger(__name__)
+
+# Versiones asíncronas de los servicios. Reutilizan las URLs y las cachés de las clases síncronas,
+# de modo que ambos modos del gateway comparten el mismo comportamiento.
+
+
+async def _call(upstream, method, url, connection_message, **kwargs):
+    """
+    Realiza la llamada y devuelve (datos, status) con los mismos mensajes de error que los servicios síncronos.
+    """
+    try:
+        response = await async_upstream.request(upstream, method, url, **kwargs)
+        return response.json(), response.status_code
+    except aiohttp.ClientConnectionError:
+        return {"message": connection_message}, 503
+    except asyncio.TimeoutError:
+        return {"message": "El microservicio no respondió a tiempo"}, 504
+    except Exception as e:
+        return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
+
+
+AUTH_CONNECTION_ERROR = "Error de conexión con el servicio de autenticación."
+QA_CONNECTION_ERROR = "Error de conexión con el servicio de preguntas y respuestas."
+QUIZ_CONNECTION_ERROR = "Error de conexión con el servicio de cuestionarios."
+
+
+class AsyncAuthService:
+    """
+    Interacción asíncrona con el servicio de autenticación.
+    """
+
+    @staticmethod
+    async def login(payload):
+        response = await async_upstream.post(async_upstream.AUTH, f"{AuthService.AUTH_URL}/login", json=payload)
+        return response.json(), response.status_code
+
+    @staticmethod
+    async def register(payload):
+        response = await async_upstream.post(async_upstream.AUTH, f"{AuthService.AUTH_URL}/register", json=payload)
+        return response.json(), response.status_code
+
+    @staticmethod
+    async def me(token):
+        return await _call(async_upstream.AUTH, 'GET', f"{AuthService.AUTH_URL}/me", AUTH_CONNECTION_ERROR,
+                           headers={"Authorization": token})
+
+    @staticmethod
+    async def me_cached(token, claims, refresh=False):
+        """
+        Perfil del usuario autenticado desde la caché de perfiles (ver AuthService.me_cached).
+        """
+        key = AuthService.profile_key(claims)
+        if key is not None and not refresh:
+            profile = AuthService.profiles_cache.get(key)
+            if profile is not None:
+                return dict(profile) if isinstance(profile, dict) else profile, 200
+
+        data, status = await AsyncAuthService.me(token)
+        if status == 200 and key is not None:
+            AuthService.profiles_cache.set(key, data)
+        return data, status
+
+    @staticmethod
+    async def list_users(token):
+        return await _call(async_upstream.AUTH, 'GET', f"{AuthService.AUTH_USER_URL}/list", AUTH_CONNECTION_ERROR,
+                           headers={"Authorization": token})
+
+    @staticmethod
+    async def get_users_by_ids(ids, token=None):
+        """
+        Obtiene datos de múltiples usuarios por una lista de IDs, consultando solo los que no están en caché.
+        """
+        ids = list(dict.fromkeys(ids))
+        cached = AuthService.users_cache.get_many(ids)
+        missing = [user_id for user_id in ids if user_id not in cached]
+        if not missing:
+            return {"users": list(cached.values())}, 200
+
+        headers = {"Authorization": token} if token else {}
+        data, status = await _call(async_upstream.AUTH, 'POST', f"{AuthService.AUTH_USER_URL}/bulk",
+                                   AUTH_CONNECTION_ERROR, json={"ids": missing}, headers=headers)
+        if status != 200:
+            return data, status
+
+        fetched = data.get("users", [])
+        AuthService.users_cache.set_many({u["id"]: u for u in fetched if "id" in u})
+        data["users"] = list(cached.values()) + fetched
+        return data, 200
+
+
+class AsyncQuestionService:
+    """
+    Interacción asíncrona con el servicio de preguntas y respuestas.
+    """
+
+    @staticmethod
+    async def list_categories():
+        cached = QuestionService.categories_cache.get('all')
+        if cached is not None:
+            return copy.deepcopy(cached), 200
+
+        generation = QuestionService.categories_cache.generation
+        data, status = await _call(async_upstream.QA, 'GET', QuestionService.QA_CATEGORIES_URL, QA_CONNECTION_ERROR)
+        if status == 200:
+            QuestionService.categories_cache.set('all', copy.deepcopy(data), generation=generation)
+        return data, status
+
+    @staticmethod
+    async def create_category(data):
+        response_data, status = await _call(async_upstream.QA, 'POST', QuestionService.QA_CATEGORIES_URL,
+                                            AUTH_CONNECTION_ERROR, json=data)
+        if 200 <= status < 300:
+            QuestionService.categories_cache.invalidate()
+        return response_data, status
+
+    @staticmethod
+    async def list_questions(params=None):
+        return await _call(async_upstream.QA, 'GET', QuestionService.QA_URL, QA_CONNECTION_ERROR, params=params)
+
+    @staticmethod
+    async def list_questions_by_category(category_id):
+        return await _call(async_upstream.QA, 'GET', f"{QuestionService.QA_URL}/category/{category_id}",
+                           AUTH_CONNECTION_ERROR)
+
+    @staticmethod
+    async def create_question_with_answers(data):
+        return await _call(async_upstream.QA, 'POST', QuestionService.QA_URL, QA_CONNECTION_ERROR, json=data)
+
+    @staticmethod
+    async def get_question_by_id(question_id):
+        return await _call(async_upstream.QA, 'GET', f"{QuestionService.QA_URL}/{question_id}", QA_CONNECTION_ERROR)
+
+    @staticmethod
+    async def update_question_with_answers(question_id, data):
+        return await _call(async_upstream.QA, 'PUT', f"{QuestionService.QA_URL}/{question_id}", QA_CONNECTION_ERROR,
+                           json=data)
+
+
+class AsyncQuizService:
+    """
+    Interacción asíncrona con el servicio de cuestionarios.
+    """
+
+    @staticmethod
+    async def list_quizzes(quiz_ids=None):
+        """
+        Lista todos los cuestionarios o solo los especificados en 'quiz_ids'.
+        """
+        params = {"quiz_ids": ",".join(map(str, quiz_ids))} if quiz_ids else {}
+        data, status = await _call(async_upstream.QA, 'GET', QuizService.QA_URL, QUIZ_CONNECTION_ERROR, params=params)
+        if status == 200:
+            # Asegurar que todos los quizzes tengan la clave 'questions'
+            for quiz in data:
+                if 'questions' not in quiz:
+                    quiz['questions'] = []
+        return data, status
+
+    @staticmethod
+    async def create_quiz(data):
+        return await _call(async_upstream.QA, 'POST', QuizService.QA_URL, QUIZ_CONNECTION_ERROR, json=data)
+
+    @staticmethod
+    async def get_quiz_by_id(quiz_id):
+        data, status = await _call(async_upstream.QA, 'GET', f"{QuizService.QA_URL}/{quiz_id}", QUIZ_CONNECTION_ERROR)
+        if status == 200 and 'quiz' not in data:
+            data['quiz'] = []
+        return data, status
+
+    @staticmethod
+    async def update_quiz(quiz_id, data):
+        return await _call(async_upstream.QA, 'PUT', f"{QuizService.QA_URL}/{quiz_id}", QUIZ_CONNECTION_ERROR,
+                           json=data)
+
+    @staticmethod
+    async def validate_quizzes_exist(quiz_ids):
+        """
+        Valida que los quizzes especificados existen en el sistema.
+
+        Returns:
+            tuple: (bool, str) -> True si todos existen, False con mensaje de error si alguno no existe.
+        """
+        try:
+            response = await async_upstream.get(async_upstream.QA, QuizService.QA_URL,
+                                                params={"quiz_ids": ",".join(map(str, quiz_ids))})
+            if response.status_code != 200:
+                return False, f"Error al consultar el servicio de quizzes: {response.text}"
+
+            existing_quizzes = {quiz["id"] for quiz in response.json()}
+            missing_quizzes = [quiz_id for quiz_id in quiz_ids if quiz_id not in existing_quizzes]
+            if missing_quizzes:
+                return False, f"Los siguientes quizzes no existen: {missing_quizzes}"
+            return True, ""
+        except aiohttp.ClientConnectionError:
+            return False, "Error de conexión con el servicio de quizzes."
+        except Exception as e:
+            return False, f"Error inesperado: {str(e)}"
@@ -0,0 +1,160 @@
+import asyncio
+import os
+import time
+
+import aiohttp
+from yarl import URL
+
+from config.config import Config
+from services import resilience
+from services.upstream import AUTH, QA, COMPETITION
+from utils import json_codec, metrics
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_sessions = {}
+_inflight = {}
+
+
+class CircuitOpenError(aiohttp.ClientConnectionError):
+    """
+    El circuito del upstream está abierto (equivalente asíncrono de resilience.CircuitOpenError).
+    """
+
+
+class UpstreamResponse:
+    """
+    Respuesta ya leída de un upstream, con la misma interfaz básica que requests.Response
+    (status_code, headers, content, text y json()).
+    """
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json_codec.loads(self.content)
+
+
+def _pool_limit(upstream):
+    return int(os.getenv(f"{upstream.upper()}_POOL_MAXSIZE", Config.UPSTREAM_POOL_MAXSIZE))
+
+
+def get_session(upstream):
+    """
+    Devuelve la sesión aiohttp del upstream para el event loop actual, creándola la primera vez.
+    """
+    loop = asyncio.get_running_loop()
+    key = (upstream, loop)
+    session = _sessions.get(key)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=_pool_limit(upstream), keepalive_timeout=30)
+        session = aiohttp.ClientSession(
+            connector=connector,
+            cookie_jar=aiohttp.DummyCookieJar(),  # Sesión compartida: no guarda cookies
+        )
+        _sessions[key] = session
+        logger.info(f"Pool de conexiones asíncrono creado para el upstream '{upstream}'")
+    return session
+
+
+async def _send_once(session, method, url, **kwargs):
+    async with session.request(method, url, timeout=aiohttp.ClientTimeout(total=Config.SERVICE_TIMEOUT),
+                               **kwargs) as response:
+        content = await response.read()
+        return UpstreamResponse(response.status, response.headers, content)
+
+
+async def _send(upstream, method, url, **kwargs):
+    """
+    Envía la solicitud con la misma capa de resiliencia que el cliente síncrono:
+    reintentos con backoff para métodos idempotentes y circuit breaker compartido por upstream.
+    """
+    session = get_session(upstream)
+    breaker = resilience.get_breaker(upstream)
+    attempts = resilience.max_attempts(method)
+
+    for attempt in range(attempts):
+        if not breaker.allow():
+            metrics.upstream_error(upstream, 'circuit_open')
+            raise CircuitOpenError(f"Circuito abierto para el upstream '{upstream}'")
+        last_attempt = attempt == attempts - 1
+        metrics.upstream_started(upstream)
+        start = time.perf_counter()
+        try:
+            response = await _send_once(session, method, url, **kwargs)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            metrics.upstream_error(upstream, 'timeout' if isinstance(e, asyncio.TimeoutError) else 'connection')
+            if last_attempt:
+                breaker.record_failure()
+                raise
+            # El breaker cuenta llamadas, no intentos: solo el último intento fallido suma un fallo
+            breaker.release()
+            logger.warning(f"Reintentando {method} {url} ({attempt + 1}/{attempts}): {e!r}")
+        except BaseException:
+            breaker.release()
+            raise
+        else:
+            metrics.observe_upstream(upstream, method, response.status_code, time.perf_counter() - start)
+            if response.status_code not in resilience.RETRYABLE_STATUSES:
+                breaker.record_success()
+                return response
+            if last_attempt:
+                breaker.record_failure()
+                return response
+            breaker.release()
+            logger.warning(f"Reintentando {method} {url} ({attempt + 1}/{attempts}): status {response.status_code}")
+        finally:
+            metrics.upstream_finished(upstream)
+        await asyncio.sleep(resilience.backoff_delay(attempt))
+
+
+async def request(upstream, method, url, json=None, params=None, headers=None):
+    """
+    Envía una solicitud a un upstream desde el event loop, reutilizando su pool de conexiones.
+    Los GETs idénticos concurrentes comparten una única llamada en curso.
+
+    Returns:
+        UpstreamResponse: Respuesta del microservicio con el cuerpo ya leído.
+
+    Raises:
+        aiohttp.ClientConnectionError: Si no se puede conectar con el microservicio.
+    """
+    if method.upper() != 'GET' or json is not None or not Config.UPSTREAM_COALESCE_GETS:
+        return await _send(upstream, method, url, json=json, params=params, headers=headers)
+
+    key = (asyncio.get_running_loop(), upstream, str(URL(url).update_query(params or {})), tuple(sorted((headers or {}).items())))
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_send(upstream, method, url, params=params, headers=headers))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # shield: si un cliente cancela su petición, la llamada compartida sigue para los demás
+    return await asyncio.shield(task)
+
+
+async def get(upstream, url, **kwargs):
+    return await request(upstream, 'GET', url, **kwargs)
+
+
+async def post(upstream, url, **kwargs):
+    return await request(upstream, 'POST', url, **kwargs)
+
+
+async def put(upstream, url, **kwargs):
+    return await request(upstream, 'PUT', url, **kwargs)
+
+
+async def close_sessions():
+    """
+    Cierra las sesiones del event loop actual.
+    """
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _sessions if key[1] is loop]:
+        await _sessions.pop(key).close()
@@ -1,8 +1,12 @@
 import requests
+from services import upstream
 import jwt
 import os
 from config.config import Config
+from utils.cache import TTLCache
+from utils.json_codec import decode_response
 from utils.logger import get_logger
+from utils.tokens import verify_bearer
 logger = get_logger(__name__)
 
 
@@ -17,16 +21,21 @@ class AuthService:
     AUTH_URL = AUTH_SERVICE_URL + '/auth'
     AUTH_USER_URL = AUTH_SERVICE_URL + '/users'
 
+    # Datos de usuario por ID (los nombres de usuario casi no cambian)
+    users_cache = TTLCache('users', Config.USERS_CACHE_TTL, maxsize=Config.USERS_CACHE_MAXSIZE)
+    # Perfiles devueltos por /auth/me, por ID de usuario y claims del token que afectan al perfil
+    profiles_cache = TTLCache('profiles', Config.PROFILE_CACHE_TTL, maxsize=Config.PROFILE_CACHE_MAXSIZE)
+
     @staticmethod
     def login(payload):
         logger.warning(f"AUTH_URL: {AuthService.AUTH_URL}")
-        response = requests.post(f"{AuthService.AUTH_URL}/login", json=payload)
-        return response.json(), response.status_code
+        response = upstream.post(upstream.AUTH, f"{AuthService.AUTH_URL}/login", json=payload)
+        return decode_response(response), response.status_code
 
     @staticmethod
     def register(payload):
-        response = requests.post(f"{AuthService.AUTH_URL}/register", json=payload)
-        return response.json(), response.status_code
+        response = upstream.post(upstream.AUTH, f"{AuthService.AUTH_URL}/register", json=payload)
+        return decode_response(response), response.status_code
     # metodo para me
     @staticmethod
     def me(token):
@@ -35,13 +44,50 @@ class AuthService:
             headers = {"Authorization": token}
             
             # Realiza la solicitud al servicio de autenticación
-            response = requests.get(f"{AuthService.AUTH_URL}/me", headers=headers)
-            return response.json(), response.status_code
+            response = upstream.get(upstream.AUTH, f"{AuthService.AUTH_URL}/me", headers=headers)
+            return decode_response(response), response.status_code
         except requests.exceptions.ConnectionError:
             return {"message": "Error de conexión con el servicio de autenticación."}, 503
+        except requests.exceptions.Timeout:
+            return {"message": "El servicio de autenticación no respondió a tiempo."}, 504
         except Exception as e:
             return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
         
+    @staticmethod
+    def me_cached(token, claims, refresh=False):
+        """
+        Perfil del usuario autenticado servido desde la caché de perfiles.
+        Solo se consulta al servicio de autenticación si no está en caché o si se pide refrescarlo.
+
+        Args:
+            token (str): Header Authorization del cliente.
+            claims (dict): Claims del JWT ya verificado.
+            refresh (bool): Ignora la caché y vuelve a consultar el perfil.
+        """
+        key = AuthService.profile_key(claims)
+        if key is not None and not refresh:
+            profile = AuthService.profiles_cache.get(key)
+            if profile is not None:
+                return dict(profile) if isinstance(profile, dict) else profile, 200
+
+        data, status = AuthService.me(token)
+        if status == 200 and key is not None:
+            AuthService.profiles_cache.set(key, data)
+        return data, status
+
+    # Claims del JWT que cambian el perfil devuelto por /auth/me: un token nuevo con otro rol
+    # no debe recibir el perfil guardado con el rol anterior
+    PROFILE_CLAIMS = ("user_id", "role")
+
+    @staticmethod
+    def profile_key(claims):
+        """
+        Clave de la caché de perfiles para unos claims, o None si el token no identifica al usuario.
+        """
+        if claims.get("user_id") is None:
+            return None
+        return tuple(claims.get(name) for name in AuthService.PROFILE_CLAIMS)
+
     @staticmethod
     def list_users(token):
         try:
@@ -49,22 +95,20 @@ class AuthService:
             headers = {"Authorization": token}
             
             # Realiza la solicitud al servicio de autenticación
-            response = requests.get(f"{AuthService.AUTH_USER_URL}/list", headers=headers)
-            return response.json(), response.status_code
+            response = upstream.get(upstream.AUTH, f"{AuthService.AUTH_USER_URL}/list", headers=headers)
+            return decode_response(response), response.status_code
         except requests.exceptions.ConnectionError:
             return {"message": "Error de conexión con el servicio de autenticación."}, 503
+        except requests.exceptions.Timeout:
+            return {"message": "El servicio de autenticación no respondió a tiempo."}, 504
         except Exception as e:
             return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
 
         
     @staticmethod
     def protected_route(token):
-        from src.config.config import Config
-        import jwt
-
         try:
-            token = token.split("Bearer ")[1]
-            data = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"])
+            data = verify_bearer(token)
             return {"message": "Token válido", "user_id": data['user_id']}, 200
         except Exception as e:
             return {"message": "Token is invalid!", "error": str(e)}, 401
@@ -73,12 +117,28 @@ class AuthService:
     def get_users_by_ids(ids, token=None):
         """
         Obtiene datos de múltiples usuarios por una lista de IDs.
+        Solo se consultan al servicio los IDs que no están en la caché.
         """
+        ids = list(dict.fromkeys(ids))
+        cached = AuthService.users_cache.get_many(ids)
+        missing = [user_id for user_id in ids if user_id not in cached]
+        if not missing:
+            return {"users": list(cached.values())}, 200
+
         try:
             headers = {"Authorization": token} if token else {}
-            response = requests.post(f"{AuthService.AUTH_USER_URL}/bulk", json={"ids": ids}, headers=headers)
-            return response.json(), response.status_code
+            response = upstream.post(upstream.AUTH, f"{AuthService.AUTH_USER_URL}/bulk", json={"ids": missing}, headers=headers)
+            data = decode_response(response)
+            if response.status_code != 200:
+                return data, response.status_code
+
+            fetched = data.get("users", [])
+            AuthService.users_cache.set_many({u["id"]: u for u in fetched if "id" in u})
+            data["users"] = list(cached.values()) + fetched
+            return data, 200
         except requests.exceptions.ConnectionError:
             return {"message": "Error de conexión con el servicio de autenticación."}, 503
+        except requests.exceptions.Timeout:
+            return {"message": "El servicio de autenticación no respondió a tiempo."}, 504
         except Exception as e:
             return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
\ No newline at end of file
@@ -0,0 +1,386 @@
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+
+import requests
+
+from services import upstream as upstream_client
+from utils.concurrency import get_executor, submit
+from utils.logger import get_logger
+from utils.tokens import issue_token
+
+logger = get_logger(__name__)
+
+# Estados de un envío guardado en el spool
+PENDING = 'pending'        # Esperando su turno (o el próximo reintento)
+SENDING = 'sending'        # Reclamado por un drenador; si el lease vence vuelve a estar disponible
+DELIVERED = 'delivered'    # El microservicio lo aceptó (2xx / 3xx)
+REJECTED = 'rejected'      # El microservicio lo rechazó (4xx definitivo): no se reintenta
+FAILED = 'failed'          # Se agotaron los reintentos
+
+TERMINAL_STATES = (DELIVERED, REJECTED, FAILED)
+
+# Estados que un nuevo envío con la misma clave de idempotencia vuelve a encolar (con el cuerpo nuevo)
+REQUEUE_STATES = (REJECTED, FAILED)
+
+# Respuestas del microservicio que se reintentan más tarde
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Headers de la petición original que se reenvían al drenar. El token del cliente no se guarda:
+# el drenador firma uno propio, de vida corta, con los claims ya verificados (ver `_deliver`)
+FORWARDED_HEADERS = ('Content-Type',)
+
+# Claims del token del cliente que no se copian al token del drenador
+_TIME_CLAIMS = ('exp', 'nbf', 'iat')
+
+# Spools abiertos en este proceso (se reabren en los procesos hijos tras un fork)
+_spools = weakref.WeakSet()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS finish_spool (
+    receipt_id TEXT PRIMARY KEY,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    body BLOB NOT NULL,
+    headers TEXT NOT NULL,
+    user_id TEXT,
+    claims TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    response_status INTEGER,
+    response_body TEXT,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS finish_spool_due ON finish_spool (status, next_attempt_at);
+"""
+
+# Columnas añadidas después de la primera versión del esquema (archivos de spool ya existentes)
+_ADDED_COLUMNS = (('user_id', 'TEXT'), ('claims', 'TEXT'))
+
+
+class FinishSpool:
+    """
+    Cola durable (SQLite) de envíos de "finalizar quiz" con escritura diferida.
+
+    La petición del cliente solo valida y guarda el envío; un hilo drenador lo reenvía al
+    microservicio de competencias con concurrencia acotada, reintentos con backoff y un
+    header Idempotency-Key, de modo que el pico de fin de competencia llega como un flujo constante.
+
+    Los envíos se reclaman con un lease: si el proceso muere a mitad de un envío, el lease
+    vence y otro drenador (de este u otro proceso con el mismo archivo) lo retoma.
+    """
+
+    def __init__(self, path, service_url, concurrency=4, max_attempts=8, retry_base=1.0, retry_max=60.0,
+                 lease=60.0, poll_interval=0.5, retention=86400, token_ttl=60):
+        self.path = path
+        self.service_url = service_url
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.token_ttl = token_ttl
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        # Si el drenador debe correr en este proceso y en los hijos creados con fork
+        self.autostart = False
+        self._last_purge = time.monotonic()
+        self._db = self._connect()
+        _spools.add(self)
+
+    def _connect(self):
+        # Autocommit: las transacciones se abren explícitamente con BEGIN IMMEDIATE
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        db.row_factory = sqlite3.Row
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=FULL')  # Un envío aceptado con 202 sobrevive a una caída
+        db.executescript(_SCHEMA)
+        columns = {row['name'] for row in db.execute('PRAGMA table_info(finish_spool)')}
+        for name, kind in _ADDED_COLUMNS:
+            if name not in columns:
+                db.execute(f'ALTER TABLE finish_spool ADD COLUMN {name} {kind}')
+        return db
+
+    def _transaction(self, fn):
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                result = fn(self._db)
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+            self._db.execute('COMMIT')
+            return result
+
+    # -----------------------
+    # ENCOLAR Y CONSULTAR
+    # -----------------------
+
+    def enqueue(self, path, body, headers, idempotency_key, claims=None):
+        """
+        Guarda un envío. Si ya existe uno con la misma clave de idempotencia se devuelve ese
+        (un cliente que reintenta recibe el mismo recibo); si había sido rechazado o había fallado
+        del todo, se vuelve a encolar con el cuerpo nuevo (p. ej. un envío corregido tras un 4xx).
+
+        Args:
+            claims (dict | None): Claims ya verificados del token del cliente. Se guardan sin los
+                tiempos (`exp`, `nbf`, `iat`) para firmar el token del drenador; el token en sí no se guarda.
+
+        Returns:
+            tuple: (recibo, creado) donde recibo es el dict de `get()`.
+        """
+        now = time.time()
+        stored_headers = json.dumps({name: headers[name] for name in FORWARDED_HEADERS if name in headers})
+        user_id = str(claims["user_id"]) if claims and claims.get("user_id") is not None else None
+        stored_claims = (json.dumps({name: value for name, value in claims.items() if name not in _TIME_CLAIMS})
+                         if claims else None)
+
+        def insert(db):
+            existing = db.execute('SELECT * FROM finish_spool WHERE idempotency_key = ?', (idempotency_key,)).fetchone()
+            if existing is not None and existing['status'] not in REQUEUE_STATES:
+                return existing['receipt_id'], False
+            if existing is not None:
+                db.execute(
+                    'UPDATE finish_spool SET path = ?, body = ?, headers = ?, user_id = ?, claims = ?, status = ?, '
+                    'attempts = 0, next_attempt_at = ?, updated_at = ?, response_status = NULL, response_body = NULL, '
+                    'last_error = NULL WHERE receipt_id = ?',
+                    (path, body, stored_headers, user_id, stored_claims, PENDING, now, now, existing['receipt_id']))
+                return existing['receipt_id'], True
+            receipt_id = uuid.uuid4().hex
+            db.execute(
+                'INSERT INTO finish_spool (receipt_id, idempotency_key, path, body, headers, user_id, claims, status, '
+                'next_attempt_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (receipt_id, idempotency_key, path, body, stored_headers, user_id, stored_claims, PENDING, now, now, now))
+            return receipt_id, True
+
+        receipt_id, created = self._transaction(insert)
+        if created:
+            self._wakeup.set()
+        return self.get(receipt_id), created
+
+    def get(self, receipt_id):
+        """
+        Estado de un envío por su recibo, o None si no existe (o ya se purgó).
+        """
+        with self._lock:
+            row = self._db.execute('SELECT * FROM finish_spool WHERE receipt_id = ?', (receipt_id,)).fetchone()
+        if row is None:
+            return None
+        receipt = {
+            "receipt_id": row['receipt_id'],
+            "user_id": row['user_id'],
+            "status": PENDING if row['status'] == SENDING else row['status'],
+            "attempts": row['attempts'],
+            "created_at": row['created_at'],
+            "updated_at": row['updated_at'],
+        }
+        if row['status'] in TERMINAL_STATES:
+            receipt["response"] = {"status": row['response_status'], "body": _decode(row['response_body'])}
+            if row['last_error']:
+                receipt["error"] = row['last_error']
+        return receipt
+
+    def counts(self):
+        """
+        Número de envíos por estado (para /metrics).
+        """
+        with self._lock:
+            rows = self._db.execute('SELECT status, COUNT(*) FROM finish_spool GROUP BY status').fetchall()
+        counts = dict.fromkeys((PENDING, SENDING) + TERMINAL_STATES, 0)
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    # -----------------------
+    # DRENADO
+    # -----------------------
+
+    def _claim(self, limit):
+        now = time.time()
+
+        def claim(db):
+            rows = db.execute(
+                'SELECT * FROM finish_spool WHERE status IN (?, ?) AND next_attempt_at <= ? '
+                'ORDER BY next_attempt_at LIMIT ?', (PENDING, SENDING, now, limit)).fetchall()
+            db.executemany(
+                'UPDATE finish_spool SET status = ?, next_attempt_at = ?, updated_at = ? WHERE receipt_id = ?',
+                [(SENDING, now + self.lease, now, row['receipt_id']) for row in rows])
+            return rows
+
+        return self._transaction(claim)
+
+    def _complete(self, row, status, response=None, error=None):
+        # Un envío terminado ya no necesita headers ni claims para reenviarse
+        self._transaction(lambda db: db.execute(
+            'UPDATE finish_spool SET status = ?, attempts = attempts + 1, updated_at = ?, response_status = ?, '
+            "response_body = ?, last_error = ?, headers = '{}', claims = NULL WHERE receipt_id = ?",
+            (status, time.time(), response.status_code if response is not None else None,
+             response.text if response is not None else None, error, row['receipt_id'])))
+
+    def _retry(self, row, response=None, error=None):
+        attempts = row['attempts'] + 1
+        if attempts >= self.max_attempts:
+            logger.error(f"Spool: envío {row['receipt_id']} descartado tras {attempts} intentos: {error}")
+            return self._complete(row, FAILED, response, error)
+        # Backoff exponencial con jitter: los reintentos de un mismo pico no vuelven a llegar juntos
+        delay = min(self.retry_max, self.retry_base * (2 ** (attempts - 1))) * random.uniform(0.5, 1.0)
+        self._transaction(lambda db: db.execute(
+            'UPDATE finish_spool SET status = ?, attempts = ?, next_attempt_at = ?, updated_at = ?, last_error = ? '
+            'WHERE receipt_id = ?',
+            (PENDING, attempts, time.time() + delay, time.time(), error, row['receipt_id'])))
+
+    def _deliver(self, row):
+        headers = json.loads(row['headers'])
+        if row['claims']:
+            # Token propio del gateway, recién firmado con los claims verificados al encolar: un envío que
+            # se reintenta durante horas no se rechaza porque el token original haya expirado
+            headers['Authorization'] = f"Bearer {issue_token(json.loads(row['claims']), self.token_ttl)}"
+        # El microservicio descarta duplicados si un envío se reintenta después de haber llegado
+        headers['Idempotency-Key'] = row['idempotency_key']
+        try:
+            response = upstream_client.request(
+                upstream_client.COMPETITION, 'POST', self.service_url + row['path'], data=row['body'], headers=headers)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            return self._retry(row, error=str(e))
+
+        if response.status_code in RETRYABLE_STATUSES:
+            self._retry(row, response, f"status {response.status_code}")
+        elif response.status_code >= 400:
+            self._complete(row, REJECTED, response)
+        else:
+            self._complete(row, DELIVERED, response)
+
+    def drain_once(self):
+        """
+        Reclama hasta `concurrency` envíos vencidos y los reenvía en paralelo.
+
+        Returns:
+            int: Envíos procesados.
+        """
+        rows = self._claim(self.concurrency)
+        if not rows:
+            return 0
+        get_executor('finish-spool', self.concurrency)
+        futures = [submit(self._deliver, row, executor='finish-spool') for row in rows]
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                # El lease vence y el envío se retoma más tarde
+                logger.error(f"Spool: error inesperado al reenviar un envío: {e}")
+        return len(rows)
+
+    def purge(self):
+        """
+        Borra los envíos terminados hace más de `retention` segundos.
+        """
+        cutoff = time.time() - self.retention
+        placeholders = ', '.join('?' * len(TERMINAL_STATES))
+        return self._transaction(lambda db: db.execute(
+            f'DELETE FROM finish_spool WHERE status IN ({placeholders}) AND updated_at < ?',
+            (*TERMINAL_STATES, cutoff)).rowcount)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                processed = self.drain_once()
+                if time.monotonic() - self._last_purge > 60:
+                    self._last_purge = time.monotonic()
+                    self.purge()
+            except Exception as e:
+                logger.error(f"Spool: error en el drenador: {e}")
+                processed = 0
+            if not processed:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def start(self):
+        """
+        Arranca el hilo drenador (uno por proceso; los workers creados con fork arrancan el suyo).
+        """
+        self.autostart = True
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name='gateway-finish-spool', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def close(self):
+        self.autostart = False
+        self.stop()
+        with self._lock:
+            self._db.close()
+
+    def _reset_after_fork(self):
+        """
+        En el proceso hijo: locks y eventos nuevos, conexión SQLite propia (no se puede compartir
+        entre procesos) y un drenador propio si el padre tenía uno.
+        """
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        # La conexión heredada no se cierra desde el hijo: cerrarla podría hacer un checkpoint del WAL
+        # que el padre sigue usando
+        self._inherited_db = self._db
+        self._db = self._connect()
+        if self.autostart:
+            self.start()
+
+
+def _reset_after_fork():
+    for spool in list(_spools):
+        spool._reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _decode(text):
+    if text is None:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def register_finish_spool(app, service_url):
+    """
+    Con FINISH_SPOOL_ENABLED, crea el spool de envíos de "finalizar quiz" y arranca su drenador.
+    Queda disponible en app.extensions['finish_spool'].
+    """
+    if not app.config.get('FINISH_SPOOL_ENABLED'):
+        return None
+    spool = FinishSpool(
+        app.config['FINISH_SPOOL_PATH'],
+        service_url,
+        concurrency=app.config['FINISH_SPOOL_CONCURRENCY'],
+        max_attempts=app.config['FINISH_SPOOL_MAX_ATTEMPTS'],
+        retry_base=app.config['FINISH_SPOOL_RETRY_BASE'],
+        retry_max=app.config['FINISH_SPOOL_RETRY_MAX'],
+        retention=app.config['FINISH_SPOOL_RETENTION'],
+        token_ttl=app.config['FINISH_SPOOL_TOKEN_TTL'],
+    )
+    app.extensions['finish_spool'] = spool.start()
+    logger.info(f"Spool de envíos de quizzes activo en {spool.path}")
+    return spool
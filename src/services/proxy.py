@@ -1,7 +1,21 @@
 import requests
-from flask import jsonify, request
+from flask import jsonify, request, Response
+from config.config import Config
+from services import upstream as upstream_client
+from utils.json_codec import decode_response
 
-def proxy_service_request(method, path, json=None, params=None, service_url=None, headers=None):
+# Headers de la respuesta del microservicio que se conservan en modo streaming
+PASSTHROUGH_RESPONSE_HEADERS = (
+    'Content-Type', 'Content-Length', 'Content-Encoding', 'Content-Disposition',
+    'ETag', 'Last-Modified', 'Cache-Control', 'Expires',
+)
+
+# Headers de la petición del cliente que se reenvían en modo streaming
+PASSTHROUGH_REQUEST_HEADERS = ('Content-Type', 'If-None-Match', 'If-Modified-Since')
+
+
+def proxy_service_request(method, path, json=None, params=None, service_url=None, headers=None,
+                          upstream=upstream_client.COMPETITION, stream=False):
     """
     Encaminador (proxy) para enviar solicitudes HTTP a un microservicio.
 
@@ -12,6 +26,9 @@ def proxy_service_request(method, path, json=None, params=None, service_url=None
         params (dict, optional): Parámetros de consulta (query params).
         service_url (str): URL base del microservicio.
         headers (dict, optional): Headers adicionales a enviar (opcional).
+        upstream (str, optional): Upstream cuyo pool de conexiones se utiliza.
+        stream (bool, optional): Reenvía los bytes del cuerpo de la petición y de la respuesta
+            por bloques, sin parsear el JSON (para rutas de paso directo).
 
     Returns:
         Response: Respuesta reenviada del microservicio.
@@ -26,9 +43,13 @@ def proxy_service_request(method, path, json=None, params=None, service_url=None
     if auth_header:
         forwarded_headers['Authorization'] = auth_header
 
+    if stream:
+        return _stream_service_request(method, url, params, forwarded_headers, upstream)
+
     try:
         # Enviamos la solicitud al microservicio
-        resp = requests.request(
+        resp = upstream_client.request(
+            upstream,
             method,
             url,
             json=json,
@@ -37,11 +58,86 @@ def proxy_service_request(method, path, json=None, params=None, service_url=None
         )
 
         # Devolvemos la respuesta del microservicio tal como vino
-        return jsonify(resp.json()), resp.status_code
+        response = jsonify(decode_response(resp))
+        # El cuerpo se vuelve a serializar: se conserva Last-Modified y el ETag lo calcula el gateway
+        if 'Last-Modified' in resp.headers:
+            response.headers['Last-Modified'] = resp.headers['Last-Modified']
+        return response, resp.status_code
 
     except requests.exceptions.ConnectionError:
-        # Error de conexión con el microservicio
+        # Error de conexión con el microservicio (o circuito abierto)
         return jsonify({"message": "Error al conectar con el microservicio"}), 503
+    except requests.exceptions.Timeout:
+        # El microservicio no respondió dentro de SERVICE_TIMEOUT
+        return jsonify({"message": "El microservicio no respondió a tiempo"}), 504
     except ValueError:
         # Si el microservicio no responde con JSON válido
         return jsonify({"message": "Respuesta no válida del microservicio"}), 502
+
+
+class _SizedStream:
+    """
+    Envoltorio del cuerpo de la petición entrante con longitud conocida, para que requests
+    lo envíe por bloques con Content-Length en lugar de cargarlo entero en memoria.
+    """
+
+    def __init__(self, stream, length):
+        self._stream = stream
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        return self._stream.read(size)
+
+    def __iter__(self):
+        while True:
+            chunk = self._stream.read(Config.PROXY_STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _stream_service_request(method, url, params, forwarded_headers, upstream):
+    """
+    Proxy en modo streaming: no construye objetos Python a partir de los cuerpos.
+    Conserva el status y los headers de contenido del microservicio.
+    """
+    for name in PASSTHROUGH_REQUEST_HEADERS:
+        if name in request.headers:
+            forwarded_headers.setdefault(name, request.headers[name])
+    # El cuerpo se reenvía sin decodificar: solo se aceptan codificaciones que el cliente entienda
+    forwarded_headers['Accept-Encoding'] = request.headers.get('Accept-Encoding', 'identity')
+
+    body = None
+    if request.content_length:
+        body = _SizedStream(request.stream, request.content_length)
+    elif method.upper() in ('POST', 'PUT', 'PATCH'):
+        body = request.get_data() or None
+
+    try:
+        resp = upstream_client.request(
+            upstream,
+            method,
+            url,
+            data=body,
+            params=params,
+            headers=forwarded_headers,
+            stream=True
+        )
+    except requests.exceptions.ConnectionError:
+        return jsonify({"message": "Error al conectar con el microservicio"}), 503
+    except requests.exceptions.Timeout:
+        return jsonify({"message": "El microservicio no respondió a tiempo"}), 504
+
+    response_headers = {name: resp.headers[name] for name in PASSTHROUGH_RESPONSE_HEADERS if name in resp.headers}
+    response = Response(
+        resp.raw.stream(Config.PROXY_STREAM_CHUNK_SIZE, decode_content=False),
+        status=resp.status_code,
+        headers=response_headers,
+        direct_passthrough=True,
+    )
+    # Devuelve la conexión al pool cuando termina (o se aborta) el envío al cliente
+    response.call_on_close(resp.close)
+    return response, resp.status_code
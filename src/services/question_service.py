@@ -1,6 +1,11 @@
+import copy
 import requests
+from services import upstream
 import os
 from config.config import Config
+from utils.cache import TTLCache
+from utils.json_codec import decode_response
+from utils.json_stream import iter_array_items
 from utils.logger import get_logger
 logger = get_logger(__name__)
 
@@ -17,14 +22,29 @@ class QuestionService:
     QA_URL = QA_SERVICE_URL + '/questions'
     QA_CATEGORIES_URL = QA_SERVICE_URL + '/categories'
 
+    # Las categorías casi no cambian: se cachean y se invalidan al crear una nueva
+    categories_cache = TTLCache('categories', Config.CATEGORIES_CACHE_TTL)
+
     @staticmethod
     def list_categories():
+        # Cada llamada recibe su propia copia: quien la modifique no altera la caché
+        cached = QuestionService.categories_cache.get('all')
+        if cached is not None:
+            return copy.deepcopy(cached), 200
+
         try:
-            # Realiza la solicitud al servicio de autenticación
-            response = requests.get(f"{QuestionService.QA_CATEGORIES_URL}")
-            return response.json(), response.status_code
+            # La generación se anota antes de consultar: si se crea una categoría mientras tanto,
+            # la lista leída ya es vieja y no se guarda
+            generation = QuestionService.categories_cache.generation
+            response = upstream.get(upstream.QA, f"{QuestionService.QA_CATEGORIES_URL}")
+            data = decode_response(response)
+            if response.status_code == 200:
+                QuestionService.categories_cache.set('all', copy.deepcopy(data), generation=generation)
+            return data, response.status_code
         except requests.exceptions.ConnectionError:
             return {"message": "Error de conexión con el servicio de preguntas y respuestas."}, 503
+        except requests.exceptions.Timeout:
+            return {"message": "El servicio de preguntas y respuestas no respondió a tiempo."}, 504
         except Exception as e:
             return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
 
@@ -33,10 +53,14 @@ class QuestionService:
         try:
             
             # Realiza la solicitud al servicio de autenticación
-            response = requests.post(f"{QuestionService.QA_CATEGORIES_URL}", json=data)
-            return response.json(), response.status_code
+            response = upstream.post(upstream.QA, f"{QuestionService.QA_CATEGORIES_URL}", json=data)
+            if 200 <= response.status_code < 300:
+                QuestionService.categories_cache.invalidate()
+            return decode_response(response), response.status_code
         except requests.exceptions.ConnectionError:
             return {"message": "Error de conexión con el servicio de autenticación."}, 503
+        except requests.exceptions.Timeout:
+            return {"message": "El servicio de preguntas y respuestas no respondió a tiempo."}, 504
         except Exception as e:
             return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
 
@@ -45,23 +69,58 @@ class QuestionService:
         try:
             # Realiza la solicitud al servicio de autenticación
             # response = requests.get(f"{QuestionService.QA_URL}")
-            response = requests.get(QuestionService.QA_URL, params=params)
-            return response.json(), response.status_code
+            response = upstream.get(upstream.QA, QuestionService.QA_URL, params=params)
+            return decode_response(response), response.status_code
         except requests.exceptions.ConnectionError:
             return {"message": "Error de conexión con el servicio de preguntas y respuestas."}, 503
+        except requests.exceptions.Timeout:
+            return {"message": "El servicio de preguntas y respuestas no respondió a tiempo."}, 504
         except Exception as e:
             return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
 
+
+    @staticmethod
+    def iter_questions(params=None, skip=0):
+        """
+        Igual que `list_questions`, pero devuelve un generador que decodifica las preguntas a medida que
+        llegan del microservicio, a partir de la número `skip`. El generador cierra la respuesta al agotarse o al cerrarse.
+        """
+        try:
+            response = upstream.get(upstream.QA, QuestionService.QA_URL, params=params, stream=True)
+        except requests.exceptions.ConnectionError:
+            return {"message": "Error de conexión con el servicio de preguntas y respuestas."}, 503
+        except requests.exceptions.Timeout:
+            return {"message": "El servicio de preguntas y respuestas no respondió a tiempo."}, 504
+        except Exception as e:
+            return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
+
+        if response.status_code != 200:
+            try:
+                return decode_response(response), response.status_code
+            except Exception as e:
+                return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
+            finally:
+                response.close()
+
+        def questions():
+            try:
+                yield from iter_array_items(response.iter_content(Config.PROXY_STREAM_CHUNK_SIZE), skip=skip)
+            finally:
+                response.close()
+
+        return questions(), 200
   
     @staticmethod
     def list_questions_by_category(category_id):
         try:
                        
             # Realiza la solicitud al servicio de autenticación
-            response = requests.get(f"{QuestionService.QA_URL}/category/{category_id}")
-            return response.json(), response.status_code
+            response = upstream.get(upstream.QA, f"{QuestionService.QA_URL}/category/{category_id}")
+            return decode_response(response), response.status_code
         except requests.exceptions.ConnectionError:
             return {"message": "Error de conexión con el servicio de autenticación."}, 503
+        except requests.exceptions.Timeout:
+            return {"message": "El servicio de preguntas y respuestas no respondió a tiempo."}, 504
         except Exception as e:
             return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
 
@@ -69,20 +128,24 @@ class QuestionService:
     @staticmethod
     def create_question_with_answers(data):
         try:
-            response = requests.post(f"{QuestionService.QA_URL}", json=data)
-            return response.json(), response.status_code
+            response = upstream.post(upstream.QA, f"{QuestionService.QA_URL}", json=data)
+            return decode_response(response), response.status_code
         except requests.exceptions.ConnectionError:
             return {"message": "Error de conexión con el servicio de preguntas y respuestas."}, 503
+        except requests.exceptions.Timeout:
+            return {"message": "El servicio de preguntas y respuestas no respondió a tiempo."}, 504
         except Exception as e:
             return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
 
     @staticmethod
     def get_question_by_id(question_id):
         try:
-            response = requests.get(f"{QuestionService.QA_URL}/{question_id}")
-            return response.json(), response.status_code
+            response = upstream.get(upstream.QA, f"{QuestionService.QA_URL}/{question_id}")
+            return decode_response(response), response.status_code
         except requests.exceptions.ConnectionError:
             return {"message": "Error de conexión con el servicio de preguntas y respuestas."}, 503
+        except requests.exceptions.Timeout:
+            return {"message": "El servicio de preguntas y respuestas no respondió a tiempo."}, 504
         except Exception as e:
             return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
 
@@ -90,9 +153,11 @@ class QuestionService:
     def update_question_with_answers(question_id, data):
         print(data)
         try:
-            response = requests.put(f"{QuestionService.QA_URL}/{question_id}", json=data)
-            return response.json(), response.status_code
+            response = upstream.put(upstream.QA, f"{QuestionService.QA_URL}/{question_id}", json=data)
+            return decode_response(response), response.status_code
         except requests.exceptions.ConnectionError:
             return {"message": "Error de conexión con el servicio de preguntas y respuestas."}, 503
+        except requests.exceptions.Timeout:
+            return {"message": "El servicio de preguntas y respuestas no respondió a tiempo."}, 504
         except Exception as e:
             return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
@@ -1,6 +1,9 @@
 import requests
+from services import upstream
 import os
 from config.config import Config
+from utils.json_codec import decode_response
+from utils.json_stream import iter_array_items
 from utils.logger import get_logger
 logger = get_logger(__name__)
 
@@ -21,40 +24,80 @@ class QuizService:
         """
         try:
             params = {"quiz_ids": ",".join(map(str, quiz_ids))} if quiz_ids else {}
-            response = requests.get(f"{QuizService.QA_URL}", params=params)
+            response = upstream.get(upstream.QA, f"{QuizService.QA_URL}", params=params)
 
             if response.status_code == 200:
-                quizzes = response.json()
+                quizzes = decode_response(response)
                 # Asegurar que todos los quizzes tengan la clave 'questions'
                 for quiz in quizzes:
                     if 'questions' not in quiz:
                         quiz['questions'] = []
                 return quizzes, 200
 
-            return response.json(), response.status_code
+            return decode_response(response), response.status_code
 
         except requests.exceptions.ConnectionError:
             return {"message": "Error de conexión con el servicio de cuestionarios."}, 503
+        except requests.exceptions.Timeout:
+            return {"message": "El servicio de cuestionarios no respondió a tiempo."}, 504
         except Exception as e:
             return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
 
+    @staticmethod
+    def iter_quizzes(quiz_ids=None, skip=0):
+        """
+        Igual que `list_quizzes`, pero sin cargar el catálogo completo: devuelve un generador que
+        decodifica los cuestionarios a medida que llegan del microservicio, a partir del número `skip`.
+        El generador cierra la respuesta al agotarse o al cerrarse.
+        """
+        try:
+            params = {"quiz_ids": ",".join(map(str, quiz_ids))} if quiz_ids else {}
+            response = upstream.get(upstream.QA, f"{QuizService.QA_URL}", params=params, stream=True)
+        except requests.exceptions.ConnectionError:
+            return {"message": "Error de conexión con el servicio de cuestionarios."}, 503
+        except requests.exceptions.Timeout:
+            return {"message": "El servicio de cuestionarios no respondió a tiempo."}, 504
+        except Exception as e:
+            return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
+
+        if response.status_code != 200:
+            try:
+                return decode_response(response), response.status_code
+            except Exception as e:
+                return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
+            finally:
+                response.close()
+
+        def quizzes():
+            try:
+                for quiz in iter_array_items(response.iter_content(Config.PROXY_STREAM_CHUNK_SIZE), skip=skip):
+                    # Asegurar que todos los quizzes tengan la clave 'questions'
+                    quiz.setdefault('questions', [])
+                    yield quiz
+            finally:
+                response.close()
+
+        return quizzes(), 200
+
     @staticmethod
     def list_quizzesOLD():
         """
         Lista todos los cuestionarios asegurando que cada uno tenga la clave 'quiz'.
         """
         try:
-            response = requests.get(f"{QuizService.QA_URL}")
+            response = upstream.get(upstream.QA, f"{QuizService.QA_URL}")
             if response.status_code == 200:
-                quizzes = response.json()
+                quizzes = decode_response(response)
                 # Agregar clave 'questions' si no está presente
                 for quiz in quizzes:
                     if 'questions' not in quiz:
                         quiz['questions'] = []
                 return quizzes, 200
-            return response.json(), response.status_code
+            return decode_response(response), response.status_code
         except requests.exceptions.ConnectionError:
             return {"message": "Error de conexión con el servicio de cuestionarios."}, 503
+        except requests.exceptions.Timeout:
+            return {"message": "El servicio de cuestionarios no respondió a tiempo."}, 504
         except Exception as e:
             return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
 
@@ -64,10 +107,12 @@ class QuizService:
         Crea un nuevo cuestionario.
         """
         try:
-            response = requests.post(f"{QuizService.QA_URL}", json=data)
-            return response.json(), response.status_code
+            response = upstream.post(upstream.QA, f"{QuizService.QA_URL}", json=data)
+            return decode_response(response), response.status_code
         except requests.exceptions.ConnectionError:
             return {"message": "Error de conexión con el servicio de cuestionarios."}, 503
+        except requests.exceptions.Timeout:
+            return {"message": "El servicio de cuestionarios no respondió a tiempo."}, 504
         except Exception as e:
             return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
 
@@ -77,16 +122,18 @@ class QuizService:
         Obtiene un cuestionario por su ID.
         """
         try:
-            response = requests.get(f"{QuizService.QA_URL}/{quiz_id}")
+            response = upstream.get(upstream.QA, f"{QuizService.QA_URL}/{quiz_id}")
             if response.status_code == 200:
-                quiz = response.json()
+                quiz = decode_response(response)
                 # Agregar clave 'quiz' si no está presente
                 if 'quiz' not in quiz:
                     quiz['quiz'] = []
                 return quiz, 200
-            return response.json(), response.status_code
+            return decode_response(response), response.status_code
         except requests.exceptions.ConnectionError:
             return {"message": "Error de conexión con el servicio de cuestionarios."}, 503
+        except requests.exceptions.Timeout:
+            return {"message": "El servicio de cuestionarios no respondió a tiempo."}, 504
         except Exception as e:
             return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
 
@@ -96,10 +143,12 @@ class QuizService:
         Actualiza un cuestionario existente.
         """
         try:
-            response = requests.put(f"{QuizService.QA_URL}/{quiz_id}", json=data)
-            return response.json(), response.status_code
+            response = upstream.put(upstream.QA, f"{QuizService.QA_URL}/{quiz_id}", json=data)
+            return decode_response(response), response.status_code
         except requests.exceptions.ConnectionError:
             return {"message": "Error de conexión con el servicio de cuestionarios."}, 503
+        except requests.exceptions.Timeout:
+            return {"message": "El servicio de cuestionarios no respondió a tiempo."}, 504
         except Exception as e:
             return {"message": "Error al procesar la solicitud.", "error": str(e)}, 500
 
@@ -115,12 +164,12 @@ class QuizService:
             tuple: (bool, str) -> True si todos existen, False con mensaje de error si alguno no existe.
         """
         try:
-            response = requests.get(f"{QuizService.QA_URL}", params={"quiz_ids": ",".join(map(str, quiz_ids))})
+            response = upstream.get(upstream.QA, f"{QuizService.QA_URL}", params={"quiz_ids": ",".join(map(str, quiz_ids))})
             
             if response.status_code != 200:
                 return False, f"Error al consultar el servicio de quizzes: {response.text}"
 
-            existing_quizzes = {quiz["id"] for quiz in response.json()}  # IDs existentes
+            existing_quizzes = {quiz["id"] for quiz in decode_response(response)}  # IDs existentes
 
             # Verificar qué quizzes no existen
             missing_quizzes = [quiz_id for quiz_id in quiz_ids if quiz_id not in existing_quizzes]
@@ -132,5 +181,7 @@ class QuizService:
 
         except requests.exceptions.ConnectionError:
             return False, "Error de conexión con el servicio de quizzes."
+        except requests.exceptions.Timeout:
+            return False, "El servicio de quizzes no respondió a tiempo."
         except Exception as e:
             return False, f"Error inesperado: {str(e)}"
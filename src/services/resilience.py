@@ -0,0 +1,155 @@
+import os
+import random
+import threading
+import time
+
+import requests
+
+from config.config import Config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Métodos que se pueden reintentar sin riesgo de duplicar efectos
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+# Respuestas que indican un microservicio degradado
+RETRYABLE_STATUSES = frozenset({502, 503, 504})
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """
+    El circuito del upstream está abierto: se falla de inmediato sin llamar al microservicio.
+    Hereda de ConnectionError para que se devuelvan los mismos mensajes 503 de siempre.
+    """
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por upstream (cerrado / abierto / semiabierto).
+
+    - Cerrado: las llamadas pasan; tras `failure_threshold` fallos seguidos se abre.
+    - Abierto: las llamadas fallan de inmediato durante `reset_timeout` segundos.
+    - Semiabierto: se deja pasar una única llamada de prueba; si va bien se cierra, si falla se vuelve a abrir.
+    """
+
+    def __init__(self, name, failure_threshold, reset_timeout):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.rejected = 0
+        self.transitions = {CLOSED: 0, OPEN: 0, HALF_OPEN: 0}
+        self._lock = threading.Lock()
+
+    def _transition(self, state):
+        logger.warning(f"Circuit breaker '{self.name}': {self.state} -> {state}")
+        self.state = state
+        self.transitions[state] += 1
+
+    def allow(self):
+        """
+        Indica si se puede llamar al upstream en este momento.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.probe_in_flight = False
+            if self.state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.probe_in_flight = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self._transition(OPEN)
+
+    def release(self):
+        """
+        Libera la llamada de prueba cuando terminó por un error ajeno a la salud del upstream.
+        """
+        with self._lock:
+            self.probe_in_flight = False
+
+    def stats(self):
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "rejected": self.rejected,
+            "transitions": dict(self.transitions),
+        }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(upstream):
+    breaker = _breakers.get(upstream)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(
+                upstream,
+                CircuitBreaker(upstream, Config.CIRCUIT_FAILURE_THRESHOLD, Config.CIRCUIT_RESET_TIMEOUT),
+            )
+    return breaker
+
+
+def breaker_stats():
+    """
+    Estado de los circuit breakers de todos los upstreams.
+    """
+    return {name: breaker.stats() for name, breaker in _breakers.items()}
+
+
+def reset_breakers():
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def _reset_after_fork():
+    # Cada worker lleva el estado de sus propias llamadas a los upstreams
+    global _breakers_lock
+    _breakers.clear()
+    _breakers_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def max_attempts(method, replayable=True):
+    """
+    Número total de intentos para una llamada: RETRY_ATTEMPTS para métodos idempotentes
+    cuyo cuerpo se puede volver a enviar, uno para el resto.
+    """
+    if method.upper() in IDEMPOTENT_METHODS and replayable:
+        return max(1, Config.RETRY_ATTEMPTS)
+    return 1
+
+
+def backoff_delay(attempt):
+    """
+    Espera antes del reintento `attempt` (0, 1, ...): backoff exponencial con jitter completo.
+    """
+    return random.uniform(0, min(Config.RETRY_BACKOFF_MAX, Config.RETRY_BACKOFF_BASE * (2 ** attempt)))
@@ -0,0 +1,215 @@
+import os
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.config import Config
+from services import resilience
+from utils import metrics
+from utils import tracing
+from utils.server_timing import timed
+from utils.logger import get_logger
+from utils.singleflight import SingleFlight
+
+logger = get_logger(__name__)
+
+# Nombres de los microservicios aguas arriba (upstreams)
+AUTH = 'auth'
+QA = 'qa'
+COMPETITION = 'competition'
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+# Agrupa GETs idénticos concurrentes hacia la misma URL
+_inflight = SingleFlight()
+
+
+def _pool_setting(upstream, name, default):
+    """
+    Lee el tamaño de pool específico del upstream (p. ej. QA_POOL_MAXSIZE)
+    o usa el valor general de la configuración.
+    """
+    return int(os.getenv(f"{upstream.upper()}_{name}", default))
+
+
+def _build_session(upstream):
+    """
+    Crea una sesión HTTP con keep-alive y un pool de conexiones propio para el upstream.
+    """
+    session = requests.Session()
+
+    # La sesión se comparte entre usuarios: nunca debe guardar cookies de un upstream
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    adapter = HTTPAdapter(
+        pool_connections=_pool_setting(upstream, 'POOL_CONNECTIONS', Config.UPSTREAM_POOL_CONNECTIONS),
+        pool_maxsize=_pool_setting(upstream, 'POOL_MAXSIZE', Config.UPSTREAM_POOL_MAXSIZE),
+        pool_block=Config.UPSTREAM_POOL_BLOCK,
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session(upstream):
+    """
+    Devuelve la sesión compartida (una por upstream), creándola la primera vez.
+    Las sesiones son seguras para usarse desde varios hilos a la vez.
+    """
+    session = _sessions.get(upstream)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(upstream)
+            if session is None:
+                session = _build_session(upstream)
+                _sessions[upstream] = session
+                logger.info(f"Pool de conexiones creado para el upstream '{upstream}'")
+    return session
+
+
+def _send(upstream, session, method, url, **kwargs):
+    """
+    Envía la solicitud aplicando la capa de resiliencia: timeout, reintentos con backoff
+    para métodos idempotentes y circuit breaker del upstream.
+    """
+    kwargs.setdefault('timeout', Config.SERVICE_TIMEOUT)
+    breaker = resilience.get_breaker(upstream)
+    # Un cuerpo en streaming no se puede reenviar: esas llamadas no se reintentan
+    replayable = isinstance(kwargs.get('data'), (bytes, str, type(None)))
+    attempts = resilience.max_attempts(method, replayable)
+
+    for attempt in range(attempts):
+        if not breaker.allow():
+            metrics.upstream_error(upstream, 'circuit_open')
+            raise resilience.CircuitOpenError(f"Circuito abierto para el upstream '{upstream}'")
+        last_attempt = attempt == attempts - 1
+        metrics.upstream_started(upstream)
+        start = time.perf_counter()
+        path = urlsplit(url).path
+        try:
+            with timed(f"upstream-{upstream}", f"{method} {path}"), \
+                    tracing.child_span(f"{method} {path}", upstream=upstream, attempt=attempt) as span:
+                response = session.request(method, url, **tracing.inject(span, kwargs))
+                tracing.tag_response(span, response.status_code)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            metrics.upstream_error(upstream, 'timeout' if isinstance(e, requests.exceptions.Timeout) else 'connection')
+            if last_attempt:
+                breaker.record_failure()
+                raise
+            # El breaker cuenta llamadas, no intentos: solo el último intento fallido suma un fallo
+            breaker.release()
+            logger.warning(f"Reintentando {method} {url} ({attempt + 1}/{attempts}): {e}")
+        except BaseException:
+            breaker.release()
+            raise
+        else:
+            metrics.observe_upstream(upstream, method, response.status_code, time.perf_counter() - start)
+            if response.status_code not in resilience.RETRYABLE_STATUSES:
+                breaker.record_success()
+                return response
+            if last_attempt:
+                breaker.record_failure()
+                return response
+            breaker.release()
+            logger.warning(f"Reintentando {method} {url} ({attempt + 1}/{attempts}): status {response.status_code}")
+            response.close()
+        finally:
+            metrics.upstream_finished(upstream)
+        time.sleep(resilience.backoff_delay(attempt))
+
+
+def request(upstream, method, url, **kwargs):
+    """
+    Envía una solicitud HTTP a un upstream reutilizando su pool de conexiones.
+
+    Args:
+        upstream (str): Nombre del upstream (AUTH, QA o COMPETITION).
+        method (str): Método HTTP.
+        url (str): URL completa del recurso.
+        **kwargs: Argumentos aceptados por requests (json, params, headers, ...).
+
+    Returns:
+        requests.Response: Respuesta del microservicio.
+    """
+    session = get_session(upstream)
+    if method.upper() != 'GET' or not Config.UPSTREAM_COALESCE_GETS or kwargs.keys() - {'params', 'headers'}:
+        return _send(upstream, session, method, url, **kwargs)
+
+    def send():
+        response = _send(upstream, session, method, url, **kwargs)
+        response.content  # Se lee el cuerpo completo antes de compartir la respuesta
+        return response
+
+    return _inflight.do(_coalescing_key(upstream, url, **kwargs), send)
+
+
+def _coalescing_key(upstream, url, params=None, headers=None):
+    """
+    Clave de un GET: upstream, URL final con query string y headers enviados
+    (incluido Authorization, para no compartir respuestas entre usuarios distintos).
+    """
+    full_url = requests.Request('GET', url, params=params).prepare().url
+    return upstream, full_url, tuple(sorted((headers or {}).items()))
+
+
+def _reset_after_fork():
+    """
+    En un proceso hijo (workers de gunicorn con preload_app) las conexiones heredadas son del padre:
+    cada worker abre sus propios pools y lleva su propio registro de GETs en vuelo.
+    """
+    global _sessions_lock, _inflight
+    _sessions.clear()
+    _sessions_lock = threading.Lock()
+    _inflight = SingleFlight()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get(upstream, url, **kwargs):
+    return request(upstream, 'GET', url, **kwargs)
+
+
+def post(upstream, url, **kwargs):
+    return request(upstream, 'POST', url, **kwargs)
+
+
+def put(upstream, url, **kwargs):
+    return request(upstream, 'PUT', url, **kwargs)
+
+
+def pool_stats():
+    """
+    Uso de los pools de conexiones: por upstream y host, conexiones en uso y tamaño máximo del pool.
+    """
+    stats = []
+    for upstream, session in list(_sessions.items()):
+        adapter = session.get_adapter('http://')
+        for key in list(adapter.poolmanager.pools.keys()):
+            pool = adapter.poolmanager.pools.get(key)
+            if pool is None or pool.pool is None:
+                continue
+            # La cola del pool empieza llena (maxsize huecos); lo que falta está prestado a una llamada
+            stats.append({
+                "upstream": upstream,
+                "host": f"{pool.host}:{pool.port}",
+                "in_use": max(0, pool.pool.maxsize - pool.pool.qsize()),
+                "maxsize": pool.pool.maxsize,
+            })
+    return stats
+
+
+def close_sessions():
+    """
+    Cierra todas las sesiones y sus conexiones abiertas.
+    """
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,140 @@
+import asyncio
+import math
+import time
+
+import aiohttp
+from aiohttp import web
+
+from config.config import Config
+from utils import json_codec, metrics
+from utils.logger import get_logger
+from utils.rate_limit import RateLimitExceeded
+from utils.tokens import verify_bearer
+
+logger = get_logger(__name__)
+
+
+def json_response(data, status=200):
+    """
+    Respuesta JSON serializada igual que `flask.jsonify` (claves ordenadas y formato compacto).
+    """
+    body = json_codec.dumps(data) + "\n"
+    return web.Response(text=body, status=status, content_type='application/json')
+
+
+@web.middleware
+async def cors_middleware(request, handler):
+    """
+    Habilita CORS para todos los orígenes y rutas, como flask-cors en el modo síncrono.
+    """
+    if request.method == 'OPTIONS' and 'Access-Control-Request-Method' in request.headers:
+        response = web.Response(status=200)
+        response.headers['Access-Control-Allow-Methods'] = request.headers['Access-Control-Request-Method']
+        if 'Access-Control-Request-Headers' in request.headers:
+            response.headers['Access-Control-Allow-Headers'] = request.headers['Access-Control-Request-Headers']
+    else:
+        response = await handler(request)
+    response.headers['Access-Control-Allow-Origin'] = request.headers.get('Origin', '*')
+    if 'Origin' in request.headers:
+        response.headers.add('Vary', 'Origin')
+    return response
+
+
+@web.middleware
+async def metrics_middleware(request, handler):
+    """
+    Métricas por petición equivalentes a utils.metrics.register_request_metrics.
+    """
+    resource = request.match_info.route.resource
+    endpoint = resource.canonical if resource is not None else 'none'
+    metrics.inc('gateway_http_requests_in_flight', ())
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await handler(request)
+        status = response.status
+        return response
+    except web.HTTPException as error:
+        status = error.status
+        raise
+    finally:
+        metrics.inc('gateway_http_requests_in_flight', (), -1)
+        metrics.observe_request(endpoint, request.method, status, time.perf_counter() - start)
+
+
+def rate_limit_middleware(limiter):
+    """
+    Rate limiting por usuario, ruta y rol equivalente a utils.rate_limit.register_rate_limiting.
+    La ruta se identifica por el nombre con que se registró (`<blueprint>.<handler>`, como los endpoints de Flask).
+    """
+    @web.middleware
+    async def middleware(request, handler):
+        if request.method == 'OPTIONS' or getattr(request.match_info.handler, 'rate_limit_exempt', False):
+            return await handler(request)
+
+        claims = {}
+        authorization = request.headers.get('Authorization')
+        if authorization:
+            try:
+                claims = verify_bearer(authorization)
+            except Exception:
+                pass
+        try:
+            limiter.check_async(request.match_info.route.name, claims, request.remote)
+        except RateLimitExceeded as e:
+            response = json_response({
+                "status": "error",
+                "message": "Has excedido el límite de peticiones permitido. Por favor, inténtalo más tarde."
+            }, 429)
+            response.headers['Retry-After'] = str(max(1, math.ceil(e.retry_after)))
+            return response
+        return await handler(request)
+    return middleware
+
+
+@web.middleware
+async def compression_middleware(request, handler):
+    """
+    Compresión negociada de respuestas JSON a partir de COMPRESSION_MIN_SIZE bytes (ver utils/compression.py).
+    """
+    response = await handler(request)
+    if (Config.COMPRESSION_ENABLED and isinstance(response, web.Response)
+            and response.content_type == 'application/json'
+            and response.body is not None and len(response.body) >= Config.COMPRESSION_MIN_SIZE):
+        response.enable_compression()
+    return response
+
+
+@web.middleware
+async def error_middleware(request, handler):
+    """
+    Manejadores de errores equivalentes a utils/error_handlers.py.
+    """
+    try:
+        return await handler(request)
+    except web.HTTPNotFound as error:
+        logger.warning(f"404 Error: {error}")
+        return json_response({
+            "status": "error",
+            "message": "El recurso solicitado no existe. Verifica la URL e intenta nuevamente."
+        }, 404)
+    except web.HTTPException:
+        raise
+    except aiohttp.ClientConnectionError as error:
+        logger.error(f"Connection Error: {error}")
+        return json_response({
+            "status": "error",
+            "message": "El servicio no está disponible en este momento. Por favor, intente más tarde."
+        }, 503)
+    except asyncio.TimeoutError as error:
+        logger.error(f"Timeout Error: {error!r}")
+        return json_response({
+            "status": "error",
+            "message": "El servicio tardó demasiado en responder. Por favor, intente más tarde."
+        }, 504)
+    except Exception as error:
+        logger.error(f"Unexpected error: {error}")
+        return json_response({
+            "status": "error",
+            "message": f"Ocurrió un error inesperado. Intenta más tarde.{error}"
+        }, 500)
@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+_registry = {}
+
+
+class TTLCache:
+    """
+    Caché en memoria con tiempo de vida (TTL) por entrada, segura para varios hilos.
+    Si se indica `maxsize`, descarta la entrada usada menos recientemente (LRU) al llenarse.
+    Lleva contadores de aciertos (hits) y fallos (misses).
+
+    `generation` aumenta con cada `invalidate()`: quien lee del origen puede anotarla antes de
+    la consulta y pasarla a `set()`, que descarta el valor si hubo una invalidación entretanto
+    (así una lectura lenta no vuelve a guardar datos anteriores a una escritura).
+    """
+
+    def __init__(self, name, ttl, maxsize=None):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        register_cache(self)
+
+    def _lookup(self, key, now):
+        entry = self._data.get(key)
+        if entry is not None and entry[1] > now:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry
+        if entry is not None:
+            del self._data[key]
+        self.misses += 1
+        return None
+
+    def _store(self, key, value, expires_at):
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._lookup(key, time.monotonic())
+        return entry[0] if entry is not None else default
+
+    def get_many(self, keys):
+        """
+        Devuelve un diccionario clave -> valor solo con las claves vigentes en la caché.
+        """
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._lookup(key, now)
+                if entry is not None:
+                    found[key] = entry[0]
+        return found
+
+    def set(self, key, value, ttl=None, generation=None):
+        self.set_many({key: value}, ttl, generation)
+
+    def set_many(self, items, ttl=None, generation=None):
+        """
+        Guarda varias entradas. Con `generation`, solo si no hubo un `invalidate()` desde que se leyó.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            for key, value in items.items():
+                self._store(key, value, expires_at)
+
+    def invalidate(self, key=None):
+        """
+        Elimina una entrada, o todas si no se indica clave.
+        """
+        with self._lock:
+            self.generation += 1
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def register_cache(cache):
+    _registry[cache.name] = cache
+
+
+def get_caches():
+    return dict(_registry)
+
+
+def cache_stats():
+    """
+    Estadísticas de todas las cachés registradas, por nombre.
+    """
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+
+def _reset_after_fork():
+    """
+    En un proceso hijo cada caché empieza vacía y con un lock nuevo
+    (el del padre pudo quedar tomado por otro hilo en el momento del fork).
+    """
+    for cache in _registry.values():
+        cache._lock = threading.Lock()
+        cache._data.clear()
+        cache.hits = cache.misses = 0
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
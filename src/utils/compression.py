@@ -0,0 +1,117 @@
+import zlib
+
+from flask import request
+
+from utils.logger import get_logger
+
+try:
+    import zstandard
+except ImportError:  # Incluido en requirements.txt; sin el paquete solo se negocia gzip
+    zstandard = None
+
+logger = get_logger(__name__)
+
+# Tipos de contenido que vale la pena comprimir
+COMPRESSIBLE_MIMETYPES = frozenset({
+    'application/json',
+    'application/x-ndjson',
+    'text/plain',
+    'text/html',
+    'text/csv',
+})
+
+
+def _supported_encodings():
+    # En orden de preferencia cuando el cliente acepta ambas con la misma calidad
+    return ('zstd', 'gzip') if zstandard is not None else ('gzip',)
+
+
+def _new_compressor(encoding, config):
+    """
+    Compresor incremental con la interfaz compress(bytes) / flush(final).
+    """
+    if encoding == 'zstd':
+        compressobj = zstandard.ZstdCompressor(level=config['COMPRESSION_ZSTD_LEVEL']).compressobj()
+
+        def flush(final):
+            return compressobj.flush() if final else compressobj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return compressobj.compress, flush
+
+    # wbits=31: formato gzip (cabecera y CRC) en lugar de deflate crudo
+    compressobj = zlib.compressobj(config['COMPRESSION_LEVEL'], zlib.DEFLATED, 31)
+
+    def flush(final):
+        return compressobj.flush() if final else compressobj.flush(zlib.Z_SYNC_FLUSH)
+    return compressobj.compress, flush
+
+
+def _compress_body(data, encoding, config):
+    compress, flush = _new_compressor(encoding, config)
+    return compress(data) + flush(True)
+
+
+def _compress_stream(chunks, encoding, config):
+    """
+    Comprime un cuerpo en streaming bloque a bloque, sin leerlo completo en memoria.
+    Cada bloque se vacía al cliente para no retrasar la entrega.
+    """
+    compress, flush = _new_compressor(encoding, config)
+    try:
+        for chunk in chunks:
+            if chunk:
+                yield compress(chunk) + flush(False)
+        yield flush(True)
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+def _is_compressible(response):
+    if response.status_code < 200 or response.status_code in (204, 304):
+        return False
+    if 'Content-Encoding' in response.headers:
+        return False
+    if 'no-transform' in response.headers.get('Cache-Control', ''):
+        return False
+    return response.mimetype in COMPRESSIBLE_MIMETYPES
+
+
+def register_compression(app):
+    """
+    Registra la compresión negociada (gzip y zstd si está instalado) según el Accept-Encoding del cliente.
+
+    Se registra antes que el GET condicional: los hooks after_request se ejecutan en orden
+    inverso, así el 304 se decide sobre el cuerpo original y la compresión actúa después.
+    """
+
+    @app.after_request
+    def compress_response(response):
+        if not app.config.get('COMPRESSION_ENABLED', True) or not _is_compressible(response):
+            return response
+
+        # La representación depende del Accept-Encoding aunque esta vez no se comprima
+        response.vary.add('Accept-Encoding')
+
+        encoding = request.accept_encodings.best_match(_supported_encodings())
+        if encoding is None:
+            return response
+
+        min_size = app.config.get('COMPRESSION_MIN_SIZE', 0)
+        if response.is_streamed:
+            if response.content_length is not None and response.content_length < min_size:
+                return response
+            response.response = _compress_stream(response.response, encoding, app.config)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            response.set_data(_compress_body(data, encoding, app.config))
+
+        response.headers['Content-Encoding'] = encoding
+        # El ETag del cuerpo sin comprimir pasa a ser débil: mismo contenido, distintos bytes
+        etag, _ = response.get_etag()
+        if etag:
+            response.set_etag(etag, weak=True)
+        return response
@@ -0,0 +1,62 @@
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config.config import Config
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name='default', max_workers=None):
+    """
+    Devuelve un pool de hilos compartido identificado por nombre, creándolo la primera vez.
+    """
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=max_workers or Config.FANOUT_MAX_WORKERS,
+                    thread_name_prefix=f"gateway-{name}",
+                )
+                _executors[name] = executor
+    return executor
+
+
+def submit(fn, *args, executor='default', **kwargs):
+    """
+    Ejecuta `fn` en el pool indicado conservando el contexto actual
+    (contextvars, incluido el contexto de la petición de Flask).
+    """
+    ctx = contextvars.copy_context()
+    return get_executor(executor).submit(ctx.run, fn, *args, **kwargs)
+
+
+def run_parallel(calls, executor='default'):
+    """
+    Ejecuta varias llamadas independientes en paralelo y espera a que terminen todas.
+
+    Args:
+        calls (dict): Nombre -> (función, *argumentos).
+
+    Returns:
+        dict: Nombre -> resultado de cada llamada.
+    """
+    futures = {name: submit(call[0], *call[1:], executor=executor) for name, call in calls.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def _reset_after_fork():
+    """
+    Los hilos de los pools no sobreviven a un fork: el proceso hijo crea los suyos al usarlos.
+    """
+    global _executors_lock
+    _executors.clear()
+    _executors_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,24 @@
+from flask import request
+
+
+def register_conditional_responses(app):
+    """
+    Registra el soporte de GET condicional: ETag fuerte para las respuestas JSON
+    y respuesta 304 cuando el cliente envía un If-None-Match (o If-Modified-Since) vigente.
+    """
+
+    @app.after_request
+    def add_etag_and_make_conditional(response):
+        if not app.config.get('ETAG_ENABLED', True) or request.method not in ('GET', 'HEAD'):
+            return response
+        if response.status_code != 200:
+            return response
+
+        # Los validadores del microservicio (rutas de paso directo) se reenvían tal cual;
+        # el resto de respuestas JSON, incluidas las enriquecidas, reciben un ETag calculado.
+        if 'ETag' not in response.headers:
+            if response.is_streamed or not response.is_json:
+                return response
+            response.add_etag()
+
+        return response.make_conditional(request)
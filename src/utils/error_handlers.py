@@ -1,5 +1,5 @@
 from flask import jsonify
-from flask_limiter.errors import RateLimitExceeded
+import math
 import requests
 from utils.logger import get_logger
 
@@ -10,12 +10,16 @@ def register_error_handlers(app):
     Registra los manejadores de errores en la aplicación Flask.
     """
     
-    @app.errorhandler(RateLimitExceeded)
+    @app.errorhandler(429)
     def handle_rate_limit_exceeded(e):
-        return jsonify({
+        response = jsonify({
             "status": "error",
             "message": "Has excedido el límite de peticiones permitido. Por favor, inténtalo más tarde."
-        }), 429
+        })
+        retry_after = getattr(e, 'retry_after', None)
+        if retry_after is not None:
+            response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+        return response, 429
 
     @app.errorhandler(404)
     def not_found_error(error):
@@ -38,6 +42,14 @@ def register_error_handlers(app):
             "message": "El servicio no está disponible en este momento. Por favor, intente más tarde."
         }), 503
 
+    @app.errorhandler(requests.exceptions.Timeout)
+    def handle_timeout_error(error):
+        logger.error(f"Timeout Error: {error}")
+        return jsonify({
+            "status": "error",
+            "message": "El servicio tardó demasiado en responder. Por favor, intente más tarde."
+        }), 504
+
     @app.errorhandler(Exception)
     def global_error_handler(error):
         logger.error(f"Unexpected error: {error}")
@@ -0,0 +1,37 @@
+from flask import request
+
+
+def parse_list(raw):
+    """
+    Convierte un valor separado por comas ("id,title") en un conjunto; None si no se envió (= todos).
+    """
+    if raw is None:
+        return None
+    return {value.strip() for value in raw.split(',') if value.strip()}
+
+
+def parse_list_param(name):
+    """
+    Lee un parámetro de consulta con valores separados por comas (?fields=id,title).
+
+    Returns:
+        set | None: Valores pedidos, o None si el parámetro no se envió (= todos).
+    """
+    return parse_list(request.args.get(name))
+
+
+def select_fields(data, fields):
+    """
+    Deja solo los campos de primer nivel pedidos en un objeto o en cada objeto de una lista.
+
+    Args:
+        data (dict | list): Respuesta a recortar.
+        fields (set | None): Campos a conservar; None no recorta nada.
+    """
+    if fields is None:
+        return data
+    if isinstance(data, list):
+        return [select_fields(item, fields) for item in data]
+    if isinstance(data, dict):
+        return {key: value for key, value in data.items() if key in fields}
+    return data
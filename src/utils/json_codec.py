@@ -0,0 +1,102 @@
+import json
+import re
+
+from flask.json.provider import DefaultJSONProvider
+
+from config.config import Config
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin el paquete se usa el módulo json de la biblioteca estándar
+    orjson = None
+
+# Opciones de orjson equivalentes a `flask.jsonify`: claves ordenadas y fechas / dataclasses
+# serializadas por la función `default` del proveedor de Flask (no con el formato propio de orjson)
+_ORJSON_OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+                   if orjson is not None else 0)
+
+# orjson escribe UTF-8 sin escapar; json con ensure_ascii escapa todo lo que no es ASCII imprimible (y DEL)
+_NON_ASCII = re.compile('[\x7f-\U0010ffff]')
+
+
+def _escape_char(match):
+    code = ord(match.group())
+    if code < 0x10000:
+        return f'\\u{code:04x}'
+    code -= 0x10000
+    return f'\\u{0xd800 | (code >> 10):04x}\\u{0xdc00 | (code & 0x3ff):04x}'
+
+
+def fast_enabled():
+    """
+    Indica si se usa orjson: instalado y no desactivado con JSON_CODEC=stdlib.
+    """
+    return orjson is not None and Config.JSON_CODEC != 'stdlib'
+
+
+def dumps(obj, default=None):
+    """
+    Serializa igual que `flask.jsonify` en producción: claves ordenadas, formato compacto y
+    caracteres no ASCII escapados (\\uXXXX). Usa orjson si está disponible.
+
+    Diferencias conocidas con orjson: los floats en notación exponencial se escriben sin '+' ni
+    ceros a la izquierda (1e16 en lugar de 1e+16) y NaN / Infinity se escriben como null.
+    """
+    if fast_enabled():
+        try:
+            text = orjson.dumps(obj, default=default, option=_ORJSON_OPTIONS).decode('utf-8')
+        except TypeError:
+            # Tipos que orjson no admite (enteros de más de 64 bits, claves no str, ...)
+            pass
+        else:
+            return text if text.isascii() and '\x7f' not in text else _NON_ASCII.sub(_escape_char, text)
+    return json.dumps(obj, default=default, ensure_ascii=True, sort_keys=True, separators=(',', ':'))
+
+
+def loads(data):
+    """
+    Decodifica JSON desde str o bytes. Si orjson no lo acepta (p. ej. NaN o enteros de más de
+    64 bits) se reintenta con el módulo json, que es el que decide si el documento es inválido.
+    """
+    if fast_enabled():
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def decode_response(response):
+    """
+    Equivalente a `response.json()` de requests, decodificando los bytes directamente.
+    Los cuerpos que no son UTF-8 (o no son JSON) siguen el camino de requests, con sus mismos errores.
+    """
+    if fast_enabled():
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass
+    return response.json()
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Proveedor JSON de Flask que serializa y parsea con el códec de este módulo.
+    Las llamadas con opciones propias (indentación en modo debug, separadores por defecto de
+    `flask.json.dumps`, etc.) siguen usando el proveedor de Flask.
+    """
+
+    def _compatible(self, kwargs):
+        return (self.ensure_ascii and self.sort_keys
+                and kwargs.keys() <= {'separators', 'default'}
+                and tuple(kwargs.get('separators', ())) == (',', ':'))
+
+    def dumps(self, obj, **kwargs):
+        if not self._compatible(kwargs):
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, default=kwargs.get('default', self.default))
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
@@ -0,0 +1,125 @@
+import re
+
+from flask import Response, request
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+from utils import json_codec
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Caracteres con significado estructural fuera de los strings, y los que terminan (o escapan) dentro de ellos
+_STRUCTURAL = re.compile(rb'[\[\]{}",]')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+
+
+def iter_array_items(chunks, skip=0):
+    """
+    Separa un array JSON que llega por bloques y entrega sus elementos ya decodificados, uno a uno.
+    En memoria solo quedan el elemento en curso y el bloque actual, no el array completo.
+
+    Args:
+        chunks (iterable): Bloques de bytes del cuerpo (p. ej. `response.iter_content(...)`).
+        skip (int): Elementos iniciales que se saltan: solo se buscan sus límites, sin decodificarlos.
+
+    Raises:
+        ValueError: Si el cuerpo no es un array JSON o termina antes de cerrarlo.
+    """
+    buffer = b''
+    pos = 0          # Próximo byte por analizar
+    start = None     # Inicio del elemento en curso (dentro del array)
+    depth = 0
+    in_string = False
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += chunk
+        while True:
+            if in_string:
+                match = _STRING_SPECIAL.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                if match.group() == b'\\':
+                    if match.end() >= len(buffer):
+                        # El carácter escapado llega en el próximo bloque
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                in_string = False
+                pos = match.end()
+                continue
+
+            match = _STRUCTURAL.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            char, pos = match.group(), match.end()
+            if char == b'"':
+                if depth == 0:
+                    raise ValueError("Se esperaba un array JSON")
+                in_string = True
+            elif char in (b'[', b'{'):
+                if depth == 0:
+                    if char != b'[' or buffer[:match.start()].strip():
+                        raise ValueError("Se esperaba un array JSON")
+                    start = pos
+                depth += 1
+            elif char in (b']', b'}'):
+                depth -= 1
+                if depth == 0:
+                    item = buffer[start:match.start()]
+                    if item.strip() and skip <= 0:
+                        yield json_codec.loads(item)
+                    return
+            elif depth == 1:
+                if skip > 0:
+                    skip -= 1
+                else:
+                    yield json_codec.loads(buffer[start:match.start()])
+                start = pos
+
+        # Se descarta lo ya entregado: el buffer solo guarda el elemento en curso
+        keep = start if start is not None else pos
+        buffer, pos = buffer[keep:], pos - keep
+        if start is not None:
+            start = 0
+
+    raise ValueError("El array JSON terminó antes de cerrarse")
+
+
+def prefers_ndjson(args, accept):
+    """
+    Indica si unos parámetros de consulta y un header Accept piden la variante en streaming:
+    ?format=ndjson o Accept: application/x-ndjson. Sirve para Flask y para aiohttp.
+    """
+    if args.get('format') == 'ndjson':
+        return True
+    accepted = parse_accept_header(accept, MIMEAccept)
+    return accepted.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def wants_ndjson():
+    """
+    La petición Flask actual pidió la variante en streaming (ver `prefers_ndjson`).
+    """
+    return prefers_ndjson(request.args, request.headers.get('Accept'))
+
+
+def ndjson_response(items, status=200):
+    """
+    Respuesta NDJSON (un objeto JSON por línea) que se envía a medida que se producen los elementos.
+    Al terminar o abortarse el envío se cierra el iterador (y con él la respuesta del microservicio).
+    """
+    def lines():
+        try:
+            for item in items:
+                yield json_codec.dumps(item) + "\n"
+        finally:
+            close = getattr(items, 'close', None)
+            if close is not None:
+                close()
+
+    return Response(lines(), status=status, mimetype=NDJSON_MIMETYPE)
@@ -0,0 +1,352 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, request
+
+from config.config import Config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Límites (segundos) de los buckets de los histogramas de latencia
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_HELP = {
+    'gateway_http_requests_total': ('counter', 'Peticiones atendidas por el gateway por ruta, método y status.'),
+    'gateway_http_request_duration_seconds': ('histogram', 'Latencia de las peticiones del gateway por ruta.'),
+    'gateway_http_requests_in_flight': ('gauge', 'Peticiones del gateway en curso.'),
+    'gateway_upstream_requests_total': ('counter', 'Llamadas a los microservicios por upstream, método y status.'),
+    'gateway_upstream_request_duration_seconds': ('histogram', 'Latencia de las llamadas a cada microservicio.'),
+    'gateway_upstream_errors_total': ('counter', 'Errores de conexión, timeouts y rechazos del circuit breaker.'),
+    'gateway_upstream_requests_in_flight': ('gauge', 'Llamadas a los microservicios en curso.'),
+}
+
+
+class _Shard:
+    """
+    Valores acumulados por un único hilo. Solo su hilo los modifica, así que no necesitan lock.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+
+    def merge_into(self, counters, histograms):
+        for key, value in self.counters.copy().items():
+            counters[key] = counters.get(key, 0) + value
+        for key, values in self.histograms.copy().items():
+            total = histograms.setdefault(key, [0] * (len(LATENCY_BUCKETS) + 2))
+            for i, value in enumerate(list(values)):
+                total[i] += value
+
+
+_local = threading.local()
+# (hilo, shard) de cada hilo que registró métricas
+_shards = []
+# Valores de hilos ya terminados
+_retired = _Shard()
+_registry_lock = threading.Lock()
+
+
+def _shard():
+    shard = getattr(_local, 'shard', None)
+    if shard is None:
+        shard = _local.shard = _Shard()
+        with _registry_lock:
+            _shards.append((threading.current_thread(), shard))
+    return shard
+
+
+def inc(name, labels, value=1):
+    """
+    Incrementa un contador (o un gauge, con valores negativos) en el shard del hilo actual.
+    """
+    counters = _shard().counters
+    key = (name, labels)
+    counters[key] = counters.get(key, 0) + value
+
+
+def observe(name, labels, seconds):
+    """
+    Registra una observación en un histograma de latencia.
+    """
+    histograms = _shard().histograms
+    key = (name, labels)
+    values = histograms.get(key)
+    if values is None:
+        # Un contador por bucket, el bucket +Inf y la suma de segundos
+        values = histograms[key] = [0] * (len(LATENCY_BUCKETS) + 2)
+    values[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+    values[-1] += seconds
+
+
+def observe_request(endpoint, method, status, seconds):
+    inc('gateway_http_requests_total', (('endpoint', endpoint), ('method', method), ('status', str(status))))
+    observe('gateway_http_request_duration_seconds', (('endpoint', endpoint),), seconds)
+
+
+def observe_upstream(upstream, method, status, seconds):
+    inc('gateway_upstream_requests_total', (('upstream', upstream), ('method', method), ('status', str(status))))
+    observe('gateway_upstream_request_duration_seconds', (('upstream', upstream),), seconds)
+
+
+def upstream_error(upstream, kind):
+    """
+    Cuenta un error de un upstream: 'connection', 'timeout' o 'circuit_open'.
+    """
+    inc('gateway_upstream_errors_total', (('upstream', upstream), ('kind', kind)))
+
+
+def upstream_started(upstream):
+    inc('gateway_upstream_requests_in_flight', (('upstream', upstream),))
+
+
+def upstream_finished(upstream):
+    inc('gateway_upstream_requests_in_flight', (('upstream', upstream),), -1)
+
+
+def _collect():
+    counters, histograms = {}, {}
+    with _registry_lock:
+        alive = []
+        for thread, shard in _shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                # El hilo terminó: sus valores pasan al shard de retirados y dejan de recorrerse
+                shard.merge_into(_retired.counters, _retired.histograms)
+        _shards[:] = alive
+        shards = [shard for _, shard in alive] + [_retired]
+    for shard in shards:
+        shard.merge_into(counters, histograms)
+    return counters, histograms
+
+
+def _snapshot_path(pid):
+    return os.path.join(Config.METRICS_MULTIPROC_DIR, f"metrics-{pid}.json")
+
+
+def write_snapshot():
+    """
+    Guarda las métricas del proceso en METRICS_MULTIPROC_DIR para que /metrics las sume desde
+    cualquier worker. Se escribe en un archivo temporal y se renombra, así nunca se lee a medias.
+    """
+    if not Config.METRICS_MULTIPROC_DIR:
+        return
+    counters, histograms = _collect()
+    data = {
+        "counters": [[name, labels, value] for (name, labels), value in counters.items()],
+        "histograms": [[name, labels, values] for (name, labels), values in histograms.items()],
+    }
+    path = _snapshot_path(os.getpid())
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(path + '.tmp', path)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_snapshots(counters, histograms):
+    """
+    Suma las métricas guardadas por los demás workers. Los contadores e histogramas de workers ya
+    terminados se conservan (así un worker reciclado no parece un reinicio del contador); sus gauges no.
+    """
+    directory = Config.METRICS_MULTIPROC_DIR
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return
+    own = os.getpid()
+    for file_name in names:
+        if not (file_name.startswith('metrics-') and file_name.endswith('.json')):
+            continue
+        try:
+            pid = int(file_name[len('metrics-'):-len('.json')])
+        except ValueError:
+            continue
+        if pid == own:
+            continue
+        try:
+            with open(os.path.join(directory, file_name), encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Métricas: no se pudo leer {file_name}: {e}")
+            continue
+        alive = _pid_alive(pid)
+        for name, labels, value in data["counters"]:
+            if not alive and _HELP.get(name, ('counter',))[0] == 'gauge':
+                continue
+            key = (name, tuple(tuple(pair) for pair in labels))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, values in data["histograms"]:
+            total = histograms.setdefault((name, tuple(tuple(pair) for pair in labels)),
+                                          [0] * (len(LATENCY_BUCKETS) + 2))
+            for i, value in enumerate(values):
+                total[i] += value
+
+
+class _Flusher(threading.Thread):
+    """
+    Hilo de cada worker que guarda sus métricas cada METRICS_FLUSH_INTERVAL segundos.
+    """
+
+    def __init__(self, interval):
+        super().__init__(name='metrics-flusher', daemon=True)
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                write_snapshot()
+            except OSError as e:
+                logger.warning(f"Métricas: no se pudo guardar el snapshot del proceso: {e}")
+
+    def stop(self):
+        self._stopped.set()
+
+
+_flusher = None
+
+
+def start_flusher():
+    """
+    Arranca el guardado periódico de métricas del proceso (solo con METRICS_MULTIPROC_DIR).
+    """
+    global _flusher
+    if Config.METRICS_MULTIPROC_DIR and _flusher is None:
+        os.makedirs(Config.METRICS_MULTIPROC_DIR, exist_ok=True)
+        _flusher = _Flusher(Config.METRICS_FLUSH_INTERVAL)
+        _flusher.start()
+    return _flusher
+
+
+def stop_flusher():
+    """
+    Detiene el guardado periódico y guarda los valores finales (al terminar un worker).
+    """
+    global _flusher
+    if _flusher is not None:
+        _flusher.stop()
+        _flusher = None
+    write_snapshot()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=()):
+    pairs = tuple(labels) + tuple(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(gauges=()):
+    """
+    Exposición de todas las métricas en el formato de texto de Prometheus.
+
+    Args:
+        gauges (iterable): Tuplas (nombre, ayuda, labels, valor) calculadas en el momento
+            (estado de cachés, circuit breakers, pools...).
+    """
+    counters, histograms = _collect()
+    if Config.METRICS_MULTIPROC_DIR:
+        _read_snapshots(counters, histograms)
+    lines = []
+
+    families = {}
+    for (name, labels), value in counters.items():
+        families.setdefault(name, []).append(f"{name}{_format_labels(labels)} {_number(value)}")
+    for (name, labels), values in histograms.items():
+        samples = families.setdefault(name, [])
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), values):
+            cumulative += count
+            samples.append(f"{name}_bucket{_format_labels(labels, (('le', bound),))} {cumulative}")
+        samples.append(f"{name}_sum{_format_labels(labels)} {_number(values[-1])}")
+        samples.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+
+    for name, help_text, labels, value in gauges:
+        _HELP.setdefault(name, ('gauge', help_text))
+        families.setdefault(name, []).append(f"{name}{_format_labels(labels)} {_number(value)}")
+
+    for name in sorted(families):
+        kind, help_text = _HELP.get(name, ('untyped', ''))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(sorted(families[name]) if kind != 'histogram' else families[name])
+    return '\n'.join(lines) + '\n'
+
+
+def register_request_metrics(app):
+    """
+    Registra las métricas por petición (conteo por ruta y status, latencia y peticiones en curso).
+    Debe registrarse antes que el resto de hooks para medir la petición completa.
+    """
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_start = time.perf_counter()
+        inc('gateway_http_requests_in_flight', ())
+
+    @app.after_request
+    def record_request(response):
+        start = g.get('metrics_start')
+        if start is not None:
+            observe_request(request.endpoint or 'none', request.method, response.status_code,
+                            time.perf_counter() - start)
+        return response
+
+    @app.teardown_request
+    def finish_request(exc=None):
+        if g.pop('metrics_start', None) is not None:
+            inc('gateway_http_requests_in_flight', (), -1)
+
+
+def reset():
+    """
+    Descarta todas las métricas (para pruebas).
+    """
+    global _retired
+    with _registry_lock:
+        for _, shard in _shards:
+            shard.counters.clear()
+            shard.histograms.clear()
+        _retired = _Shard()
+
+
+def _reset_after_fork():
+    """
+    Cada worker empieza con sus propias métricas: se descartan los shards heredados del padre.
+    Con METRICS_MULTIPROC_DIR el worker las guarda periódicamente para que /metrics sume todas.
+    """
+    global _local, _retired, _registry_lock, _flusher
+    _local = threading.local()
+    _shards.clear()
+    _retired = _Shard()
+    _registry_lock = threading.Lock()
+    _flusher = None  # El hilo del padre no existe en el hijo
+    start_flusher()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
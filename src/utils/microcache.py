@@ -0,0 +1,150 @@
+import os
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, request, copy_current_request_context
+
+from config.config import Config
+from middlewares.auth_context import get_token_claims
+from utils.cache import TTLCache
+from utils.concurrency import submit
+from utils.json_stream import wants_ndjson
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Respuestas completas de rutas GET de solo lectura: clave -> (cuerpo, status, headers, guardada_en)
+_responses = TTLCache('microcache', ttl=0, maxsize=Config.MICROCACHE_MAXSIZE)
+
+# Claves con una actualización en segundo plano en curso
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    global _refreshing_lock
+    _refreshing.clear()
+    _refreshing_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+# Headers que no se guardan con la respuesta cacheada
+_SKIPPED_HEADERS = {'Content-Length', 'Set-Cookie', 'X-Cache'}
+
+
+def _auth_scope(vary):
+    """
+    Parte de la clave que depende del usuario: nada, su rol o su ID.
+    """
+    if vary is None:
+        return None
+    try:
+        claims = get_token_claims()
+    except Exception:
+        return 'anonymous'
+    return claims.get(vary)
+
+
+def _cache_key(vary):
+    # Se guarda el cuerpo sin comprimir: la compresión del gateway se aplica después, en cada respuesta
+    query = tuple(sorted(request.args.items(multi=True)))
+    return request.endpoint, request.path, query, _auth_scope(vary)
+
+
+def _cacheable(response):
+    # Las respuestas en streaming (paso directo, NDJSON) no se guardan: habría que leerlas completas
+    return response.status_code == 200 and not response.is_streamed
+
+
+def _store(key, response, retention):
+    body = response.get_data()
+    # El ETag se calcula una vez al guardar y no en cada acierto
+    response.add_etag()
+    headers = [(name, value) for name, value in response.headers.items() if name not in _SKIPPED_HEADERS]
+    entry = (body, response.status_code, headers, time.monotonic())
+    _responses.set(key, entry, ttl=retention)
+
+
+def _serve(entry, cache_status):
+    body, status, headers, _ = entry
+    response = current_app.response_class(body, status=status, headers=headers)
+    response.headers['X-Cache'] = cache_status
+    return response
+
+
+def _refresh_in_background(key, view, args, kwargs, retention):
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    @copy_current_request_context
+    def refresh():
+        try:
+            response = current_app.make_response(view(*args, **kwargs))
+            if _cacheable(response):
+                _store(key, response, retention)
+        except Exception as e:
+            logger.warning(f"Microcaché: falló la actualización de {request.path}: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    submit(refresh, executor='microcache')
+
+
+def micro_cached(ttl_setting, vary=None):
+    """
+    Micro-caché de respuestas para rutas GET de solo lectura muy consultadas.
+
+    - Dentro del TTL se sirve la respuesta guardada sin llamar al microservicio.
+    - Stale-while-revalidate: pasado el TTL y durante MICROCACHE_STALE_TTL segundos se sirve
+      la respuesta anterior mientras una única actualización corre en segundo plano.
+    - Stale-if-error: si el microservicio falla (5xx o excepción), se sirve la última respuesta
+      correcta durante MICROCACHE_STALE_IF_ERROR_TTL segundos.
+
+    Args:
+        ttl_setting (str): Clave de configuración con el TTL de la ruta en segundos (0 la desactiva).
+        vary (str, optional): Claim del JWT que separa las entradas ('role', 'user_id') o None si es pública.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            ttl = current_app.config.get(ttl_setting, 0)
+            # Las respuestas NDJSON se envían en streaming y nunca se guardan (la clave no distingue el Accept)
+            if ttl <= 0 or request.method != 'GET' or wants_ndjson():
+                return f(*args, **kwargs)
+
+            stale_ttl = current_app.config.get('MICROCACHE_STALE_TTL', 0)
+            stale_if_error_ttl = current_app.config.get('MICROCACHE_STALE_IF_ERROR_TTL', 0)
+            retention = ttl + max(stale_ttl, stale_if_error_ttl)
+
+            key = _cache_key(vary)
+            entry = _responses.get(key)
+            age = time.monotonic() - entry[3] if entry is not None else None
+
+            if entry is not None and age < ttl:
+                return _serve(entry, 'HIT')
+            if entry is not None and age < ttl + stale_ttl:
+                _refresh_in_background(key, f, args, kwargs, retention)
+                return _serve(entry, 'STALE')
+
+            can_serve_stale = entry is not None and age < ttl + stale_if_error_ttl
+            try:
+                response = current_app.make_response(f(*args, **kwargs))
+            except Exception:
+                if can_serve_stale:
+                    return _serve(entry, 'STALE-IF-ERROR')
+                raise
+
+            if _cacheable(response):
+                _store(key, response, retention)
+            elif response.status_code >= 500 and can_serve_stale:
+                return _serve(entry, 'STALE-IF-ERROR')
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
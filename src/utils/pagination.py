@@ -0,0 +1,149 @@
+import base64
+import binascii
+import itertools
+
+import requests
+from flask import current_app, jsonify, request
+
+from utils import json_codec
+from utils.json_stream import ndjson_response, prefers_ndjson
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_END = object()
+
+
+class InvalidCursorError(ValueError):
+    """
+    El cursor o el límite de página recibidos no son válidos.
+    """
+
+
+def encode_cursor(offset):
+    """
+    Cursor opaco para el cliente: base64url (sin relleno) de {"o": offset}.
+
+    El microservicio no pagina, así que el cursor es una posición en su listado: si entre una página y
+    la siguiente se insertan o borran elementos antes de esa posición, alguno puede repetirse u omitirse.
+    """
+    raw = json_codec.dumps({"o": offset}).encode('ascii')
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Devuelve la posición guardada en un cursor de `encode_cursor`.
+
+    Raises:
+        InvalidCursorError: Si el cursor no tiene el formato esperado.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        offset = json_codec.loads(raw)["o"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidCursorError("Cursor inválido.")
+    if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+        raise InvalidCursorError("Cursor inválido.")
+    return offset
+
+
+def parse_page_params(args, page_size, max_page_size):
+    """
+    Lee ?limit= y ?cursor= de unos parámetros de consulta (Flask o aiohttp).
+
+    Returns:
+        tuple | None: (offset, limit), o None si no se pidió paginación (respuesta completa, como antes).
+
+    Raises:
+        InvalidCursorError: Si el cursor no es válido o el límite está fuera de 1..max_page_size.
+    """
+    raw_limit = args.get('limit')
+    cursor = args.get('cursor')
+    if raw_limit is None and cursor is None:
+        return None
+
+    if raw_limit is None:
+        limit = min(page_size, max_page_size)
+    else:
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            raise InvalidCursorError("El parámetro 'limit' debe ser un entero.")
+        if not 1 <= limit <= max_page_size:
+            raise InvalidCursorError(f"El parámetro 'limit' debe estar entre 1 y {max_page_size}.")
+
+    offset = decode_cursor(cursor) if cursor else 0
+    return offset, limit
+
+
+def catalog_variant(args, accept, page_size, max_page_size):
+    """
+    Variante de catálogo pedida: (ndjson, paginación) con paginación = (offset, limit) o None.
+
+    Raises:
+        InvalidCursorError: Si la paginación no es válida o se combina con NDJSON.
+    """
+    ndjson = prefers_ndjson(args, accept)
+    paging = parse_page_params(args, page_size, max_page_size)
+    if paging is not None and ndjson:
+        raise InvalidCursorError("La paginación por cursor no se combina con NDJSON: el streaming entrega el catálogo completo.")
+    return ndjson, paging
+
+
+def take_page(items, offset, limit):
+    """
+    Toma una página de un iterador que ya empieza en `offset` (los servicios saltan los elementos
+    anteriores sin decodificarlos): guarda `limit` y mira uno más para saber si hay página siguiente.
+    Cierra el iterador al terminar, sin leer el resto del catálogo.
+
+    Returns:
+        tuple: (elementos de la página, cursor de la página siguiente o None).
+    """
+    try:
+        iterator = iter(items)
+        page = list(itertools.islice(iterator, limit))
+        has_more = next(iterator, _END) is not _END
+    finally:
+        close = getattr(items, 'close', None)
+        if close is not None:
+            close()
+    return page, encode_cursor(offset + limit) if has_more else None
+
+
+def catalog_response(fetch):
+    """
+    Respuesta de un catálogo (GET /quizzes, GET /questions) paginada por cursor o en streaming NDJSON.
+
+    - ?limit=&cursor=: {"items": [...], "next_cursor": "..." | null}.
+    - Accept: application/x-ndjson o ?format=ndjson: un elemento por línea a medida que llegan.
+
+    Args:
+        fetch (callable): Recibe cuántos elementos saltar y devuelve (iterador de elementos, 200)
+            o (error, estatus), como los servicios.
+
+    Returns:
+        Response | None: None si no se pidió ninguna de las dos variantes (la ruta responde como siempre).
+    """
+    try:
+        ndjson, paging = catalog_variant(request.args, request.headers.get('Accept'),
+                                         current_app.config['CATALOG_PAGE_SIZE'],
+                                         current_app.config['CATALOG_MAX_PAGE_SIZE'])
+    except InvalidCursorError as e:
+        return jsonify({"message": str(e)}), 400
+    if paging is None and not ndjson:
+        return None
+
+    items, status = fetch(paging[0] if paging is not None else 0)
+    if status != 200:
+        return jsonify(items), status
+
+    if ndjson:
+        return ndjson_response(items)
+
+    try:
+        page, next_cursor = take_page(items, *paging)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.warning(f"Respuesta no válida del microservicio al paginar: {e}")
+        return jsonify({"message": "Respuesta no válida del microservicio"}), 502
+    return jsonify({"items": page, "next_cursor": next_cursor}), 200
@@ -0,0 +1,159 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+
+class ProfilerBusyError(Exception):
+    """
+    Ya hay un perfilado en curso en este proceso.
+    """
+
+
+class TracingNotStartedError(Exception):
+    """
+    Se pidió un snapshot de memoria sin haber iniciado tracemalloc.
+    """
+
+
+_profile_lock = threading.Lock()
+_tracemalloc_lock = threading.Lock()
+# Snapshot de referencia para los diffs de memoria
+_baseline = None
+
+
+def _reset_after_fork():
+    global _profile_lock, _tracemalloc_lock
+    _profile_lock = threading.Lock()
+    _tracemalloc_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ',')
+
+
+def _collapse(frame, thread_name):
+    """
+    Pila de un hilo en formato colapsado (raíz primero, separada por ';').
+    """
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name.replace(';', ','))
+    return ';'.join(reversed(labels))
+
+
+def sample_stacks(seconds, interval):
+    """
+    Perfilador de muestreo por tiempo real: toma las pilas de todos los hilos cada `interval`
+    segundos durante `seconds` segundos. No tiene ningún costo fuera de esta llamada.
+
+    Returns:
+        str: Pilas colapsadas "pila cantidad" por línea, listas para generar un flamegraph.
+
+    Raises:
+        ProfilerBusyError: Si ya hay un perfilado en curso.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError()
+    try:
+        own_thread = threading.get_ident()
+        stacks = Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_thread:
+                    stacks[_collapse(frame, names.get(thread_id, str(thread_id)))] += 1
+            time.sleep(interval)
+    finally:
+        _profile_lock.release()
+    return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def start_tracemalloc(frames):
+    """
+    Inicia el registro de asignaciones de memoria (si no estaba activo) y toma el snapshot de referencia.
+    """
+    global _baseline
+    with _tracemalloc_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        _baseline = _current_snapshot()
+    return {"tracing": True, "frames": tracemalloc.get_traceback_limit()}
+
+
+def stop_tracemalloc():
+    global _baseline
+    with _tracemalloc_lock:
+        tracemalloc.stop()
+        _baseline = None
+    return {"tracing": False}
+
+
+def _stat_to_dict(stat):
+    frame = stat.traceback[0]
+    return {
+        "file": frame.filename,
+        "line": frame.lineno,
+        "size_kb": round(stat.size / 1024, 1),
+        "count": stat.count,
+    }
+
+
+def _diff_to_dict(stat):
+    data = _stat_to_dict(stat)
+    data["size_diff_kb"] = round(stat.size_diff / 1024, 1)
+    data["count_diff"] = stat.count_diff
+    return data
+
+
+def _current_snapshot():
+    if not tracemalloc.is_tracing():
+        raise TracingNotStartedError()
+    # Se excluyen las asignaciones del propio tracemalloc
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+
+
+def top_allocations(limit):
+    """
+    Líneas de código con más memoria asignada y aún viva.
+
+    Raises:
+        TracingNotStartedError: Si tracemalloc no está activo.
+    """
+    with _tracemalloc_lock:
+        snapshot = _current_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "traced_kb": round(current / 1024, 1),
+        "peak_kb": round(peak / 1024, 1),
+        "top": [_stat_to_dict(stat) for stat in snapshot.statistics('lineno')[:limit]],
+    }
+
+
+def diff_allocations(limit, reset_baseline=False):
+    """
+    Diferencia de asignaciones respecto del snapshot de referencia.
+
+    Raises:
+        TracingNotStartedError: Si tracemalloc no está activo.
+    """
+    global _baseline
+    with _tracemalloc_lock:
+        snapshot = _current_snapshot()
+        baseline = _baseline or snapshot
+        if reset_baseline:
+            _baseline = snapshot
+    return {"top": [_diff_to_dict(stat) for stat in snapshot.compare_to(baseline, 'lineno')[:limit]]}
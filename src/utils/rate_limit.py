@@ -0,0 +1,240 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from flask import request
+from limits import parse
+from limits.storage import storage_from_string
+from werkzeug.exceptions import TooManyRequests
+
+from middlewares.auth_context import get_token_claims
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Limiters creados en este proceso (se reinician en los procesos hijos tras un fork)
+_limiters = weakref.WeakSet()
+
+
+class RateLimitExceeded(TooManyRequests):
+    """
+    Se superó el límite de peticiones; `retry_after` indica los segundos hasta poder reintentar.
+    """
+
+    def __init__(self, retry_after):
+        super().__init__()
+        self.retry_after = retry_after
+
+
+def rate_limit_exempt(f):
+    """
+    Excluye una vista del rate limiting (por ejemplo, /metrics).
+    """
+    f.rate_limit_exempt = True
+    return f
+
+
+class TokenBucket:
+    """
+    Bucket de tokens local para un usuario (o IP) y un límite.
+
+    Las peticiones se admiten en memoria mientras queden tokens; las admitidas se acumulan
+    en `pending` hasta sincronizarlas en lote con el almacenamiento compartido.
+    """
+
+    def __init__(self, limit):
+        self.capacity = limit.amount
+        self.expiry = limit.get_expiry()
+        self.rate = self.capacity / self.expiry
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.pending = 0
+        self.last_sync = self.updated
+        self.blocked_until = 0.0
+        self.syncing = False
+        self.lock = threading.Lock()
+
+    def take(self, now):
+        """
+        Consume un token. Devuelve (admitida, segundos hasta el próximo token).
+        """
+        with self.lock:
+            if now < self.blocked_until:
+                return False, self.blocked_until - now
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return False, (1 - self.tokens) / self.rate
+            self.tokens -= 1
+            self.pending += 1
+            return True, 0.0
+
+
+class RateLimiter:
+    """
+    Rate limiting por usuario (user_id del JWT, o IP si no hay token válido), por ruta y por rol.
+
+    - Las tablas de límites salen de RATE_LIMITS: {"<endpoint>|*": {"<rol>|*": "<límite>"}}.
+      Sin coincidencia se aplica LIMTER_DEFAULT_LIMIT, compartido por todas las rutas.
+    - Cada decisión se toma con un bucket de tokens local, sin ir a Redis.
+    - Los conteos se envían al almacenamiento compartido en lotes (RATE_LIMIT_SYNC_BATCH peticiones
+      o RATE_LIMIT_SYNC_INTERVAL segundos); si el total entre instancias alcanza el límite,
+      el bucket queda bloqueado hasta el fin de la ventana.
+    """
+
+    def __init__(self, config):
+        """
+        Args:
+            config (Mapping): Configuración de la app (`app.config` en Flask, un dict en el modo asyncio).
+        """
+        self.storage_url = config['LIMTER_STORAGE_URL']
+        self.storage = storage_from_string(self.storage_url)
+        self.default_limit = parse(config['LIMTER_DEFAULT_LIMIT'])
+        self.routes = {
+            endpoint: {role: parse(limit) for role, limit in roles.items()}
+            for endpoint, roles in json.loads(config.get('RATE_LIMITS') or '{}').items()
+        }
+        self.sync_batch = config.get('RATE_LIMIT_SYNC_BATCH', 10)
+        self.sync_interval = config.get('RATE_LIMIT_SYNC_INTERVAL', 1.0)
+        self.max_buckets = config.get('RATE_LIMIT_MAX_BUCKETS', 100000)
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        _limiters.add(self)
+
+    def _reset_after_fork(self):
+        # Buckets y conexiones propios por worker; el total entre workers se coordina en el almacenamiento
+        self.storage = storage_from_string(self.storage_url)
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _resolve(self, endpoint, role):
+        """
+        Límite aplicable y su ámbito: la ruta si tiene tabla propia, 'global' si no.
+        """
+        route_limits = self.routes.get(endpoint, {})
+        limit = route_limits.get(role) or route_limits.get('*')
+        if limit is not None:
+            return limit, endpoint
+        limit = self.routes.get('*', {}).get(role)
+        return limit or self.default_limit, 'global'
+
+    def _bucket(self, key, limit):
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(limit)
+                while len(self._buckets) > self.max_buckets:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            return bucket
+
+    def _sync_due(self, bucket, now):
+        return bucket.pending and (bucket.pending >= self.sync_batch or now - bucket.last_sync >= self.sync_interval)
+
+    def _sync(self, key, bucket, now):
+        """
+        Envía al almacenamiento compartido las peticiones admitidas desde la última sincronización.
+        Solo un hilo sincroniza cada bucket; el resto sigue decidiendo en local sin esperar.
+        """
+        with bucket.lock:
+            if bucket.syncing or not self._sync_due(bucket, now):
+                return
+            bucket.syncing = True
+            amount, bucket.pending, bucket.last_sync = bucket.pending, 0, now
+
+        storage_key = f"rl/{key[0]}/{key[1]}/{bucket.capacity}/{bucket.expiry}"
+        try:
+            count = self.storage.incr(storage_key, bucket.expiry, amount=amount)
+            if count >= bucket.capacity:
+                window_left = max(0.0, self.storage.get_expiry(storage_key) - time.time())
+                with bucket.lock:
+                    bucket.tokens = 0.0
+                    bucket.blocked_until = now + window_left
+        except Exception as e:
+            # Sin almacenamiento compartido se sigue limitando en local y se reintenta en el próximo lote
+            logger.warning(f"Rate limiting: no se pudo sincronizar {storage_key}: {e}")
+            with bucket.lock:
+                bucket.pending += amount
+        finally:
+            with bucket.lock:
+                bucket.syncing = False
+
+    def _take(self, endpoint, claims, remote_addr):
+        """
+        Consume un token del bucket del usuario (o IP) para la ruta.
+
+        Returns:
+            tuple: (clave, bucket, instante, admitida, segundos hasta el próximo token).
+        """
+        user_id = claims.get('user_id')
+        identity = f"user:{user_id}" if user_id is not None else f"ip:{remote_addr}"
+
+        limit, scope = self._resolve(endpoint, claims.get('role'))
+        key = (scope, identity)
+        bucket = self._bucket(key, limit)
+
+        now = time.monotonic()
+        allowed, retry_after = bucket.take(now)
+        return key, bucket, now, allowed, retry_after
+
+    def check(self):
+        """
+        Admite o rechaza la petición actual.
+
+        Raises:
+            RateLimitExceeded: Si el usuario superó el límite de la ruta.
+        """
+        try:
+            claims = get_token_claims()
+        except Exception:
+            claims = {}
+
+        key, bucket, now, allowed, retry_after = self._take(request.endpoint, claims, request.remote_addr)
+        self._sync(key, bucket, now)
+        if not allowed:
+            raise RateLimitExceeded(retry_after)
+
+    def check_async(self, endpoint, claims, remote_addr):
+        """
+        Equivalente de `check` para el modo asyncio: la decisión se toma en el loop y la
+        sincronización con el almacenamiento (bloqueante) corre en el pool de hilos por defecto.
+
+        Raises:
+            RateLimitExceeded: Si el usuario superó el límite de la ruta.
+        """
+        key, bucket, now, allowed, retry_after = self._take(endpoint, claims, remote_addr)
+        if self._sync_due(bucket, now):
+            asyncio.get_running_loop().run_in_executor(None, self._sync, key, bucket, now)
+        if not allowed:
+            raise RateLimitExceeded(retry_after)
+
+
+def _reset_after_fork():
+    for limiter in list(_limiters):
+        limiter._reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def register_rate_limiting(app):
+    """
+    Registra el rate limiting por usuario, ruta y rol como hook before_request.
+    """
+    app.extensions['rate_limiter'] = RateLimiter(app.config)
+
+    @app.before_request
+    def enforce_rate_limit():
+        if not app.config.get('RATE_LIMIT_ENABLED', True) or request.method == 'OPTIONS':
+            return
+        view = app.view_functions.get(request.endpoint)
+        if getattr(view, 'rate_limit_exempt', False):
+            return
+        app.extensions['rate_limiter'].check()
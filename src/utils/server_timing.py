@@ -0,0 +1,134 @@
+import json
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import request
+
+from utils.json_codec import FastJSONProvider
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Mediciones de la petición actual, o None si no se miden. Se propaga a los hilos de utils.concurrency.
+_recorder = ContextVar('server_timing', default=None)
+
+
+class TimingRecorder:
+    """
+    Tramos de tiempo medidos durante una petición: (nombre, milisegundos, descripción).
+    """
+
+    def __init__(self, show_header):
+        self.show_header = show_header
+        self.started_at = time.perf_counter()
+        self.entries = []
+
+    def add(self, name, duration_ms, desc=None):
+        # list.append es atómico: los hilos del fan-out pueden registrar tramos a la vez
+        self.entries.append((name, duration_ms, desc))
+
+    def header(self, total_ms):
+        parts = []
+        for name, duration_ms, desc in self.entries + [('total', total_ms, None)]:
+            part = name
+            if desc:
+                part += ';desc="' + desc.replace('\\', '\\\\').replace('"', '\\"') + '"'
+            parts.append(f"{part};dur={duration_ms:.2f}")
+        return ', '.join(parts)
+
+
+def record(name, started_at, desc=None):
+    """
+    Registra un tramo que empezó en `started_at` (time.perf_counter()) si la petición se está midiendo.
+    """
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.add(name, (time.perf_counter() - started_at) * 1000, desc)
+
+
+@contextmanager
+def timed(name, desc=None):
+    """
+    Mide el bloque como un tramo del header Server-Timing. Sin medición activa apenas tiene costo.
+    """
+    if _recorder.get() is None:
+        yield
+        return
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, started_at, desc)
+
+
+class TimedJSONProvider(FastJSONProvider):
+    """
+    Proveedor JSON de Flask (códec de utils.json_codec) que mide la serialización de las respuestas (jsonify).
+    """
+
+    def dumps(self, obj, **kwargs):
+        with timed('json'):
+            return super().dumps(obj, **kwargs)
+
+
+def _debug_requested(app):
+    """
+    El header de depuración solo se atiende para administradores con un token válido.
+    """
+    if not request.headers.get(app.config.get('SERVER_TIMING_DEBUG_HEADER', 'X-Debug-Timing')):
+        return False
+    # Import diferido: auth_context usa este módulo para medir la verificación del JWT
+    from middlewares.auth_context import get_token_claims
+    try:
+        return get_token_claims().get('role') == 'admin'
+    except Exception:
+        return False
+
+
+def register_server_timing(app):
+    """
+    Registra la medición por petición: header Server-Timing y una línea de log estructurada.
+
+    - Con el header de depuración (SERVER_TIMING_DEBUG_HEADER) y un token de administrador,
+      la respuesta incluye el header Server-Timing.
+    - Una fracción SERVER_TIMING_SAMPLE_RATE de las peticiones se mide solo para el log.
+    """
+    app.json = TimedJSONProvider(app)
+
+    @app.before_request
+    def start_server_timing():
+        # Se activa antes de mirar el token para que su verificación quede medida
+        recorder = TimingRecorder(show_header=False)
+        _recorder.set(recorder)
+        if _debug_requested(app):
+            recorder.show_header = True
+        elif random.random() >= app.config.get('SERVER_TIMING_SAMPLE_RATE', 0.0):
+            _recorder.set(None)
+
+    @app.after_request
+    def add_server_timing(response):
+        recorder = _recorder.get()
+        if recorder is None:
+            return response
+        total_ms = (time.perf_counter() - recorder.started_at) * 1000
+        if recorder.show_header:
+            response.headers['Server-Timing'] = recorder.header(total_ms)
+        logger.info(json.dumps({
+            "event": "server_timing",
+            "method": request.method,
+            "path": request.path,
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            "total_ms": round(total_ms, 2),
+            "timings": [
+                {"name": name, "ms": round(duration_ms, 2), **({"desc": desc} if desc else {})}
+                for name, duration_ms, desc in recorder.entries
+            ],
+        }, ensure_ascii=False))
+        return response
+
+    @app.teardown_request
+    def stop_server_timing(exc=None):
+        _recorder.set(None)
@@ -0,0 +1,64 @@
+import hashlib
+import time
+from types import MappingProxyType
+
+import jwt
+
+from config.config import Config
+from utils.cache import TTLCache
+
+# Tokens ya verificados: clave = digest SHA-256 del token, valor = claims.
+# Evita repetir la verificación de firma para clientes que envían el mismo token una y otra vez.
+_verified_tokens = TTLCache('verified_tokens', Config.TOKEN_CACHE_TTL, maxsize=Config.TOKEN_CACHE_MAXSIZE)
+
+
+def verify_token(token):
+    """
+    Verifica un JWT (sin el prefijo "Bearer ") y devuelve sus claims.
+    Los tokens válidos se cachean hasta su `exp` (como máximo TOKEN_CACHE_TTL segundos).
+    Cada llamada recibe su propia copia de los claims: modificarla no afecta a otras peticiones.
+
+    Raises:
+        jwt.ExpiredSignatureError: Si el token expiró.
+        jwt.ImmatureSignatureError: Si el token todavía no es válido (`nbf`).
+        jwt.InvalidTokenError: Si el token no es válido.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    claims = _verified_tokens.get(digest)
+    now = time.time()
+    if claims is not None:
+        if 'exp' in claims and claims['exp'] <= now:
+            _verified_tokens.invalidate(digest)
+            raise jwt.ExpiredSignatureError("Signature has expired")
+        if 'nbf' in claims and claims['nbf'] > now:
+            raise jwt.ImmatureSignatureError("The token is not yet valid (nbf)")
+        return dict(claims)
+
+    claims = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"])
+    ttl = _verified_tokens.ttl
+    if isinstance(claims.get('exp'), (int, float)):
+        ttl = min(ttl, claims['exp'] - now)
+    _verified_tokens.set(digest, MappingProxyType(claims), ttl)
+    return dict(claims)
+
+
+def issue_token(claims, ttl):
+    """
+    Firma un JWT propio del gateway con unos claims ya verificados, válido durante `ttl` segundos.
+    Lo usan los envíos en segundo plano, que no pueden depender de que el token del cliente siga vigente.
+    """
+    now = int(time.time())
+    return jwt.encode({**claims, "iat": now, "exp": now + ttl}, Config.JWT_SECRET_KEY, algorithm="HS256")
+
+
+def verify_bearer(authorization):
+    """
+    Verifica el valor de un header Authorization con formato "Bearer <token>".
+
+    Raises:
+        jwt.InvalidTokenError: Si el header no tiene el formato esperado o el token no es válido.
+    """
+    scheme, _, token = authorization.partition("Bearer ")
+    if scheme or not token:
+        raise jwt.InvalidTokenError("Authorization header must be 'Bearer <token>'")
+    return verify_token(token)
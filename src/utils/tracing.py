@@ -0,0 +1,325 @@
+import json
+import os
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import requests
+from flask import request
+
+from utils.concurrency import submit
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Span activo en el contexto actual (petición o llamada a un upstream)
+_current_span = ContextVar('current_span', default=None)
+
+_TRACEPARENT = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+SERVER = 'server'
+CLIENT = 'client'
+_OTLP_KINDS = {SERVER: 2, CLIENT: 3}
+
+
+def _new_id(bits):
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Span:
+    """
+    Operación medida dentro de una traza (formato W3C Trace Context).
+    """
+
+    def __init__(self, name, kind, trace_id, parent_id=None, sampled=True, root=None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = _new_id(64)
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.attributes = {}
+        self.error = False
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        # Span raíz de la petición: junta los spans terminados para exportarlos en un solo lote
+        self.root = root or self
+        self.finished = []
+
+    def child(self, name, kind):
+        return Span(name, kind, self.trace_id, parent_id=self.span_id, sampled=self.sampled, root=self.root)
+
+    @property
+    def traceparent(self):
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def end(self):
+        self.end_ns = time.time_ns()
+        if not self.sampled:
+            return
+        if self.root is self:
+            _export(self.finished + [self])
+        elif self.root.end_ns is None:
+            self.root.finished.append(self)
+        else:
+            # La petición ya terminó (p. ej. una actualización en segundo plano): se exporta solo
+            _export([self])
+
+
+def parse_traceparent(header):
+    """
+    Devuelve (trace_id, parent_id, sampled) de un header traceparent válido, o None.
+    """
+    match = _TRACEPARENT.match((header or '').strip().lower())
+    if match is None or match.group(1) == '0' * 32 or match.group(2) == '0' * 16:
+        return None
+    return match.group(1), match.group(2), int(match.group(3), 16) & 1 == 1
+
+
+def start_trace(name, traceparent=None, sample_rate=1.0):
+    """
+    Crea el span raíz de una petición, continuando la traza del cliente si envió traceparent.
+    El muestreo es head-based: sin traza previa se decide aquí con `sample_rate`; con traza previa
+    se respeta la decisión del llamador.
+    """
+    parent = parse_traceparent(traceparent)
+    if parent is not None:
+        trace_id, parent_id, sampled = parent
+    else:
+        trace_id, parent_id, sampled = _new_id(128), None, random.random() < sample_rate
+    span = Span(name, SERVER, trace_id, parent_id=parent_id, sampled=sampled)
+    _current_span.set(span)
+    return span
+
+
+def current_span():
+    return _current_span.get()
+
+
+@contextmanager
+def child_span(name, kind=CLIENT, **attributes):
+    """
+    Span hijo del span activo. Si no hay traza en curso no hace nada y entrega None.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    span = parent.child(name, kind)
+    span.attributes.update(attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException:
+        span.error = True
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+
+
+def inject(span, kwargs):
+    """
+    Argumentos de requests con el header traceparent del span agregado (sin modificar los del llamador).
+    """
+    if span is None:
+        return kwargs
+    return {**kwargs, 'headers': {**(kwargs.get('headers') or {}), 'traceparent': span.traceparent}}
+
+
+def tag_response(span, status_code):
+    if span is not None:
+        span.set_attribute('http.status_code', status_code)
+        span.error = status_code >= 500
+
+
+# -----------------------
+# EXPORTADORES
+# -----------------------
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans, service_name):
+    """
+    Spans en el formato JSON de OTLP/HTTP (ExportTraceServiceRequest).
+    """
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+        "scopeSpans": [{
+            "scope": {"name": service_name},
+            "spans": [{
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                "name": span.name,
+                "kind": _OTLP_KINDS[span.kind],
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+                "status": {"code": 2 if span.error else 1},
+            } for span in spans],
+        }],
+    }]}
+
+
+class SpanExporter(ABC):
+    """
+    Destino de los spans terminados. `background` indica si se exporta fuera del hilo de la petición.
+    """
+    background = False
+
+    @abstractmethod
+    def export(self, spans):
+        """
+        Exporta un lote de spans terminados.
+        """
+
+
+class InMemorySpanExporter(SpanExporter):
+    """
+    Guarda los spans en memoria (para pruebas).
+    """
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+class FileSpanExporter(SpanExporter):
+    """
+    Escribe cada lote de spans como una línea JSON en formato OTLP.
+    """
+
+    def __init__(self, path, service_name):
+        self.path = path
+        self.service_name = service_name
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        line = json.dumps(to_otlp(spans, self.service_name), separators=(',', ':'))
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+
+class OTLPHttpSpanExporter(SpanExporter):
+    """
+    Envía los spans a un colector OpenTelemetry por OTLP/HTTP con cuerpo JSON.
+    """
+    background = True
+
+    def __init__(self, endpoint, service_name, timeout=2):
+        self.url = endpoint.rstrip('/') + '/v1/traces'
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def export(self, spans):
+        # Cliente propio: las llamadas al colector no deben generar spans ni pasar por los circuit breakers
+        requests.post(self.url, json=to_otlp(spans, self.service_name), timeout=self.timeout)
+
+
+_exporter = None
+
+
+def set_exporter(exporter):
+    global _exporter
+    _exporter = exporter
+
+
+def get_exporter():
+    return _exporter
+
+
+def build_exporter(config):
+    """
+    Crea el exportador configurado en TRACE_EXPORTER: 'none', 'file' u 'otlp'.
+    """
+    kind = config.get('TRACE_EXPORTER', 'none')
+    service_name = config.get('TRACE_SERVICE_NAME', 'gateway-api')
+    if kind == 'file':
+        return FileSpanExporter(config['TRACE_EXPORT_PATH'], service_name)
+    if kind == 'otlp':
+        return OTLPHttpSpanExporter(config['TRACE_OTLP_ENDPOINT'], service_name)
+    return None
+
+
+def _reset_after_fork():
+    # El lock del exportador de archivo pudo quedar tomado por otro hilo del padre
+    if isinstance(_exporter, FileSpanExporter):
+        _exporter._lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _safe_export(exporter, spans):
+    try:
+        exporter.export(spans)
+    except Exception as e:
+        logger.warning(f"Tracing: no se pudieron exportar {len(spans)} spans: {e}")
+
+
+def _export(spans):
+    exporter = _exporter
+    if exporter is None:
+        return
+    if exporter.background:
+        submit(_safe_export, exporter, spans, executor='tracing')
+    else:
+        _safe_export(exporter, spans)
+
+
+def register_tracing(app):
+    """
+    Registra un span por petición entrante. Las llamadas a los upstreams crean spans hijos
+    y propagan el contexto con el header traceparent (ver services/upstream.py).
+    Sin exportador configurado (TRACE_EXPORTER=none) no se crea ningún span.
+    """
+    set_exporter(build_exporter(app.config))
+
+    @app.before_request
+    def start_request_span():
+        if _exporter is None:
+            return
+        span = start_trace(f"{request.method} {request.url_rule.rule if request.url_rule else request.path}",
+                           request.headers.get('traceparent'), app.config.get('TRACE_SAMPLE_RATE', 1.0))
+        span.set_attribute('http.method', request.method)
+        span.set_attribute('http.target', request.full_path.rstrip('?'))
+        if request.url_rule:
+            span.set_attribute('http.route', request.url_rule.rule)
+
+    @app.after_request
+    def tag_request_span(response):
+        span = _current_span.get()
+        if span is not None:
+            span.set_attribute('http.status_code', response.status_code)
+            span.error = response.status_code >= 500
+            if span.sampled:
+                response.headers['traceresponse'] = span.traceparent
+        return response
+
+    @app.teardown_request
+    def end_request_span(exc=None):
+        span = _current_span.get()
+        if span is not None:
+            if exc is not None:
+                span.error = True
+            _current_span.set(None)
+            span.end()
@@ -0,0 +1,26 @@
+"""
+Punto de entrada WSGI para servidores de producción.
+
+    gunicorn -c gunicorn.conf.py        (desde la raíz del repositorio)
+
+La configuración se elige con FLASK_ENV (por defecto 'production').
+"""
+import os
+
+from main import create_app
+from services import upstream
+from utils import metrics
+
+app = create_app(os.getenv('FLASK_ENV', 'production'))
+
+
+def shutdown():
+    """
+    Cierre ordenado de un worker: detiene el drenador del spool, guarda sus métricas finales
+    y cierra los pools de conexiones.
+    """
+    spool = app.extensions.get('finish_spool')
+    if spool is not None:
+        spool.close()
+    metrics.stop_flusher()
+    upstream.close_sessions()
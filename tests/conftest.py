@@ -0,0 +1,23 @@
+import os
+import pytest
+
+# Clave JWT para las pruebas (si no se definió en el entorno o en .env)
+os.environ.setdefault('JWT_SECRET_KEY', 'jwt_test_key')
+
+
+# 📌 FIXTURE: Circuit breakers limpios en cada prueba
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    from services import resilience
+    resilience.reset_breakers()
+    yield
+    resilience.reset_breakers()
+
+
+# 📌 FIXTURE: Micro-caché de respuestas vacía en cada prueba
+@pytest.fixture(autouse=True)
+def clear_microcache():
+    from utils import microcache
+    microcache._responses.invalidate()
+    yield
+    microcache._responses.invalidate()
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import jwt
+import pytest
+from unittest.mock import patch, AsyncMock
+
+pytest.importorskip("aiohttp")
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer, TestClient
+from async_main import create_async_app
+from config.config import TestingConfig
+
+
+def auth_header(user_id, role="student"):
+    token = jwt.encode({"user_id": user_id, "role": role}, TestingConfig.JWT_SECRET_KEY, algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def with_client(fn, upstream_app=None):
+    """
+    Levanta el gateway asíncrono (y opcionalmente un microservicio de prueba) y ejecuta `fn(client, upstream_url)`.
+    """
+    upstream_server = None
+    if upstream_app is not None:
+        upstream_server = TestServer(upstream_app)
+        await upstream_server.start_server()
+    client = TestClient(TestServer(create_async_app('testing')))
+    await client.start_server()
+    try:
+        upstream_url = str(upstream_server.make_url('')).rstrip('/') if upstream_server else None
+        return await fn(client, upstream_url)
+    finally:
+        await client.close()
+        if upstream_server:
+            await upstream_server.close()
+
+
+# ✅ Test de Proxy Asíncrono del Ranking
+def test_async_ranking_proxy():
+    upstream_app = web.Application()
+
+    async def ranking(request):
+        return web.json_response([{"participant_id": 1, "score": 10}])
+    upstream_app.router.add_get('/competitions/3/ranking', ranking)
+
+    async def scenario(client, upstream_url):
+        with patch('routes.async_routes.COMPETITION_SERVICE_URL', upstream_url):
+            response = await client.get('/competitions/3/ranking')
+            return response.status, await response.json()
+
+    status, data = run(with_client(scenario, upstream_app))
+    assert status == 200
+    assert data == [{"participant_id": 1, "score": 10}]
+
+
+# ✅ Test de Microservicio Caído en Modo Asíncrono
+def test_async_proxy_connection_error():
+    async def scenario(client, _):
+        with patch('routes.async_routes.COMPETITION_SERVICE_URL', 'http://127.0.0.1:1'):
+            response = await client.get('/competitions')
+            return response.status, await response.json()
+
+    status, data = run(with_client(scenario))
+    assert status == 503
+    assert data["message"] == "Error al conectar con el microservicio"
+
+
+# ✅ Test de Métricas en Modo Asíncrono
+def test_async_metrics():
+    async def scenario(client, _):
+        response = await client.get('/metrics')
+        return response.status, await response.text()
+
+    status, text = run(with_client(scenario))
+    assert status == 200
+    assert 'gateway_http_requests_total' in text
+
+
+# ✅ Test de Ruta Protegida sin Token en Modo Asíncrono
+def test_async_role_required_without_token():
+    async def scenario(client, _):
+        response = await client.get('/auth/list')
+        return response.status, await response.json()
+
+    status, data = run(with_client(scenario))
+    assert status == 401
+    assert data["message"] == "Token is missing!"
+
+
+# ✅ Test de Detalle de Competencia Enriquecido en Modo Asíncrono
+@patch('routes.async_routes.AsyncQuestionService.list_categories', new_callable=AsyncMock)
+@patch('routes.async_routes.AsyncQuizService.list_quizzes', new_callable=AsyncMock)
+@patch('routes.async_routes.AsyncAuthService.get_users_by_ids', new_callable=AsyncMock)
+@patch('routes.async_routes.async_proxy_service_request', new_callable=AsyncMock)
+def test_async_competition_detail(mock_proxy, mock_users, mock_quizzes, mock_categories):
+    mock_proxy.return_value = ({"id": 1, "created_by": 7, "participants": [{"participant_id": 7}],
+                                "quizzes": [{"quiz_id": 4}]}, 200)
+    mock_users.return_value = ({"users": [{"id": 7, "username": "ana"}]}, 200)
+    mock_quizzes.return_value = ([{"id": 4, "title": "Quiz", "category_id": 1, "questions": [{}]}], 200)
+    mock_categories.return_value = ([{"id": 1, "name": "Arte"}], 200)
+
+    async def scenario(client, _):
+        response = await client.get('/competitions/1')
+        return response.status, await response.json()
+
+    status, data = run(with_client(scenario))
+    assert status == 200
+    mock_users.assert_awaited_once_with([7])
+    assert data["participants"][0]["username"] == "ana"
+    assert data["created_by"]["username"] == "ana"
+    assert data["quizzes"][0]["category_name"] == "Arte"
+
+
+# ✅ Test de Paginación por Cursor y NDJSON de Catálogos en Modo Asíncrono
+@patch('routes.async_routes.AsyncQuestionService.list_questions', new_callable=AsyncMock)
+@patch('routes.async_routes.AsyncQuizService.list_quizzes', new_callable=AsyncMock)
+def test_async_catalog_pagination(mock_quizzes, mock_questions):
+    mock_quizzes.return_value = ([{"id": i, "questions": []} for i in range(1, 4)], 200)
+    mock_questions.return_value = ([{"id": 1}, {"id": 2}], 200)
+
+    async def scenario(client, _):
+        first = await (await client.get('/quizzes?limit=2')).json()
+        second = await (await client.get(f'/quizzes?limit=2&cursor={first["next_cursor"]}')).json()
+        stream = await client.get('/questions?category_id=5&format=ndjson')
+        invalid = await client.get('/quizzes?limit=0')
+        return first, second, stream.content_type, await stream.text(), invalid.status
+
+    first, second, content_type, lines, invalid_status = run(with_client(scenario))
+    assert [quiz["id"] for quiz in first["items"]] == [1, 2]
+    assert second == {"items": [{"id": 3, "questions": []}], "next_cursor": None}
+    assert content_type == 'application/x-ndjson'
+    assert lines.splitlines() == ['{"id":1}', '{"id":2}']
+    mock_questions.assert_awaited_once_with({"category_id": "5"})
+    assert invalid_status == 400
+
+
+# ✅ Test de Rate Limiting en Modo Asíncrono
+@patch.object(TestingConfig, 'RATE_LIMITS', json.dumps({"competitions.proxy_get_competition_ranking": {"*": "1 per minute"}}))
+@patch.object(TestingConfig, 'LIMTER_DEFAULT_LIMIT', '3 per minute')
+def test_async_rate_limit():
+    async def scenario(client, _):
+        statuses = [(await client.get('/api')).status for _ in range(3)]
+        limited = await client.get('/api')
+        other_user = await client.get('/api', headers=auth_header(2))
+        metrics_status = (await client.get('/metrics')).status
+        with patch('routes.async_routes.COMPETITION_SERVICE_URL', 'http://127.0.0.1:1'):
+            ranking = [(await client.get('/competitions/1/ranking')).status for _ in range(2)]
+        return statuses, limited.status, limited.headers.get('Retry-After'), await limited.json(), \
+            other_user.status, metrics_status, ranking
+
+    statuses, limited, retry_after, body, other_user, metrics_status, ranking = run(with_client(scenario))
+    assert statuses == [200, 200, 200]
+    assert limited == 429 and int(retry_after) >= 1
+    assert body["message"] == "Has excedido el límite de peticiones permitido. Por favor, inténtalo más tarde."
+    assert other_user == 200
+    assert metrics_status == 200
+    # Las tablas de RATE_LIMITS usan los mismos nombres de endpoint que la app Flask
+    assert ranking[1] == 429
@@ -56,3 +56,52 @@ def test_protected_route_without_token(client):
     response = client.get('/auth/protected')
     assert response.status_code == 401
     assert response.get_json()["message"] == "Token is missing!"
+
+
+# ✅ Test de /auth/me Servido desde la Caché de Perfiles
+@patch('services.auth_service.AuthService.me')
+def test_auth_me_local_mode_uses_profile_cache(mock_me, client):
+    import jwt
+    from services import AuthService
+    from src.config.config import TestingConfig
+    client.application.config['AUTH_ME_LOCAL'] = True
+    AuthService.profiles_cache.invalidate()
+    mock_me.return_value = ({"id": 42, "username": "ana"}, 200)
+    token = jwt.encode({"user_id": 42, "role": "user"}, TestingConfig.JWT_SECRET_KEY, algorithm="HS256")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get('/auth/me', headers=headers).get_json() == {"id": 42, "username": "ana"}
+    assert client.get('/auth/me', headers=headers).status_code == 200
+    assert mock_me.call_count == 1
+
+    # El cliente puede pedir explícitamente refrescar el perfil
+    client.get('/auth/me?refresh=true', headers=headers)
+    assert mock_me.call_count == 2
+
+    # Un token inválido no llega al servicio de autenticación
+    assert client.get('/auth/me', headers={"Authorization": "Bearer x"}).status_code == 401
+    assert mock_me.call_count == 2
+    AuthService.profiles_cache.invalidate()
+
+
+# ✅ Test de /auth/me con un Token Nuevo de Otro Rol
+@patch('services.auth_service.AuthService.me')
+def test_auth_me_profile_cache_follows_role_change(mock_me, client):
+    import jwt
+    from services import AuthService
+    from src.config.config import TestingConfig
+    client.application.config['AUTH_ME_LOCAL'] = True
+    AuthService.profiles_cache.invalidate()
+
+    def headers_for(role):
+        token = jwt.encode({"user_id": 42, "role": role}, TestingConfig.JWT_SECRET_KEY, algorithm="HS256")
+        return {"Authorization": f"Bearer {token}"}
+
+    mock_me.return_value = ({"id": 42, "role": "student"}, 200)
+    assert client.get('/auth/me', headers=headers_for("student")).get_json()["role"] == "student"
+
+    # Tras un ascenso el usuario recibe un token nuevo: el perfil anterior no se reutiliza
+    mock_me.return_value = ({"id": 42, "role": "moderator"}, 200)
+    assert client.get('/auth/me', headers=headers_for("moderator")).get_json()["role"] == "moderator"
+    assert mock_me.call_count == 2
+    AuthService.profiles_cache.invalidate()
@@ -0,0 +1,93 @@
+import jwt
+import pytest
+from unittest.mock import patch
+from config.config import TestingConfig
+from main import create_app
+
+
+# 📌 FIXTURE: Cliente de Pruebas
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        yield client
+
+
+def auth_header(role="admin"):
+    token = jwt.encode({"user_id": 1, "role": role}, TestingConfig.JWT_SECRET_KEY, algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}
+
+
+# ✅ Test de Varias Llamadas en un Solo Batch
+@patch('routes.competition_routes.proxy_service_request')
+def test_batch_runs_sub_requests(mock_proxy, client):
+    mock_proxy.return_value = ([{"id": 1}], 200)
+    response = client.post('/batch', json={"requests": [
+        {"id": "api", "method": "GET", "path": "/api"},
+        {"id": "competencias", "path": "/competitions?page=1"},
+        {"id": "falta", "path": "/no-existe"},
+    ]})
+    assert response.status_code == 200
+    items = response.get_json()["responses"]
+    assert [item["id"] for item in items] == ["api", "competencias", "falta"]
+    assert items[0]["status"] == 200
+    assert items[0]["body"]["status"] == "success"
+    assert items[1]["body"] == [{"id": 1}]
+    assert items[1]["headers"]["Content-Type"] == "application/json"
+    assert items[2]["status"] == 404
+
+
+# ✅ Test de Authorization Compartido con las Sub-peticiones
+def test_batch_shares_authorization(client):
+    response = client.post('/batch', headers=auth_header("user"), json={"requests": [
+        {"path": "/admin/caches"},
+        {"path": "/auth/protected"},
+    ]})
+    forbidden, protected = response.get_json()["responses"]
+    assert forbidden["status"] == 403
+    assert protected["status"] == 200
+
+    # Sin token, la misma sub-petición se rechaza como siempre
+    response = client.post('/batch', json={"requests": [{"path": "/auth/protected"}]})
+    assert response.get_json()["responses"][0]["status"] == 401
+
+
+# ✅ Test de Cuerpo JSON en Sub-peticiones
+@patch('routes.competition_routes.proxy_service_request')
+def test_batch_forwards_body(mock_proxy, client):
+    mock_proxy.return_value = ({"score": 3}, 200)
+    response = client.post('/batch', json={"requests": [
+        {"method": "POST", "path": "/quiz-participation/1/participant/2/finish", "body": {"answers": []}},
+    ]})
+    assert response.get_json()["responses"][0]["body"] == {"score": 3}
+
+
+# ✅ Test de Validaciones del Batch
+def test_batch_validation(client):
+    assert client.post('/batch', json={}).status_code == 400
+    assert client.post('/batch', json={"requests": [{"path": "sin-barra"}]}).status_code == 400
+    assert client.post('/batch', json={"requests": [{"method": "TRACE", "path": "/api"}]}).status_code == 400
+
+    nested = client.post('/batch', json={"requests": [{"method": "POST", "path": "/batch"}]})
+    assert nested.status_code == 400
+    assert nested.get_json()["message"] == "No se permiten batches anidados."
+
+    client.application.config['BATCH_MAX_ITEMS'] = 2
+    too_many = client.post('/batch', json={"requests": [{"path": "/api"}] * 3})
+    assert too_many.status_code == 400
+
+
+# ✅ Test de Sub-respuesta que Declara JSON con un Cuerpo que No lo Es
+@patch('routes.competition_routes.proxy_service_request')
+def test_batch_invalid_json_sub_response(mock_proxy, client):
+    from flask import Response
+    mock_proxy.return_value = (Response('<html>502 Bad Gateway</html>', mimetype='application/json'), 502)
+    response = client.post('/batch', json={"requests": [
+        {"id": "roto", "path": "/competitions"},
+        {"id": "api", "path": "/api"},
+    ]})
+    assert response.status_code == 200
+    broken, api = response.get_json()["responses"]
+    assert broken["status"] == 502
+    assert broken["body"] == '<html>502 Bad Gateway</html>'
+    assert api["body"]["status"] == "success"
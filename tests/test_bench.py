@@ -0,0 +1,56 @@
+import requests
+from bench.load import compare, percentile
+from bench.stubs import StubConfig, start_stubs
+
+
+# ✅ Test de Percentiles con Interpolación
+def test_percentile():
+    values = [0.1 * i for i in range(1, 11)]
+    assert percentile([], 95) == 0.0
+    assert percentile(values, 0) == values[0]
+    assert percentile(values, 100) == values[-1]
+    assert round(percentile(values, 50), 3) == 0.55
+
+
+# ✅ Test de Comparación con la Base
+def test_compare_flags_regressions():
+    def stats(p95, rps):
+        return {"p95_ms": p95, "throughput_rps": rps}
+
+    baseline = {"phases": {"mixed": {"ranking": stats(10, 100), "finish": stats(50, 20)}}}
+    results = {"phases": {"mixed": {"ranking": stats(10.5, 98), "finish": stats(70, 20), "nueva": stats(1, 1)}}}
+    rows = {row[1]: row for row in compare(results, baseline, threshold=0.1)}
+    assert rows["ranking"][-1] is False
+    assert rows["finish"][-1] is True
+    assert "nueva" not in rows
+
+
+# ✅ Test de Microservicios Simulados
+def test_stub_services():
+    configs = {name: StubConfig(latency_ms=0, jitter_ms=0, participants=3, questions=2)
+               for name in ('auth', 'qa', 'competition')}
+    stubs = start_stubs(configs)
+    try:
+        base = f"http://127.0.0.1:{stubs['competition'].port}"
+        competition = requests.get(f"{base}/competitions/1").json()
+        assert len(competition["participants"]) == 3
+        assert requests.post(f"{base}/quiz-participation/1/participant/2/start").json()["participant_id"] == 2
+
+        users = requests.post(f"http://127.0.0.1:{stubs['auth'].port}/users/bulk", json={"ids": [1, 2]}).json()
+        assert [u["id"] for u in users["users"]] == [1, 2]
+
+        quiz = requests.get(f"http://127.0.0.1:{stubs['qa'].port}/quizzes/4").json()
+        assert len(quiz["questions"]) == 2
+        assert requests.get(f"{base}/desconocida").status_code == 404
+    finally:
+        for stub in stubs.values():
+            stub.stop()
+
+
+# ✅ Test de Servidor por Defecto del Benchmark
+def test_bench_defaults_to_gunicorn():
+    from bench.run import SERVER_CMDS, parse_args
+    args = parse_args([])
+    assert args.server == 'gunicorn' and args.server_cmd is None
+    assert 'gunicorn.conf.py' in SERVER_CMDS['gunicorn'].format(port=5500)
+    assert parse_args(['--server', 'dev']).server == 'dev'
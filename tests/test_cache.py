@@ -0,0 +1,123 @@
+import pytest
+import jwt
+from main import create_app
+from unittest.mock import patch, MagicMock
+from services import QuestionService
+from utils.cache import TTLCache
+from src.config.config import TestingConfig
+
+
+# 📌 FIXTURE: Cliente de Pruebas
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    QuestionService.categories_cache.invalidate()
+    with app.test_client() as client:
+        yield client
+    QuestionService.categories_cache.invalidate()
+
+
+def auth_header(role="admin"):
+    token = jwt.encode({"user_id": 1, "role": role}, TestingConfig.JWT_SECRET_KEY, algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}
+
+
+# ✅ Test de Expiración por TTL
+def test_ttl_cache_expires():
+    cache = TTLCache('test-ttl', ttl=10)
+    with patch('utils.cache.time.monotonic', return_value=100):
+        cache.set('a', 1)
+    with patch('utils.cache.time.monotonic', return_value=105):
+        assert cache.get('a') == 1
+    with patch('utils.cache.time.monotonic', return_value=111):
+        assert cache.get('a') is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+# ✅ Test de Categorías Servidas desde la Caché
+@patch('services.upstream.request')
+def test_categories_are_cached(mock_request, client):
+    mock_request.return_value = MagicMock(status_code=200, json=lambda: [{"id": 1, "name": "Historia"}])
+
+    assert client.get('/questions/categories').get_json() == [{"id": 1, "name": "Historia"}]
+    assert client.get('/questions/categories').status_code == 200
+    assert mock_request.call_count == 1
+
+
+# ✅ Test de Invalidación al Crear una Categoría
+@patch('services.upstream.request')
+def test_create_category_invalidates_cache(mock_request, client):
+    mock_request.return_value = MagicMock(status_code=200, json=lambda: [{"id": 1, "name": "Historia"}])
+    client.get('/questions/categories')
+
+    mock_request.return_value = MagicMock(status_code=201, json=lambda: {"id": 2, "name": "Arte"})
+    client.post('/questions/categories', json={"name": "Arte"}, headers=auth_header())
+
+    mock_request.return_value = MagicMock(status_code=200, json=lambda: [{"id": 1}, {"id": 2}])
+    assert len(client.get('/questions/categories').get_json()) == 2
+    assert mock_request.call_count == 3
+
+
+# ✅ Test de Lista Vieja No Guardada tras Crear una Categoría en Paralelo
+@patch('services.upstream.request')
+def test_stale_categories_not_cached_after_invalidation(mock_request, client):
+    def slow_list(*args, **kwargs):
+        # Mientras la lectura está en curso, otra petición crea una categoría e invalida la caché
+        QuestionService.categories_cache.invalidate()
+        return MagicMock(status_code=200, json=lambda: [{"id": 1, "name": "Historia"}])
+    mock_request.side_effect = slow_list
+
+    data, status = QuestionService.list_categories()
+    assert status == 200 and data == [{"id": 1, "name": "Historia"}]
+    assert QuestionService.categories_cache.get('all') is None
+
+
+# ✅ Test de Copias Independientes de la Caché de Categorías
+@patch('services.upstream.request')
+def test_cached_categories_are_copies(mock_request, client):
+    mock_request.return_value = MagicMock(status_code=200, json=lambda: [{"id": 1, "name": "Historia"}])
+    first, _ = QuestionService.list_categories()
+    first[0]["name"] = "Modificada"
+    second, _ = QuestionService.list_categories()
+    assert second == [{"id": 1, "name": "Historia"}]
+    second.append({"id": 2})
+    assert QuestionService.list_categories()[0] == [{"id": 1, "name": "Historia"}]
+
+
+# ✅ Test de Estadísticas de Cachés (solo admin)
+def test_cache_stats_requires_admin(client):
+    assert client.get('/admin/caches', headers=auth_header("user")).status_code == 403
+    response = client.get('/admin/caches', headers=auth_header())
+    assert response.status_code == 200
+    assert "categories" in response.get_json()
+
+
+# ✅ Test de Desalojo LRU por Tamaño
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache('test-lru', ttl=60, maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get_many(['a', 'b', 'c']) == {'a': 1, 'c': 3}
+
+
+# ✅ Test de Consulta Solo de Usuarios Faltantes
+@patch('services.upstream.request')
+def test_get_users_by_ids_fetches_only_missing(mock_request):
+    from services import AuthService
+    AuthService.users_cache.invalidate()
+    mock_request.return_value = MagicMock(status_code=200, json=lambda: {"users": [{"id": 1, "username": "ana"}]})
+    AuthService.get_users_by_ids([1])
+
+    mock_request.return_value = MagicMock(status_code=200, json=lambda: {"users": [{"id": 2, "username": "beto"}]})
+    data, status = AuthService.get_users_by_ids([1, 2])
+    assert status == 200
+    assert sorted(u["username"] for u in data["users"]) == ["ana", "beto"]
+    assert mock_request.call_args[1]["json"] == {"ids": [2]}
+
+    # Todos en caché: no hay llamada al servicio
+    AuthService.get_users_by_ids([2, 1])
+    assert mock_request.call_count == 2
+    AuthService.users_cache.invalidate()
@@ -0,0 +1,129 @@
+import json
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from main import create_app
+from utils.json_stream import iter_array_items
+from utils.pagination import decode_cursor, encode_cursor
+
+QUIZZES = [{"id": i, "title": f"Quiz {i}"} for i in range(1, 6)]
+
+
+# 📌 FIXTURE: Cliente de Pruebas
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    app.config['MICROCACHE_QUIZZES_TTL'] = 0
+    with app.test_client() as client:
+        yield client
+
+
+def _streamed(payload, status=200, chunk_size=7):
+    """
+    Respuesta simulada de requests con stream=True que entrega el cuerpo en bloques pequeños.
+    """
+    body = json.dumps(payload).encode('utf-8')
+    response = MagicMock()
+    response.status_code = status
+    response.content = body
+    response.iter_content.side_effect = lambda size: (body[i:i + chunk_size] for i in range(0, len(body), chunk_size))
+    return response
+
+
+# ✅ Test del separador incremental de arrays JSON
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 64])
+def test_iter_array_items_chunk_boundaries(chunk_size):
+    payload = [{"text": 'dice "hola", [sí] {no} \\ fin', "n": [1, [2, {"x": 3}]]}, "a,b", 4, None, [], {}]
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    chunks = (body[i:i + chunk_size] for i in range(0, len(body), chunk_size))
+    assert list(iter_array_items(chunks)) == payload
+    assert list(iter_array_items([b' [ ] '])) == []
+
+
+# ✅ Test de elementos saltados sin decodificar
+def test_iter_array_items_skip_does_not_decode():
+    body = json.dumps([{"id": i, "tags": ["a,b", "]"]} for i in range(6)]).encode('utf-8')
+    chunks = (body[i:i + 4] for i in range(0, len(body), 4))
+    with patch('utils.json_stream.json_codec.loads', wraps=json.loads) as mock_loads:
+        assert [item["id"] for item in iter_array_items(chunks, skip=4)] == [4, 5]
+    assert mock_loads.call_count == 2
+    assert list(iter_array_items([b'[1, 2]'], skip=5)) == []
+
+
+# ✅ Test de cuerpos que no son un array JSON completo
+@pytest.mark.parametrize('body', [b'{"message": "x"}', b'[1, 2', b'"texto"'])
+def test_iter_array_items_rejects_invalid(body):
+    with pytest.raises(ValueError):
+        list(iter_array_items([body]))
+
+
+# ✅ Test de Paginación por Cursor en /quizzes
+@patch('services.quiz_service.upstream.get')
+def test_quizzes_cursor_pagination(mock_get, client):
+    mock_get.side_effect = lambda *args, **kwargs: _streamed(QUIZZES)
+
+    response = client.get('/quizzes?limit=2')
+    assert response.status_code == 200
+    first = response.get_json()
+    assert [quiz["id"] for quiz in first["items"]] == [1, 2]
+    assert first["items"][0]["questions"] == []
+    assert mock_get.call_args.kwargs["stream"] is True
+
+    response = client.get(f'/quizzes?limit=2&cursor={first["next_cursor"]}')
+    second = response.get_json()
+    assert [quiz["id"] for quiz in second["items"]] == [3, 4]
+
+    response = client.get(f'/quizzes?limit=2&cursor={second["next_cursor"]}')
+    last = response.get_json()
+    assert [quiz["id"] for quiz in last["items"]] == [5]
+    assert last["next_cursor"] is None
+
+
+# ✅ Test de Streaming NDJSON en /quizzes
+@patch('services.quiz_service.upstream.get')
+def test_quizzes_ndjson_stream(mock_get, client):
+    upstream_response = _streamed(QUIZZES)
+    mock_get.return_value = upstream_response
+
+    response = client.get('/quizzes', headers={'Accept': 'application/x-ndjson'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [1, 2, 3, 4, 5]
+    upstream_response.close.assert_called()
+
+
+# ✅ Test de Cursor inválido y límites fuera de rango
+@pytest.mark.parametrize('query', ['cursor=no-es-un-cursor', 'limit=0', 'limit=abc', 'limit=100000',
+                                   'limit=2&format=ndjson'])
+@patch('services.quiz_service.upstream.get')
+def test_quizzes_invalid_page_params(mock_get, query, client):
+    response = client.get(f'/quizzes?{query}')
+    assert response.status_code == 400
+    mock_get.assert_not_called()
+
+
+# ✅ Test de Paginación en /questions sin reenviar los parámetros del gateway
+@patch('services.question_service.upstream.get')
+def test_questions_cursor_pagination(mock_get, client):
+    questions = [{"id": i, "text": f"¿Pregunta {i}?"} for i in range(1, 4)]
+    mock_get.return_value = _streamed(questions)
+
+    response = client.get(f'/questions?category_id=2&limit=2&cursor={encode_cursor(1)}')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [question["id"] for question in data["items"]] == [2, 3]
+    assert data["next_cursor"] is None
+    assert mock_get.call_args.kwargs["params"] == {"category_id": "2"}
+
+
+# ✅ Test de Errores del microservicio y cursores
+@patch('services.question_service.upstream.get')
+def test_questions_upstream_error(mock_get, client):
+    mock_get.return_value = _streamed({"message": "No disponible"}, status=500)
+    response = client.get('/questions?limit=2')
+    assert response.status_code == 500
+    assert response.get_json() == {"message": "No disponible"}
+
+    assert decode_cursor(encode_cursor(150)) == 150
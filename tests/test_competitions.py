@@ -0,0 +1,116 @@
+import pytest
+from main import create_app
+from unittest.mock import patch
+
+
+# 📌 FIXTURE: Cliente de Pruebas
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        yield client
+
+
+COMPETITION = {
+    "id": 1,
+    "title": "Copa",
+    "created_by": 10,
+    "modified_by": 11,
+    "created_at": "2025-01-01",
+    "updated_at": "2025-01-02",
+    "participants": [{"participant_id": 10, "competition_id": 1}, {"participant_id": 12, "competition_id": 1}],
+    "quizzes": [{"quiz_id": 5, "competition_id": 1, "time_limit": 30}],
+}
+
+
+# ✅ Test de Detalle de Competencia Enriquecido
+@patch('routes.competition_routes.QuestionService.list_categories')
+@patch('routes.competition_routes.QuizService.list_quizzes')
+@patch('routes.competition_routes.AuthService.get_users_by_ids')
+@patch('routes.competition_routes.proxy_service_request')
+def test_get_competition_enriched(mock_proxy, mock_users, mock_quizzes, mock_categories, client):
+    mock_proxy.return_value = (dict(COMPETITION), 200)
+    mock_users.return_value = ({"users": [
+        {"id": 10, "username": "ana"}, {"id": 11, "username": "beto"}, {"id": 12, "username": "caro"}
+    ]}, 200)
+    mock_quizzes.return_value = ([{"id": 5, "title": "Quiz", "category_id": 2, "state": "active",
+                                   "questions": [{}, {}]}], 200)
+    mock_categories.return_value = ([{"id": 2, "name": "Historia"}], 200)
+
+    response = client.get('/competitions/1')
+    assert response.status_code == 200
+    data = response.get_json()
+
+    # Una única llamada bulk para participantes, created_by y modified_by
+    mock_users.assert_called_once_with([10, 12, 11])
+    assert [p["username"] for p in data["participants"]] == ["ana", "caro"]
+    assert data["created_by"] == {"id": 10, "username": "ana", "date": "2025-01-01"}
+    assert data["modified_by"]["username"] == "beto"
+    assert data["quizzes"][0]["category_name"] == "Historia"
+    assert data["quizzes"][0]["questions_count"] == 2
+    assert data["quizzes"][0]["time_limit"] == 30
+
+
+# ✅ Test de Detalle de Competencia sin Quizzes ni Participantes
+@patch('routes.competition_routes.QuestionService.list_categories')
+@patch('routes.competition_routes.QuizService.list_quizzes')
+@patch('routes.competition_routes.AuthService.get_users_by_ids')
+@patch('routes.competition_routes.proxy_service_request')
+def test_get_competition_without_enrichment(mock_proxy, mock_users, mock_quizzes, mock_categories, client):
+    mock_proxy.return_value = ({"id": 2, "participants": [], "quizzes": []}, 200)
+
+    response = client.get('/competitions/2')
+    assert response.status_code == 200
+    mock_users.assert_not_called()
+    mock_quizzes.assert_not_called()
+    mock_categories.assert_not_called()
+
+
+# ✅ Test de Vista Ligera sin Llamadas de Enriquecimiento
+@patch('routes.competition_routes.QuestionService.list_categories')
+@patch('routes.competition_routes.QuizService.list_quizzes')
+@patch('routes.competition_routes.AuthService.get_users_by_ids')
+@patch('routes.competition_routes.proxy_service_request')
+def test_get_competition_fields_skip_enrichment(mock_proxy, mock_users, mock_quizzes, mock_categories, client):
+    mock_proxy.return_value = (dict(COMPETITION), 200)
+
+    response = client.get('/competitions/1?fields=id,title,participants&expand=')
+    assert response.status_code == 200
+    assert response.get_json() == {"id": 1, "title": "Copa", "participants": COMPETITION["participants"]}
+    mock_users.assert_not_called()
+    mock_quizzes.assert_not_called()
+    mock_categories.assert_not_called()
+
+
+# ✅ Test de Expansión Parcial según los Campos Pedidos
+@patch('routes.competition_routes.QuestionService.list_categories')
+@patch('routes.competition_routes.QuizService.list_quizzes')
+@patch('routes.competition_routes.AuthService.get_users_by_ids')
+@patch('routes.competition_routes.proxy_service_request')
+def test_get_competition_expand_subset(mock_proxy, mock_users, mock_quizzes, mock_categories, client):
+    mock_proxy.return_value = (dict(COMPETITION), 200)
+    mock_users.return_value = ({"users": [{"id": 10, "username": "ana"}, {"id": 12, "username": "caro"}]}, 200)
+    mock_quizzes.return_value = ([{"id": 5, "title": "Quiz", "category_id": 2}], 200)
+
+    # Solo participantes: la llamada bulk no incluye created_by / modified_by
+    response = client.get('/competitions/1?fields=participants')
+    assert [p["username"] for p in response.get_json()["participants"]] == ["ana", "caro"]
+    mock_users.assert_called_once_with([10, 12])
+    mock_quizzes.assert_not_called()
+
+    # Quizzes sin nombres de categoría
+    response = client.get('/competitions/1?fields=quizzes&expand=quizzes')
+    quiz = response.get_json()["quizzes"][0]
+    assert quiz["title"] == "Quiz" and "category_name" not in quiz
+    mock_categories.assert_not_called()
+
+    assert client.get('/competitions/1?expand=todo').status_code == 400
+
+
+# ✅ Test de Recorte de Campos en el Listado
+@patch('routes.competition_routes.proxy_service_request')
+def test_list_competitions_fields(mock_proxy, client):
+    mock_proxy.return_value = ([{"id": 1, "title": "Copa", "state": "active", "participants": []}], 200)
+
+    response = client.get('/competitions?fields=id,title')
+    assert response.get_json() == [{"id": 1, "title": "Copa"}]
@@ -0,0 +1,100 @@
+import gzip
+import pytest
+import zstandard
+from unittest.mock import patch
+from flask import Response
+from main import create_app
+
+
+# 📌 FIXTURE: Cliente de Pruebas
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    app.config.update(MICROCACHE_COMPETITIONS_TTL=0, COMPRESSION_MIN_SIZE=100)
+    with app.test_client() as client:
+        yield client
+
+
+LARGE = [{"id": i, "name": f"Competencia {i}"} for i in range(50)]
+
+
+# ✅ Test de Respuesta Comprimida con gzip
+@patch('routes.competition_routes.proxy_service_request')
+def test_gzip_response(mock_proxy, client):
+    mock_proxy.return_value = (LARGE, 200)
+    plain = client.get('/competitions')
+    response = client.get('/competitions', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert int(response.headers['Content-Length']) < int(plain.headers['Content-Length'])
+    assert gzip.decompress(response.data) == plain.data
+    # El ETag pasa a ser débil pero conserva el valor del cuerpo original
+    assert response.headers['ETag'] == 'W/' + plain.headers['ETag']
+
+
+# ✅ Test de Respuesta Comprimida con zstd
+@patch('routes.competition_routes.proxy_service_request')
+def test_zstd_response(mock_proxy, client):
+    mock_proxy.return_value = (LARGE, 200)
+    plain = client.get('/competitions')
+    response = client.get('/competitions', headers={'Accept-Encoding': 'gzip, zstd'})
+    assert response.headers['Content-Encoding'] == 'zstd'
+    # El marco no incluye el tamaño del contenido: se decodifica como stream, igual que un navegador
+    assert zstandard.ZstdDecompressor().stream_reader(response.data).read() == plain.data
+
+    response = client.get('/competitions', headers={'Accept-Encoding': 'zstd;q=0.5, gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+
+# ✅ Test de Respuestas Pequeñas sin Comprimir
+@patch('routes.competition_routes.proxy_service_request')
+def test_small_response_not_compressed(mock_proxy, client):
+    mock_proxy.return_value = ([{"id": 1}], 200)
+    response = client.get('/competitions', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+
+# ✅ Test de Cliente sin Soporte de Compresión
+@patch('routes.competition_routes.proxy_service_request')
+def test_identity_not_compressed(mock_proxy, client):
+    mock_proxy.return_value = (LARGE, 200)
+    response = client.get('/competitions', headers={'Accept-Encoding': 'gzip;q=0, identity'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_json() == LARGE
+
+
+# ✅ Test de 304 con el ETag Débil de la Respuesta Comprimida
+@patch('routes.competition_routes.proxy_service_request')
+def test_conditional_with_compressed_etag(mock_proxy, client):
+    mock_proxy.return_value = (LARGE, 200)
+    etag = client.get('/competitions', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+    response = client.get('/competitions', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert 'Content-Encoding' not in response.headers
+
+
+# ✅ Test de Compresión en Streaming
+@patch('routes.competition_routes.proxy_service_request')
+def test_streamed_response_compressed(mock_proxy, client):
+    chunks = [b'{"ranking":[', b'{"user_id":1,"score":10}' * 20, b']}']
+    mock_proxy.return_value = (Response(iter(chunks), mimetype='application/json', direct_passthrough=True), 200)
+    response = client.get('/competitions', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    assert gzip.decompress(response.data) == b''.join(chunks)
+
+    mock_proxy.return_value = (Response(iter(chunks), mimetype='application/json', direct_passthrough=True), 200)
+    response = client.get('/competitions', headers={'Accept-Encoding': 'zstd'})
+    assert response.headers['Content-Encoding'] == 'zstd'
+    assert zstandard.ZstdDecompressor().stream_reader(response.data).read() == b''.join(chunks)
+
+
+# ✅ Test de Respuestas ya Comprimidas por el Microservicio
+@patch('routes.competition_routes.proxy_service_request')
+def test_upstream_encoded_response_untouched(mock_proxy, client):
+    body = gzip.compress(b'[]' * 200)
+    upstream = Response(body, mimetype='application/json', headers={'Content-Encoding': 'gzip'})
+    mock_proxy.return_value = (upstream, 200)
+    response = client.get('/competitions', headers={'Accept-Encoding': 'gzip'})
+    assert response.data == body
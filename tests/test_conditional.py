@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import patch
+from main import create_app
+
+
+# 📌 FIXTURE: Cliente de Pruebas
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    app.config.update(MICROCACHE_COMPETITIONS_TTL=0)
+    with app.test_client() as client:
+        yield client
+
+
+# ✅ Test de ETag en Respuestas JSON
+@patch('routes.competition_routes.proxy_service_request')
+def test_json_response_has_etag(mock_proxy, client):
+    mock_proxy.return_value = ([{"id": 1}], 200)
+    first = client.get('/competitions')
+    second = client.get('/competitions')
+    assert first.status_code == 200
+    assert first.headers['ETag']
+    assert not first.headers['ETag'].startswith('W/')
+    assert first.headers['ETag'] == second.headers['ETag']
+
+
+# ✅ Test de 304 con If-None-Match Vigente
+@patch('routes.competition_routes.proxy_service_request')
+def test_if_none_match_returns_304(mock_proxy, client):
+    mock_proxy.return_value = ([{"id": 1}], 200)
+    etag = client.get('/competitions').headers['ETag']
+
+    response = client.get('/competitions', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+    # Si el contenido cambia, el ETag anterior deja de valer
+    mock_proxy.return_value = ([{"id": 2}], 200)
+    response = client.get('/competitions', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json() == [{"id": 2}]
+
+
+# ✅ Test de Respuestas de Error sin ETag
+@patch('routes.competition_routes.proxy_service_request')
+def test_error_response_has_no_etag(mock_proxy, client):
+    mock_proxy.return_value = ({"message": "Error al conectar con el microservicio"}, 503)
+    response = client.get('/competitions')
+    assert response.status_code == 503
+    assert 'ETag' not in response.headers
+
+
+# ✅ Test de ETag Guardado con la Micro-caché
+@patch('routes.competition_routes.proxy_service_request')
+def test_microcache_serves_etag(mock_proxy, client):
+    client.application.config.update(MICROCACHE_COMPETITIONS_TTL=5)
+    mock_proxy.return_value = ([{"id": 1}], 200)
+    etag = client.get('/competitions').headers['ETag']
+
+    response = client.get('/competitions', headers={'If-None-Match': etag})
+    assert response.headers['X-Cache'] == 'HIT'
+    assert response.status_code == 304
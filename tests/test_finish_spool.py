@@ -0,0 +1,177 @@
+import sqlite3
+import time
+
+import jwt
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+from config.config import TestingConfig
+from main import create_app
+from services.finish_spool import FinishSpool, DELIVERED, FAILED, PENDING, REJECTED
+
+FINISH_URL = '/quiz-participation/7/participant/3/finish'
+
+
+def auth_header(user_id=3, role="student", **claims):
+    token = jwt.encode({"user_id": user_id, "role": role, **claims}, TestingConfig.JWT_SECRET_KEY, algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def upstream_response(status, body='{"score": 2}'):
+    response = MagicMock()
+    response.status_code = status
+    response.text = body
+    return response
+
+
+# 📌 FIXTURE: Spool en un archivo temporal, sin hilo drenador (se drena a mano en cada test)
+@pytest.fixture
+def spool(tmp_path):
+    spool = FinishSpool(str(tmp_path / 'spool.db'), 'http://competencias', concurrency=2,
+                        max_attempts=3, retry_base=0, retry_max=0)
+    yield spool
+    spool.close()
+
+
+# 📌 FIXTURE: Cliente de Pruebas con el spool activo
+@pytest.fixture
+def client(spool):
+    app = create_app('testing')
+    app.extensions['finish_spool'] = spool
+    with app.test_client() as client:
+        yield client
+
+
+# ✅ Test de Envío Aceptado con Recibo y Reenvío en Segundo Plano
+@patch('services.finish_spool.upstream_client.request')
+def test_finish_is_spooled_and_delivered(mock_request, client, spool):
+    response = client.post(FINISH_URL, headers=auth_header(), json={"answers": [{"question_id": 1, "answer_id": 0}]})
+    assert response.status_code == 202
+    receipt = response.get_json()
+    assert receipt["status"] == PENDING
+    assert response.headers['Location'] == receipt["status_url"]
+    mock_request.assert_not_called()
+
+    mock_request.return_value = upstream_response(200)
+    assert spool.drain_once() == 1
+    args, kwargs = mock_request.call_args
+    assert args[1:] == ('POST', 'http://competencias' + FINISH_URL)
+    assert kwargs["headers"]["Idempotency-Key"] == "finish:7:3:3"
+    # Se reenvía con un token del gateway, no con el del cliente
+    assert kwargs["headers"]["Authorization"] != auth_header()["Authorization"]
+    forwarded = jwt.decode(kwargs["headers"]["Authorization"].split()[1], TestingConfig.JWT_SECRET_KEY,
+                           algorithms=["HS256"])
+    assert forwarded["user_id"] == 3 and forwarded["role"] == "student"
+
+    status = client.get(receipt["status_url"], headers=auth_header()).get_json()
+    assert status["status"] == DELIVERED
+    assert status["response"] == {"status": 200, "body": {"score": 2}}
+
+
+# ✅ Test de Reintento del Cliente con el Mismo Recibo
+def test_finish_retry_returns_same_receipt(client, spool):
+    first = client.post(FINISH_URL, headers=auth_header(), json={"answers": []}).get_json()
+    second = client.post(FINISH_URL, headers=auth_header(), json={"answers": []}).get_json()
+    assert first["receipt_id"] == second["receipt_id"]
+    assert spool.counts()[PENDING] == 1
+
+
+# ✅ Test de Idempotency-Key repetido por usuarios distintos
+def test_finish_idempotency_key_is_per_user(client, spool):
+    headers_4 = {**auth_header(4), 'Idempotency-Key': 'k'}
+    headers_5 = {**auth_header(5), 'Idempotency-Key': 'k'}
+    first = client.post('/quiz-participation/7/participant/4/finish', headers=headers_4, json={"answers": []})
+    second = client.post('/quiz-participation/8/participant/5/finish', headers=headers_5, json={"answers": []})
+    assert first.status_code == second.status_code == 202
+    assert first.get_json()["receipt_id"] != second.get_json()["receipt_id"]
+    assert spool.counts()[PENDING] == 2
+
+
+# ✅ Test de Envío en nombre de otro participante
+def test_finish_for_other_participant_is_forbidden(client, spool):
+    response = client.post(FINISH_URL, headers=auth_header(99), json={"answers": []})
+    assert response.status_code == 403
+    assert spool.counts().get(PENDING, 0) == 0
+    assert client.post(FINISH_URL, headers=auth_header(99, "admin"), json={"answers": []}).status_code == 202
+
+
+# ✅ Test de Token del cliente fuera del spool y token del drenador vigente
+@patch('services.finish_spool.upstream_client.request')
+def test_finish_spool_does_not_store_client_token(mock_request, client, spool):
+    headers = auth_header(exp=int(time.time()) + 2)
+    client.post(FINISH_URL, headers=headers, json={"answers": []})
+    token = headers["Authorization"].split()[1]
+    with sqlite3.connect(spool.path) as db:
+        assert not any(token in str(value) for row in db.execute('SELECT * FROM finish_spool') for value in row)
+
+    # El token del cliente expira antes del reenvío: el drenador usa uno propio, vigente
+    mock_request.return_value = upstream_response(200)
+    later = time.time() + 3600
+    with patch('utils.tokens.time.time', return_value=later):
+        spool.drain_once()
+        forwarded = mock_request.call_args.kwargs["headers"]["Authorization"].split()[1]
+        assert jwt.decode(forwarded, TestingConfig.JWT_SECRET_KEY, algorithms=["HS256"],
+                          options={"verify_exp": False, "verify_iat": False})["exp"] > later
+
+    # Un token ya expirado no se acepta con 202
+    expired = client.post(FINISH_URL, headers=auth_header(exp=int(time.time()) - 1), json={"answers": []})
+    assert expired.status_code == 401
+
+
+# ✅ Test de Nuevo envío tras un rechazo del microservicio
+@patch('services.finish_spool.upstream_client.request')
+def test_finish_resubmitted_after_rejection(mock_request, client, spool):
+    first = client.post(FINISH_URL, headers=auth_header(), json={"answers": [{"question_id": 1}]}).get_json()
+    mock_request.return_value = upstream_response(400, '{"message": "Falta answer_id"}')
+    spool.drain_once()
+    assert spool.get(first["receipt_id"])["status"] == REJECTED
+
+    corrected = client.post(FINISH_URL, headers=auth_header(), json={"answers": [{"question_id": 1, "answer_id": 2}]})
+    assert corrected.status_code == 202
+    assert corrected.get_json()["receipt_id"] == first["receipt_id"]
+    assert corrected.get_json()["status"] == PENDING
+
+    mock_request.return_value = upstream_response(200)
+    spool.drain_once()
+    assert b'"answer_id": 2' in mock_request.call_args.kwargs["data"]
+    assert spool.get(first["receipt_id"])["status"] == DELIVERED
+
+
+# ✅ Test de Recibo consultado por otro usuario
+def test_finish_receipt_requires_owner(client):
+    status_url = client.post(FINISH_URL, headers=auth_header(), json={"answers": []}).get_json()["status_url"]
+    assert client.get(status_url).status_code == 401
+    assert client.get(status_url, headers=auth_header(99)).status_code == 403
+    assert client.get(status_url, headers=auth_header(99, "admin")).status_code == 200
+    assert client.get(status_url, headers=auth_header()).status_code == 200
+
+
+# ✅ Test de Reintentos del Drenador y Rechazos Definitivos
+@patch('services.finish_spool.upstream_client.request')
+def test_drainer_retries_and_gives_up(mock_request, spool):
+    retried, _ = spool.enqueue('/a', b'{}', {}, 'a')
+    rejected, _ = spool.enqueue('/b', b'{}', {}, 'b')
+
+    def respond(upstream, method, url, **kwargs):
+        if url.endswith('/a'):
+            raise requests.exceptions.ConnectionError("caído")
+        return upstream_response(409, '{"message": "Ya finalizado"}')
+    mock_request.side_effect = respond
+
+    for _ in range(3):
+        spool.drain_once()
+    assert spool.get(rejected["receipt_id"])["status"] == REJECTED
+    failed = spool.get(retried["receipt_id"])
+    assert failed["status"] == FAILED and failed["attempts"] == 3
+    assert spool.drain_once() == 0
+
+    # Un nuevo envío con la misma clave vuelve a encolar el que falló
+    again, created = spool.enqueue('/a', b'{}', {}, 'a')
+    assert created and again["receipt_id"] == retried["receipt_id"] and again["status"] == PENDING
+
+
+# ✅ Test de Validaciones del Envío Diferido
+def test_finish_spool_validation(client):
+    assert client.post(FINISH_URL, json={"answers": []}).status_code == 401
+    assert client.post(FINISH_URL, headers=auth_header(), json={"answers": "x"}).status_code == 400
+    assert client.get('/quiz-participation/receipts/no-existe', headers=auth_header()).status_code == 404
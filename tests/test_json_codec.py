@@ -0,0 +1,66 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+from main import create_app
+from utils import json_codec
+
+SAMPLE = {
+    "title": "Competencia de Geografía ñandú 😀 \x7f",
+    "participants": [{"username": "José", "score": 3, "ratio": 0.75}, {"username": "ana", "score": None}],
+    "b": True, "a": [1, "\x01\n\"\\"], "big": 2 ** 40,
+}
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def codec(request, monkeypatch):
+    if request.param == 'orjson' and json_codec.orjson is None:
+        pytest.skip("orjson no está instalado")
+    monkeypatch.setattr(json_codec.Config, 'JSON_CODEC', 'auto' if request.param == 'orjson' else 'stdlib')
+    return request.param
+
+
+# ✅ Test de Salida Idéntica a jsonify (orden de claves y texto no ASCII)
+def test_dumps_matches_flask(codec):
+    app = create_app('testing')
+    expected = DefaultJSONProvider(app).dumps(SAMPLE, separators=(',', ':'))
+    assert json_codec.dumps(SAMPLE) == expected
+    with app.test_request_context():
+        assert app.json.response(SAMPLE).get_data(as_text=True) == expected + "\n"
+    assert json_codec.loads(expected.encode()) == SAMPLE
+
+
+# ✅ Test de Tipos Especiales con la Función default de Flask
+def test_provider_default_types(codec):
+    app = create_app('testing')
+    data = {"fecha": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc), "monto": Decimal("1.50")}
+    assert app.json.dumps(data, separators=(',', ':')) == DefaultJSONProvider(app).dumps(data, separators=(',', ':'))
+
+
+# ✅ Test de Vuelta a la Biblioteca Estándar
+def test_fallbacks():
+    assert json_codec.dumps({"n": 2 ** 70}) == '{"n":1180591620717411303424}'
+    assert json_codec.loads(b'{"n": NaN}')["n"] != json_codec.loads(b'{"n": NaN}')["n"]
+    with pytest.raises(ValueError):
+        json_codec.loads(b'{no es json')
+
+    # Modo debug: jsonify indentado como siempre
+    app = create_app('testing')
+    app.debug = True
+    with app.test_request_context():
+        assert app.json.response({"b": 1, "a": 2}).get_data(as_text=True) == '{\n  "a": 2,\n  "b": 1\n}\n'
+
+
+# ✅ Test de Decodificación de Respuestas de los Microservicios
+def test_decode_response():
+    response = MagicMock(content='{"nombre": "Ñoño"}'.encode())
+    assert json_codec.decode_response(response) == {"nombre": "Ñoño"}
+
+    # Lo que orjson no acepta sigue el camino de requests
+    response = MagicMock(content=b'\xff\xfe{\x00}\x00')
+    response.json.return_value = {}
+    assert json_codec.decode_response(response) == {}
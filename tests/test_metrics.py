@@ -0,0 +1,87 @@
+import threading
+import pytest
+import requests
+from unittest.mock import MagicMock
+from main import create_app
+from services import upstream
+from utils import metrics
+
+
+# 📌 FIXTURE: Cliente de Pruebas con Métricas Vacías
+@pytest.fixture
+def client():
+    metrics.reset()
+    app = create_app('testing')
+    with app.test_client() as client:
+        yield client
+    metrics.reset()
+
+
+# ✅ Test de Formato Prometheus del Endpoint /metrics
+def test_metrics_endpoint(client):
+    client.get('/api')
+    response = client.get('/metrics')
+    body = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    assert '# TYPE gateway_http_requests_total counter' in body
+    assert 'gateway_http_requests_total{endpoint="index",method="GET",status="200"} 1' in body
+    assert 'gateway_http_request_duration_seconds_bucket{endpoint="index",le="+Inf"} 1' in body
+    assert 'gateway_http_request_duration_seconds_count{endpoint="index"} 1' in body
+    # La propia consulta a /metrics está en curso
+    assert 'gateway_http_requests_in_flight 1' in body
+
+
+# ✅ Test de /metrics Exento del Rate Limiting
+def test_metrics_not_rate_limited(client):
+    for _ in range(10):
+        assert client.get('/metrics').status_code == 200
+
+
+# ✅ Test de Métricas por Upstream
+def test_upstream_metrics(client):
+    session = MagicMock()
+    session.request.side_effect = [MagicMock(status_code=200), requests.exceptions.Timeout("lento")]
+    upstream._send(upstream.QA, session, 'POST', 'http://qa/quizzes')
+    with pytest.raises(requests.exceptions.Timeout):
+        upstream._send(upstream.QA, session, 'POST', 'http://qa/quizzes')
+
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'gateway_upstream_requests_total{upstream="qa",method="POST",status="200"} 1' in body
+    assert 'gateway_upstream_request_duration_seconds_count{upstream="qa"} 1' in body
+    assert 'gateway_upstream_errors_total{upstream="qa",kind="timeout"} 1' in body
+    assert 'gateway_upstream_requests_in_flight{upstream="qa"} 0' in body
+
+
+# ✅ Test de Gauges de Cachés y Circuit Breakers
+def test_cache_and_breaker_gauges(client):
+    upstream.resilience.get_breaker(upstream.AUTH)
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'gateway_cache_hit_ratio{cache="categories"}' in body
+    assert 'gateway_circuit_breaker_state{upstream="auth",state="closed"} 1' in body
+    assert 'gateway_circuit_breaker_state{upstream="auth",state="open"} 0' in body
+
+
+# ✅ Test de Contadores por Hilo Sumados al Exponer
+def test_thread_shards_are_merged():
+    metrics.reset()
+
+    def work():
+        for _ in range(1000):
+            metrics.inc('gateway_test_total', (('kind', 'x'),))
+        metrics.observe('gateway_test_seconds', (), 0.02)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Los hilos ya terminaron: sus valores se conservan
+    body = metrics.render()
+    assert 'gateway_test_total{kind="x"} 4000' in body
+    assert 'gateway_test_seconds_bucket{le="0.01"} 0' in body
+    assert 'gateway_test_seconds_bucket{le="0.025"} 4' in body
+    assert 'gateway_test_seconds_count 4' in body
+    assert metrics.render() == body
+    metrics.reset()
@@ -0,0 +1,96 @@
+import pytest
+import time
+from unittest.mock import patch
+from main import create_app
+
+
+# 📌 FIXTURE: Cliente de Pruebas
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    app.config.update(MICROCACHE_COMPETITIONS_TTL=5, MICROCACHE_STALE_TTL=10, MICROCACHE_STALE_IF_ERROR_TTL=100)
+    with app.test_client() as client:
+        yield client
+
+
+def later(seconds):
+    """
+    Simula el paso del tiempo para la micro-caché.
+    """
+    return patch('utils.microcache.time.monotonic', return_value=time.monotonic() + seconds)
+
+
+# ✅ Test de Respuesta Servida desde la Micro-caché
+@patch('routes.competition_routes.proxy_service_request')
+def test_microcache_hit(mock_proxy, client):
+    mock_proxy.return_value = ([{"id": 1}], 200)
+    first = client.get('/competitions')
+    second = client.get('/competitions')
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.get_json() == [{"id": 1}]
+    assert mock_proxy.call_count == 1
+
+    # Otra query string es otra entrada
+    client.get('/competitions?page=2')
+    assert mock_proxy.call_count == 2
+
+
+# ✅ Test de Stale-While-Revalidate
+@patch('routes.competition_routes.proxy_service_request')
+def test_microcache_stale_while_revalidate(mock_proxy, client):
+    mock_proxy.return_value = ([{"id": 1}], 200)
+    client.get('/competitions')
+
+    mock_proxy.return_value = ([{"id": 2}], 200)
+    with patch('utils.microcache.submit') as mock_submit, later(7):
+        stale = client.get('/competitions')
+        client.get('/competitions')
+    assert stale.headers['X-Cache'] == 'STALE'
+    assert stale.get_json() == [{"id": 1}]
+    # Una sola actualización en segundo plano por clave
+    assert mock_submit.call_count == 1
+
+
+# ✅ Test de Stale-If-Error
+@patch('routes.competition_routes.proxy_service_request')
+def test_microcache_stale_if_error(mock_proxy, client):
+    mock_proxy.return_value = ([{"id": 1}], 200)
+    client.get('/competitions')
+
+    mock_proxy.return_value = ({"message": "Error al conectar con el microservicio"}, 503)
+    with later(50):
+        response = client.get('/competitions')
+    assert response.status_code == 200
+    assert response.headers['X-Cache'] == 'STALE-IF-ERROR'
+    assert response.get_json() == [{"id": 1}]
+
+    # Fuera de la ventana se devuelve el error del microservicio
+    with later(200):
+        assert client.get('/competitions').status_code == 503
+
+
+# ✅ Test de Micro-caché Desactivada con TTL 0
+@patch('routes.competition_routes.proxy_service_request')
+def test_microcache_disabled(mock_proxy, client):
+    client.application.config['MICROCACHE_COMPETITIONS_TTL'] = 0
+    mock_proxy.return_value = ([], 200)
+    client.get('/competitions')
+    client.get('/competitions')
+    assert mock_proxy.call_count == 2
+
+
+# ✅ Test de Ranking en la Micro-caché con una sola entrada por codificación
+@patch('routes.competition_routes.proxy_service_request')
+def test_microcache_ranking_ignores_accept_encoding(mock_proxy, client):
+    client.application.config.update(MICROCACHE_RANKING_TTL=5, COMPRESSION_MIN_SIZE=10)
+    mock_proxy.return_value = ({"ranking": [{"user_id": i, "score": 10 - i} for i in range(10)]}, 200)
+    first = client.get('/competitions/1/ranking', headers={"Accept-Encoding": "gzip"})
+    second = client.get('/competitions/1/ranking', headers={"Accept-Encoding": "identity"})
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert first.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Encoding' not in second.headers
+    assert len(second.get_json()["ranking"]) == 10
+    assert mock_proxy.call_count == 1
+    assert "stream" not in mock_proxy.call_args.kwargs
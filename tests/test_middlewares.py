@@ -60,3 +60,58 @@ def test_valid_token(mock_login, client):
         protected_response = client.get('/auth/protected', headers={"Authorization": f"Bearer {token}"})
         assert protected_response.status_code == 200
         assert protected_response.get_json()["username"] == "test_user"
+
+
+def generate_role_token(role="admin", **claims):
+    payload = {"user_id": 1, "role": role, **claims}
+    return jwt.encode(payload, TestingConfig.JWT_SECRET_KEY, algorithm="HS256")
+
+
+# ✅ Test de Token Verificado una Sola Vez entre Peticiones
+@patch('routes.admin_routes.cache_stats', return_value={})
+def test_verified_token_is_cached(mock_stats, client):
+    token = generate_role_token(extra="cache-test")
+    with patch('utils.tokens.jwt.decode', wraps=jwt.decode) as mock_decode:
+        for _ in range(3):
+            response = client.get('/admin/caches', headers={"Authorization": f"Bearer {token}"})
+            assert response.status_code == 200
+    assert mock_decode.call_count == 1
+
+
+# ✅ Test de Token en Caché Rechazado al Expirar
+def test_cached_token_honors_expiration(client):
+    import time
+    from utils.tokens import verify_token
+    token = generate_role_token(exp=int(time.time()) + 60)
+    verify_token(token)
+
+    with patch('utils.tokens.time.time', return_value=time.time() + 120):
+        response = client.get('/admin/caches', headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+    assert response.get_json()["message"] == "El token ha expirado."
+
+
+# ✅ Test de Claims en Caché Aislados entre Llamadas
+def test_cached_token_claims_are_copies():
+    from utils.tokens import verify_token
+    token = generate_role_token(extra="copy-test")
+    first = verify_token(token)
+    first["role"] = "admin-modificado"
+    assert verify_token(token)["role"] != "admin-modificado"
+
+
+# ✅ Test de Header Authorization sin Formato Bearer
+def test_role_required_malformed_header(client):
+    response = client.get('/admin/caches', headers={"Authorization": generate_role_token()})
+    assert response.status_code == 401
+    assert response.get_json()["message"] == "Token inválido."
+
+
+# ✅ Test de Firma Inspeccionada al Decorar
+def test_role_required_inspects_signature_once():
+    from middlewares.role_required import role_required
+    with patch('middlewares.role_required.inspect.signature', wraps=__import__('inspect').signature) as mock_sig:
+        @role_required(["admin"])
+        def handler(token_data):
+            return token_data
+    assert mock_sig.call_count == 1
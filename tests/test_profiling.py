@@ -0,0 +1,76 @@
+import threading
+import time
+import jwt
+import pytest
+from config.config import TestingConfig
+from main import create_app
+from utils import profiling
+
+
+# 📌 FIXTURE: Cliente de Pruebas
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        yield client
+    profiling.stop_tracemalloc()
+
+
+def auth_header(role="admin"):
+    token = jwt.encode({"user_id": 1, "role": role}, TestingConfig.JWT_SECRET_KEY, algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def busy_worker(stop):
+    while not stop.is_set():
+        time.sleep(0.001)
+
+
+# ✅ Test de Perfilador de Muestreo con Pilas Colapsadas
+def test_profile_returns_collapsed_stacks(client):
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_worker, args=(stop,), name="worker-prueba")
+    worker.start()
+    try:
+        response = client.get('/admin/debug/profile?seconds=0.2&interval=0.01', headers=auth_header())
+    finally:
+        stop.set()
+        worker.join()
+
+    assert response.status_code == 200
+    lines = response.get_data(as_text=True).splitlines()
+    worker_lines = [line for line in lines if line.startswith("worker-prueba;")]
+    assert worker_lines
+    stack, count = worker_lines[0].rsplit(" ", 1)
+    assert "busy_worker (test_profiling.py:" in stack
+    assert int(count) > 0
+
+
+# ✅ Test de Perfilado Exclusivo para Administradores
+def test_debug_endpoints_require_admin(client):
+    assert client.get('/admin/debug/profile?seconds=0.1', headers=auth_header("user")).status_code == 403
+    assert client.post('/admin/debug/tracemalloc/start', headers=auth_header("user")).status_code == 403
+
+
+# ✅ Test de Parámetros Inválidos del Perfilador
+def test_profile_invalid_params(client):
+    assert client.get('/admin/debug/profile?seconds=abc', headers=auth_header()).status_code == 400
+    assert client.get('/admin/debug/profile?seconds=-1', headers=auth_header()).status_code == 400
+
+
+# ✅ Test de Snapshot y Diff de Memoria
+def test_tracemalloc_snapshot_and_diff(client):
+    assert client.get('/admin/debug/tracemalloc/snapshot', headers=auth_header()).status_code == 409
+
+    assert client.post('/admin/debug/tracemalloc/start', headers=auth_header()).get_json()["tracing"] is True
+    leak = [bytearray(1024) for _ in range(200)]
+
+    snapshot = client.get('/admin/debug/tracemalloc/snapshot?limit=5', headers=auth_header()).get_json()
+    assert len(snapshot["top"]) <= 5
+    assert snapshot["traced_kb"] > 0
+
+    diff = client.get('/admin/debug/tracemalloc/diff?limit=50', headers=auth_header()).get_json()
+    assert any(entry["file"].endswith("test_profiling.py") and entry["size_diff_kb"] >= 200 for entry in diff["top"])
+
+    assert client.post('/admin/debug/tracemalloc/stop', headers=auth_header()).get_json() == {"tracing": False}
+    del leak
@@ -0,0 +1,98 @@
+import gzip
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from main import create_app
+from services import upstream
+
+
+class StubCompetitionService(BaseHTTPRequestHandler):
+    """
+    Microservicio de competencias de prueba: responde por bloques y registra lo recibido.
+    """
+    received = []
+
+    def do_GET(self):
+        body = json.dumps({"path": self.path, "items": list(range(1000))}).encode()
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_response(200)
+            self.send_header('Content-Encoding', 'gzip')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', '"v1"')
+        self.send_header('X-Internal', 'no-reenviar')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        StubCompetitionService.received.append((self.headers.get('Content-Type'), body))
+        payload = b'{"status":"finished"}'
+        self.send_response(201)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+# 📌 FIXTURE: Microservicio de prueba
+@pytest.fixture
+def service_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubCompetitionService)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    with patch('routes.competition_routes.COMPETITION_SERVICE_URL', url):
+        yield url
+    server.shutdown()
+    upstream.close_sessions()
+
+
+# 📌 FIXTURE: Cliente de Pruebas
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        yield client
+
+
+# ✅ Test de Paso Directo en Streaming con Query y Headers de Contenido
+def test_stream_passthrough_preserves_body_and_headers(service_url, client):
+    response = client.get('/quiz-participation/4/answers?page=2&per_page=50')
+    assert response.status_code == 200
+    assert response.headers['ETag'] == '"v1"'
+    assert 'X-Internal' not in response.headers
+    assert response.get_json()["path"] == "/quiz-participation/4/answers?page=2&per_page=50"
+
+
+# ✅ Test de Paso Directo sin Recodificar el Cuerpo Comprimido
+def test_stream_passthrough_keeps_upstream_encoding(service_url, client):
+    response = client.get('/quiz-participation/4/participant/1/answers', headers={"Accept-Encoding": "gzip"})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(response.data))["path"] == "/quiz-participation/4/participant/1/answers"
+
+
+# ✅ Test de Reenvío del Cuerpo Original en la Finalización del Quiz
+def test_stream_passthrough_forwards_raw_request_body(service_url, client):
+    StubCompetitionService.received.clear()
+    raw = b'{"answers": [{"question_id": 1, "answer_id": 3}]}'
+    response = client.post('/quiz-participation/2/participant/9/finish', data=raw,
+                           content_type='application/json')
+    assert response.status_code == 201
+    assert response.get_json() == {"status": "finished"}
+    assert StubCompetitionService.received == [('application/json', raw)]
+
+
+# ✅ Test de Microservicio Caído en Modo Streaming
+def test_stream_passthrough_connection_error(client):
+    with patch('routes.competition_routes.COMPETITION_SERVICE_URL', 'http://127.0.0.1:1'):
+        response = client.get('/quiz-participation/4/participant/1/answers')
+    assert response.status_code == 503
+    assert response.get_json()["message"] == "Error al conectar con el microservicio"
@@ -0,0 +1,98 @@
+import json
+import jwt
+import pytest
+from unittest.mock import patch
+from config.config import TestingConfig
+from main import create_app
+from utils.rate_limit import RateLimiter
+
+
+def make_app(**config):
+    app = create_app('testing')
+    app.config.update(config)
+    # El limiter lee las tablas de límites al construirse
+    app.extensions['rate_limiter'] = RateLimiter(app.config)
+    return app
+
+
+def auth(user_id, role="student"):
+    token = jwt.encode({"user_id": user_id, "role": role}, TestingConfig.JWT_SECRET_KEY, algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}
+
+
+# 📌 FIXTURE: Cliente de Pruebas
+@pytest.fixture
+def client():
+    app = make_app(LIMTER_DEFAULT_LIMIT='3 per minute', RATE_LIMIT_SYNC_BATCH=2)
+    with app.test_client() as client:
+        yield client
+
+
+# ✅ Test de Límite Superado con el Mismo Mensaje 429
+def test_rate_limit_exceeded(client):
+    for _ in range(3):
+        assert client.get('/api').status_code == 200
+    response = client.get('/api')
+    assert response.status_code == 429
+    assert response.get_json()["message"] == \
+        "Has excedido el límite de peticiones permitido. Por favor, inténtalo más tarde."
+    assert int(response.headers['Retry-After']) >= 1
+
+
+# ✅ Test de Límites por Usuario y no por IP
+def test_rate_limit_per_user(client):
+    for _ in range(3):
+        assert client.get('/api', headers=auth(1)).status_code == 200
+    assert client.get('/api', headers=auth(1)).status_code == 429
+    # Otro usuario detrás de la misma IP no se ve afectado
+    assert client.get('/api', headers=auth(2)).status_code == 200
+    assert client.get('/api').status_code == 200
+
+
+# ✅ Test de Tablas de Límites por Ruta y Rol
+def test_rate_limit_route_and_role_tables():
+    limits = {"index": {"admin": "10 per minute", "*": "1 per minute"}}
+    app = make_app(LIMTER_DEFAULT_LIMIT='3 per minute', RATE_LIMITS=json.dumps(limits))
+    with app.test_client() as client:
+        assert client.get('/api', headers=auth(1)).status_code == 200
+        assert client.get('/api', headers=auth(1)).status_code == 429
+        for _ in range(10):
+            assert client.get('/api', headers=auth(2, role="admin")).status_code == 200
+        # El límite por defecto de otras rutas es independiente del de /api
+        assert client.get('/', headers=auth(1)).status_code == 302
+
+
+# ✅ Test de Peticiones OPTIONS Exentas
+def test_options_exempt(client):
+    for _ in range(5):
+        assert client.options('/api').status_code == 200
+
+
+# ✅ Test de Sincronización en Lotes con el Almacenamiento Compartido
+def test_counts_synced_in_batches(client):
+    limiter = client.application.extensions['rate_limiter']
+    with patch.object(limiter.storage, 'incr', wraps=limiter.storage.incr) as mock_incr:
+        client.get('/api', headers=auth(1))
+        assert mock_incr.call_count == 0
+        client.get('/api', headers=auth(1))
+        assert mock_incr.call_count == 1
+        assert mock_incr.call_args.kwargs['amount'] == 2
+
+
+# ✅ Test de Límite Global Alcanzado por Otras Instancias
+def test_shared_count_blocks_local_bucket(client):
+    limiter = client.application.extensions['rate_limiter']
+    with patch.object(limiter.storage, 'incr', return_value=3):
+        client.get('/api', headers=auth(1))
+        client.get('/api', headers=auth(1))
+    # Quedaba un token local, pero el total entre instancias ya alcanzó el límite
+    assert client.get('/api', headers=auth(1)).status_code == 429
+
+
+# ✅ Test de Fallo del Almacenamiento Compartido
+def test_storage_failure_keeps_local_limit(client):
+    limiter = client.application.extensions['rate_limiter']
+    with patch.object(limiter.storage, 'incr', side_effect=ConnectionError("redis caído")):
+        for _ in range(3):
+            assert client.get('/api').status_code == 200
+        assert client.get('/api').status_code == 429
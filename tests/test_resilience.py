@@ -0,0 +1,102 @@
+import pytest
+import jwt
+import requests
+from unittest.mock import patch, MagicMock
+from main import create_app
+from services import upstream, resilience, QuizService
+from src.config.config import TestingConfig
+
+
+# 📌 FIXTURE: Cliente de Pruebas
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        yield client
+
+
+# 📌 FIXTURE: Sin esperas entre reintentos
+@pytest.fixture(autouse=True)
+def no_backoff():
+    with patch('services.upstream.time.sleep'):
+        yield
+
+
+def ok_response(status=200, payload=None):
+    return MagicMock(status_code=status, json=lambda: payload if payload is not None else [])
+
+
+# ✅ Test de Transiciones del Circuit Breaker
+def test_breaker_opens_and_recovers():
+    breaker = resilience.CircuitBreaker('test', failure_threshold=2, reset_timeout=10)
+    with patch('services.resilience.time.monotonic', return_value=100):
+        breaker.record_failure()
+        assert breaker.state == resilience.CLOSED
+        breaker.record_failure()
+        assert breaker.state == resilience.OPEN
+        assert breaker.allow() is False
+
+    with patch('services.resilience.time.monotonic', return_value=111):
+        assert breaker.allow() is True       # llamada de prueba (semiabierto)
+        assert breaker.allow() is False      # solo una a la vez
+        breaker.record_success()
+    assert breaker.state == resilience.CLOSED
+    assert breaker.stats()["transitions"] == {"closed": 1, "open": 1, "half_open": 1}
+
+
+# ✅ Test de Reintentos en GET ante Errores de Conexión
+def test_get_is_retried_on_connection_error():
+    session = upstream.get_session(upstream.QA)
+    with patch.object(session, 'request', side_effect=[
+        requests.exceptions.ConnectionError(), ok_response(503), ok_response(200, [{"id": 1}])
+    ]) as mock_request:
+        data, status = QuizService.list_quizzes()
+    assert status == 200
+    assert mock_request.call_count == 3
+    assert mock_request.call_args[1]["timeout"] == TestingConfig.SERVICE_TIMEOUT
+
+
+# ✅ Test de POST sin Reintentos
+def test_post_is_not_retried():
+    session = upstream.get_session(upstream.QA)
+    with patch.object(session, 'request', side_effect=requests.exceptions.ConnectionError()) as mock_request:
+        data, status = QuizService.create_quiz({"quiz": {}})
+    assert status == 503
+    assert mock_request.call_count == 1
+
+
+# ✅ Test de Reintentos que cuentan como un solo fallo del breaker
+@patch.object(resilience.Config, 'CIRCUIT_FAILURE_THRESHOLD', 3)
+def test_retries_count_as_one_breaker_failure():
+    session = upstream.get_session(upstream.QA)
+    with patch.object(session, 'request', side_effect=requests.exceptions.ConnectionError()) as mock_request:
+        data, status = QuizService.list_quizzes()
+    assert status == 503
+    assert mock_request.call_count == 3
+    breaker = resilience.get_breaker(upstream.QA)
+    assert breaker.state == resilience.CLOSED
+    assert breaker.failures == 1
+
+
+# ✅ Test de Fallo Inmediato con el Circuito Abierto
+@patch.object(resilience.Config, 'CIRCUIT_FAILURE_THRESHOLD', 3)
+def test_open_circuit_fails_fast_with_503():
+    session = upstream.get_session(upstream.QA)
+    with patch.object(session, 'request', side_effect=requests.exceptions.ConnectionError()) as mock_request:
+        for _ in range(3):
+            QuizService.create_quiz({"quiz": {}})
+        assert resilience.get_breaker(upstream.QA).state == resilience.OPEN
+
+        data, status = QuizService.get_quiz_by_id(1)
+    assert status == 503
+    assert data["message"] == "Error de conexión con el servicio de cuestionarios."
+    assert mock_request.call_count == 3  # la última llamada no llegó al microservicio
+
+
+# ✅ Test de Estado de los Upstreams (solo admin)
+def test_upstream_stats_endpoint(client):
+    resilience.get_breaker(upstream.COMPETITION)
+    token = jwt.encode({"user_id": 1, "role": "admin"}, TestingConfig.JWT_SECRET_KEY, algorithm="HS256")
+    response = client.get('/admin/upstreams', headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.get_json()["competition"]["state"] == "closed"
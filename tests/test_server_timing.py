@@ -0,0 +1,71 @@
+import json
+import jwt
+import pytest
+from unittest.mock import patch, MagicMock
+from config.config import TestingConfig
+from main import create_app
+
+
+# 📌 FIXTURE: Cliente de Pruebas
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        yield client
+
+
+def auth(role):
+    token = jwt.encode({"user_id": 1, "role": role}, TestingConfig.JWT_SECRET_KEY, algorithm="HS256")
+    return {"Authorization": f"Bearer {token}", "X-Debug-Timing": "1"}
+
+
+def timing_names(header):
+    return [part.split(';')[0] for part in header.split(', ')]
+
+
+# ✅ Test de Server-Timing para Administradores
+@patch('routes.competition_routes.QuestionService.list_categories')
+@patch('routes.competition_routes.QuizService.list_quizzes')
+@patch('routes.competition_routes.AuthService.get_users_by_ids')
+@patch('routes.competition_routes.proxy_service_request')
+def test_server_timing_for_admin(mock_proxy, mock_users, mock_quizzes, mock_categories, client):
+    mock_proxy.return_value = ({"id": 1, "participants": [{"participant_id": 2}], "quizzes": []}, 200)
+    mock_users.return_value = ({"users": [{"id": 2, "username": "ana"}]}, 200)
+
+    response = client.get('/competitions/1', headers=auth("admin"))
+    names = timing_names(response.headers['Server-Timing'])
+    assert names[0] == 'jwt'
+    assert names.count('enrichment') == 2
+    assert 'json' in names
+    assert names[-1] == 'total'
+    assert 'desc="fetch"' in response.headers['Server-Timing']
+
+
+# ✅ Test de Header de Depuración Ignorado para Otros Roles
+def test_server_timing_ignored_for_non_admin(client):
+    assert 'Server-Timing' not in client.get('/api', headers=auth("student")).headers
+    assert 'Server-Timing' not in client.get('/api', headers={"X-Debug-Timing": "1"}).headers
+
+
+# ✅ Test de Llamadas a Upstreams en el Desglose
+def test_server_timing_upstream_calls(client):
+    from services import QuestionService
+    QuestionService.categories_cache.invalidate()
+    session = MagicMock()
+    session.request.return_value = MagicMock(status_code=200, json=lambda: [])
+    with patch('services.upstream.get_session', return_value=session):
+        response = client.get('/questions/categories', headers=auth("admin"))
+    assert 'upstream-qa;desc="GET /categories"' in response.headers['Server-Timing']
+
+
+# ✅ Test de Muestreo solo con Línea de Log
+def test_server_timing_sampled_logs_only(client):
+    client.application.config['SERVER_TIMING_SAMPLE_RATE'] = 1.0
+    with patch('utils.server_timing.logger') as mock_logger:
+        response = client.get('/api')
+    assert 'Server-Timing' not in response.headers
+    line = json.loads(mock_logger.info.call_args.args[0])
+    assert line["event"] == "server_timing"
+    assert line["endpoint"] == "index"
+    assert line["status"] == 200
+    assert [t["name"] for t in line["timings"]] == ["json"]
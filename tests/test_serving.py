@@ -0,0 +1,81 @@
+import os
+import runpy
+
+import pytest
+
+from services import upstream
+from services.finish_spool import FinishSpool
+from utils import concurrency, metrics
+from utils.concurrency import submit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# ✅ Test de Configuración de Gunicorn
+def test_gunicorn_config(monkeypatch):
+    monkeypatch.delenv('METRICS_MULTIPROC_DIR', raising=False)
+    monkeypatch.setenv('PORT', '5500')
+    monkeypatch.setenv('GUNICORN_THREADS', '16')
+    config = runpy.run_path(os.path.join(ROOT, 'gunicorn.conf.py'))
+    assert config['wsgi_app'] == 'wsgi:app'
+    assert config['bind'] == '0.0.0.0:5500'
+    assert config['worker_class'] == 'gthread' and config['threads'] == 16
+    assert config['workers'] >= 2
+    assert os.path.isfile(os.path.join(config['chdir'], 'wsgi.py'))
+    assert os.environ['METRICS_MULTIPROC_DIR'] == config['metrics_dir']
+
+
+# ✅ Test de Estado por Proceso Reiniciado tras un Fork
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="Requiere os.fork")
+def test_fork_resets_process_state(tmp_path):
+    upstream.get_session(upstream.AUTH)
+    submit(metrics.inc, 'gateway_test_total', ()).result()
+    spool = FinishSpool(str(tmp_path / 'spool.db'), 'http://competencias')
+    receipt, _ = spool.enqueue('/a', b'{}', {}, 'a')
+
+    pid = os.fork()
+    if pid == 0:
+        ok = (not upstream._sessions and not concurrency._executors
+              and 'gateway_test_total' not in metrics.render()
+              and spool._db is not spool._inherited_db
+              and spool.get(receipt["receipt_id"]) is not None)
+        os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+    # El proceso padre conserva su estado
+    assert upstream._sessions and concurrency._executors
+    spool.close()
+
+
+# ✅ Test de Métricas Sumadas entre Workers
+def test_metrics_merge_worker_snapshots(tmp_path, monkeypatch):
+    import json
+    from config.config import Config
+    monkeypatch.setattr(Config, 'METRICS_MULTIPROC_DIR', str(tmp_path))
+    metrics.reset()
+    metrics.observe_request('quizzes.get_all_quizzes', 'GET', 200, 0.02)
+
+    requests_key = [['endpoint', 'quizzes.get_all_quizzes'], ['method', 'GET'], ['status', '200']]
+    snapshot = {
+        "counters": [['gateway_http_requests_total', requests_key, 4],
+                     ['gateway_http_requests_in_flight', [], 3]],
+        "histograms": [],
+    }
+    # Un worker vivo (el proceso padre de pytest) y uno que ya terminó
+    dead = os.fork()
+    if dead == 0:
+        os._exit(0)
+    os.waitpid(dead, 0)
+    for pid in (os.getppid(), dead):
+        (tmp_path / f"metrics-{pid}.json").write_text(json.dumps(snapshot))
+
+    text = metrics.render()
+    assert 'gateway_http_requests_total{endpoint="quizzes.get_all_quizzes",method="GET",status="200"} 9' in text
+    assert 'gateway_http_requests_in_flight 3' in text
+
+    # El propio proceso se guarda y se lee de sus valores en vivo, sin contarse dos veces
+    metrics.write_snapshot()
+    assert (tmp_path / f"metrics-{os.getpid()}.json").exists()
+    assert metrics.render() == text
+    metrics.reset()
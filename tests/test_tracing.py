@@ -0,0 +1,98 @@
+import json
+import pytest
+from unittest.mock import patch, MagicMock
+from main import create_app
+from utils import tracing
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+# 📌 FIXTURE: Cliente de Pruebas con Exportador en Memoria
+@pytest.fixture
+def exporter():
+    exporter = tracing.InMemorySpanExporter()
+    yield exporter
+    tracing.set_exporter(None)
+
+
+@pytest.fixture
+def client(exporter):
+    app = create_app('testing')
+    app.config['TRACE_SAMPLE_RATE'] = 1.0
+    tracing.set_exporter(exporter)
+    with app.test_client() as client:
+        yield client
+
+
+def upstream_session():
+    session = MagicMock()
+    session.request.return_value = MagicMock(status_code=200, json=lambda: [])
+    return session
+
+
+# ✅ Test de Span por Petición con Spans Hijos por Llamada
+def test_request_and_upstream_spans(client, exporter):
+    session = upstream_session()
+    with patch('services.upstream.get_session', return_value=session):
+        response = client.get('/quizzes?quiz_ids=1')
+
+    server, = [span for span in exporter.spans if span.kind == tracing.SERVER]
+    client_span, = [span for span in exporter.spans if span.kind == tracing.CLIENT]
+    assert server.name == "GET /quizzes"
+    assert server.attributes["http.status_code"] == 200
+    assert client_span.trace_id == server.trace_id
+    assert client_span.parent_id == server.span_id
+    assert client_span.attributes["upstream"] == "qa"
+    assert response.headers['traceresponse'] == server.traceparent
+
+    # El upstream recibe el contexto de la traza en el header traceparent
+    sent_headers = session.request.call_args.kwargs['headers']
+    assert sent_headers['traceparent'] == client_span.traceparent
+
+
+# ✅ Test de Continuación de la Traza del Cliente
+def test_incoming_traceparent_is_continued(client, exporter):
+    client.get('/api', headers={'traceparent': f"00-{TRACE_ID}-00f067aa0ba902b7-01"})
+    span, = exporter.spans
+    assert span.trace_id == TRACE_ID
+    assert span.parent_id == "00f067aa0ba902b7"
+
+
+# ✅ Test de Muestreo Head-Based
+def test_unsampled_trace_still_propagates(client, exporter):
+    session = upstream_session()
+    with patch('services.upstream.get_session', return_value=session):
+        client.get('/quizzes?quiz_ids=2', headers={'traceparent': f"00-{TRACE_ID}-00f067aa0ba902b7-00"})
+    assert exporter.spans == []
+    assert session.request.call_args.kwargs['headers']['traceparent'].startswith(f"00-{TRACE_ID}-")
+    assert session.request.call_args.kwargs['headers']['traceparent'].endswith("-00")
+
+    client.application.config['TRACE_SAMPLE_RATE'] = 0.0
+    client.get('/api')
+    assert exporter.spans == []
+
+
+# ✅ Test de Traceparent Inválido
+def test_invalid_traceparent_starts_new_trace():
+    assert tracing.parse_traceparent("basura") is None
+    assert tracing.parse_traceparent(f"00-{'0' * 32}-00f067aa0ba902b7-01") is None
+    assert tracing.parse_traceparent(f"00-{TRACE_ID}-00f067aa0ba902b7-01") == (TRACE_ID, "00f067aa0ba902b7", True)
+
+
+# ✅ Test de Exportador a Archivo en Formato OTLP
+def test_file_exporter_writes_otlp_json(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = tracing.FileSpanExporter(str(path), "gateway-api")
+    span = tracing.Span("GET /api", tracing.SERVER, TRACE_ID)
+    span.set_attribute("http.status_code", 200)
+    span.end()
+    exporter.export([span])
+
+    payload = json.loads(path.read_text().splitlines()[0])
+    resource_spans = payload["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"][0]["value"] == {"stringValue": "gateway-api"}
+    otlp_span = resource_spans["scopeSpans"][0]["spans"][0]
+    assert otlp_span["traceId"] == TRACE_ID
+    assert otlp_span["kind"] == 2
+    assert otlp_span["attributes"] == [{"key": "http.status_code", "value": {"intValue": "200"}}]
+    assert otlp_span["status"] == {"code": 1}
@@ -0,0 +1,97 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from services import upstream
+
+
+@pytest.fixture(autouse=True)
+def fresh_sessions():
+    upstream.close_sessions()
+    yield
+    upstream.close_sessions()
+
+
+# ✅ Test de Reutilización de la Sesión por Upstream
+def test_session_is_shared_per_upstream():
+    assert upstream.get_session(upstream.QA) is upstream.get_session(upstream.QA)
+    assert upstream.get_session(upstream.QA) is not upstream.get_session(upstream.AUTH)
+
+
+# ✅ Test de Tamaño de Pool Configurable por Upstream
+def test_pool_size_per_upstream(monkeypatch):
+    monkeypatch.setenv('COMPETITION_POOL_MAXSIZE', '7')
+    adapter = upstream.get_session(upstream.COMPETITION).get_adapter('http://localhost')
+    assert adapter._pool_maxsize == 7
+
+
+# ✅ Test de Sesión sin Persistencia de Cookies
+def test_session_does_not_store_cookies():
+    session = upstream.get_session(upstream.AUTH)
+    assert session.cookies._policy.allowed_domains() == ()
+
+
+# ✅ Test de Servicios Usando el Cliente Compartido
+@patch('services.upstream.request')
+def test_services_use_shared_client(mock_request):
+    from services import QuizService
+    mock_request.return_value = MagicMock(status_code=200, json=lambda: [{"id": 1}])
+
+    data, status = QuizService.list_quizzes()
+    assert status == 200
+    assert data == [{"id": 1, "questions": []}]
+    assert mock_request.call_args[0][:2] == (upstream.QA, 'GET')
+
+
+# ✅ Test de Timeout del Microservicio en los Servicios
+@patch('services.upstream.request')
+def test_services_map_timeout_to_504(mock_request):
+    import requests
+    from services import AuthService, QuestionService, QuizService
+    mock_request.side_effect = requests.exceptions.ReadTimeout("http://qa:5012/quizzes read timeout")
+
+    for data, status in (QuizService.list_quizzes(), QuestionService.list_questions({}),
+                         AuthService.me("Bearer x"), QuizService.iter_quizzes()):
+        assert status == 504
+        assert "error" not in data
+
+
+# ✅ Test de Agrupación de GETs Concurrentes Idénticos
+def test_concurrent_identical_gets_are_coalesced():
+    import threading
+    import time
+    release = threading.Event()
+    calls = []
+
+    def slow_request(method, url, **kwargs):
+        calls.append(url)
+        release.wait(timeout=2)
+        return MagicMock(status_code=200, content=b'{}')
+
+    session = upstream.get_session(upstream.QA)
+    upstream._inflight.shared = 0
+    with patch.object(session, 'request', side_effect=slow_request):
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(upstream.get(upstream.QA, 'http://qa/quizzes/1')))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        # Espera a que los otros cuatro hilos estén esperando a la llamada en curso
+        while upstream._inflight.shared < 4:
+            time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+
+    assert len(calls) == 1
+    assert len(results) == 5
+    assert all(r is results[0] for r in results)
+
+
+# ✅ Test de GETs con Distinto Token no Agrupados
+def test_gets_with_different_tokens_are_not_coalesced():
+    key_a = upstream._coalescing_key(upstream.COMPETITION, 'http://c/ranking', headers={"Authorization": "a"})
+    key_b = upstream._coalescing_key(upstream.COMPETITION, 'http://c/ranking', headers={"Authorization": "b"})
+    assert key_a != key_b
+    assert upstream._coalescing_key(upstream.QA, 'http://qa/q', params={"b": 1, "a": 2}) == \
+        upstream._coalescing_key(upstream.QA, 'http://qa/q?b=1&a=2')